@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from core.clients.gds.models.config.strat_config import MMStratConfig
+from core.clients.gds.models.config.top_level_config import TopLevelConfig
+from core.clients.price.models.item_metadata import ItemMetadata
+from core.clients.price.price_client import PriceClient
+from core.clients.price.price_history import PriceHistory
+from core.clients.redis.redis_client import RedisClient
+from core.logger import logger
+
+from simulation.backtest_result import BacktestResult
+from simulation.backtester import Backtester
+from simulation.ge_simulator import GeSimulator
+from simulation.price_replay import PriceReplay
+from strategy.strategy import BaseStrategy
+from strategy.strategy_factory import StrategyFactory
+
+
+PLAYER_NAME: str = "backtest"
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    price_history: str
+    mapping: str
+    cycles: Optional[int]
+    start_gp: int
+    min_gp: int
+    wait_duration: Optional[int]
+    max_offer_time: int
+    f2p: bool
+    redis_host: str
+    redis_port: int
+    output: Optional[str]
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(
+        description="Script that backtests the market maker strat over a recorded price history archive"
+    )
+    parser.add_argument("--price-history", type=str, required=True, help="Price history archive to replay")
+    parser.add_argument("--mapping", type=str, required=True, help="Wiki /mapping JSON file with names and limits")
+    parser.add_argument("--cycles", type=int, required=False, default=None, help="Max buckets to replay")
+    parser.add_argument("--start-gp", type=int, required=False, default=10_000_000, help="Starting GP")
+    parser.add_argument("--min-gp", type=int, required=False, default=1, help="Min expected profit in GP for a buy")
+    parser.add_argument(
+        "--wait-duration",
+        type=int,
+        required=False,
+        default=None,
+        help="Seconds between strat runs. Defaults to the archive's bucket size",
+    )
+    parser.add_argument("--max-offer-time", type=int, required=False, default=3600, help="Max offer time in seconds")
+    parser.add_argument("--f2p", action="store_true", help="Trade with the free to play slot count and universe")
+    parser.add_argument("--redis-host", type=str, required=False, default="localhost", help="Redis the strat uses")
+    parser.add_argument("--redis-port", type=int, required=False, default=6379, help="Redis port")
+    parser.add_argument("--output", type=str, required=False, default=None, help="Optional JSON report path")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def load_mapping(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+    if not os.path.exists(os.path.join(args.price_history, PriceHistory.METADATA_FILE)):
+        raise FileNotFoundError(f"No price history archive at {args.price_history}")
+
+    mapping: List[Dict[str, Any]] = load_mapping(args.mapping)
+    item_map: Dict[int, ItemMetadata] = PriceClient.parse_item_map(mapping)
+    replay: PriceReplay = PriceReplay(
+        price_history=PriceHistory(root_dir=args.price_history, max_buckets=0),
+        mapping=mapping,
+    )
+    if not len(replay):
+        raise ValueError(f"Price history at {args.price_history} has no buckets to replay")
+
+    # the strat gets its own archive that is filled as the replay advances, so it cannot look ahead
+    strat_history: PriceHistory = PriceHistory(
+        root_dir=tempfile.mkdtemp(prefix="backtest-price-history-"),
+        max_buckets=replay.price_history.metadata.max_buckets,
+        bucket_secs=replay.bucket_secs,
+        max_items=replay.price_history.metadata.max_items,
+    )
+    strat_factory: StrategyFactory = StrategyFactory(
+        redis_client=RedisClient(host=args.redis_host, port=args.redis_port),
+        player_name=PLAYER_NAME,
+        item_map=item_map,
+        price_history=strat_history,
+        is_f2p=args.f2p,
+    )
+    strategy: BaseStrategy = strat_factory.provide_strategy(
+        top_level_config=TopLevelConfig(min_gp=args.min_gp),
+        strat_config=MMStratConfig(
+            activated=True,
+            wait_duration=args.wait_duration or replay.bucket_secs,
+            max_offer_time=args.max_offer_time,
+        ),
+    )
+    simulator: GeSimulator = GeSimulator(
+        player_name=PLAYER_NAME,
+        start_time=replay.current_time,
+        start_gp=args.start_gp,
+        min_gp=args.min_gp,
+        strat_wait_duration=args.wait_duration or replay.bucket_secs,
+        max_offer_time=args.max_offer_time,
+        is_f2p=args.f2p,
+        item_limits={item_id: meta.limit for item_id, meta in item_map.items()},
+    )
+
+    start_time: float = time.perf_counter()
+    result: BacktestResult = Backtester(strategy=strategy, replay=replay, simulator=simulator).run(args.cycles)
+    duration: float = time.perf_counter() - start_time
+
+    logger.info(
+        f"Backtested {result.strat_name} over {result.cycles} buckets in {duration:.2f} seconds. "
+        f"PnL: {result.pnl:.0f} gp, max drawdown: {result.max_drawdown:.0f} gp, orders: {result.orders}, "
+        f"rejected: {result.rejected_orders}, bought: {result.bought}, sold: {result.sold}, tax: {result.tax_paid} gp"
+    )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({**asdict(result), "pnl": result.pnl, "duration": duration}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
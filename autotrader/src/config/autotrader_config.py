@@ -1,9 +1,14 @@
+import os
+
 from core.config.app_config import AppConfig
 from core.logger import logger
 
 
 class AutotraderConfig(AppConfig):
 
+    DEFAULT_PRICE_HISTORY_DIR: str = "data/price_history"
+    DEFAULT_PRICE_HISTORY_BUCKETS: int = 576
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -12,5 +17,7 @@ class AutotraderConfig(AppConfig):
         self.humanize: bool = self.to_bool(self.extract_env_var("HUMANIZE"))
         self.tdp_host: str = self.extract_env_var("TDP_HOST")
         self.tdp_port: int = int(self.extract_env_var("TDP_PORT"))
+        self.price_history_dir: str = os.getenv("PRICE_HISTORY_DIR", self.DEFAULT_PRICE_HISTORY_DIR)
+        self.price_history_buckets: int = int(os.getenv("PRICE_HISTORY_BUCKETS", self.DEFAULT_PRICE_HISTORY_BUCKETS))
 
         logger.set_level(self.log_level)
@@ -18,3 +18,9 @@ class NoAvailableGeSlotError(Exception):
 class PlayerStateError(Exception):
     def __init__(self, msg) -> None:
         super().__init__(msg)
+
+
+class UnplacedOrdersError(Exception):
+    def __init__(self, expected: int, unplaced: int) -> None:
+        msg: str = f"{unplaced} of {expected} planned orders were not found in the GE after executing them"
+        super().__init__(msg)
@@ -1,16 +1,27 @@
 import random
 import time
+from contextlib import contextmanager
+from dataclasses import replace
 from datetime import datetime
-from typing import Any, Callable, Dict, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from uuid import uuid4
 
 from core.clients.gds.gds_client import GdsClient
-from core.clients.gds.models.chat.chat_box import ChatBox
 from core.clients.gds.models.chat.message import Message
 from core.clients.gds.models.exchange.exchange import Exchange
 from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
 from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
 from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.inventory.item import Item
 from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
 from core.clients.redis.models.trade_session.order import Order
 from core.clients.redis.models.trade_session.trade import Trade
@@ -18,9 +29,12 @@ from core.clients.redis.redis_client import RedisClient
 from core.clients.tdp.tdp_client import TdpClient
 from core.logger import logger
 
-from exceptions import MissingInventoryItemError, NoAvailableGeSlotError, PlayerStateError, UnsupportedOrderActionError
+from exceptions import PlayerStateError, UnplacedOrdersError, UnsupportedOrderActionError
 from interface.controller import Controller
+from interface.game_state import GameState
+from planned_action import PlannedAction
 from strategy.action import BuyAction, CancelOrderAction, InputOrderAction, OrderAction, SellAction
+from strategy.constants import GP_ITEM_ID
 
 
 class OrderExecutor:
@@ -28,22 +42,34 @@ class OrderExecutor:
     MIN_ORDER_ACTION_PAUSE: float = 0.5
     MAX_ORDER_ACTION_PAUSE: float = 1.5
 
+    FILLED_STATES: Tuple[ExchangeSlotState, ...] = (ExchangeSlotState.BOUGHT, ExchangeSlotState.SOLD)
+    OPEN_STATES: Tuple[ExchangeSlotState, ...] = (
+        ExchangeSlotState.BUYING,
+        ExchangeSlotState.SELLING,
+        ExchangeSlotState.EMPTY,
+    )
+
     def __init__(
         self,
         controller: Controller,
         redis_client: RedisClient,
         gds_client: GdsClient,
         tdp_client: TdpClient,
+        game_state: GameState,
     ) -> None:
         self.controller: Controller = controller
         self.redis_client: RedisClient = redis_client
         self.gds_client: GdsClient = gds_client
         self.tdp_client: TdpClient = tdp_client
+        self.game_state: GameState = game_state
 
         self.session_id: str = gds_client.session_metadata.id
         self.player_name: str = gds_client.session_metadata.player_name
         self.session_start: float = gds_client.session_metadata.start_time
         self.abort: bool = False
+        # headless benchmarks turn this off so cycles are not dominated by humanizing sleeps
+        self.pause_actions: bool = True
+        self.ge_sessions: int = 0
 
     @staticmethod
     def check_abort(f: Callable) -> Callable:
@@ -54,34 +80,31 @@ class OrderExecutor:
 
         return check
 
+    @contextmanager
+    def ge_session(self) -> Iterator[None]:
+        # nested sessions reuse the interface that is already open, so only the outermost one opens and exits it
+        if not self.ge_sessions:
+            self.controller.open_ge()
+        self.ge_sessions += 1
+        try:
+            yield
+        finally:
+            self.ge_sessions -= 1
+            if not self.ge_sessions:
+                self.controller.exit_ge()
+
     @staticmethod
     def control_ge_interface(f: Callable) -> Callable:
         def use_ge(self: "OrderExecutor", *args, **kwargs) -> Any:
-            self.controller.open_ge()
-            result: Any = f(self, *args, **kwargs)
-            self.controller.exit_ge()
-            return result
+            with self.ge_session():
+                return f(self, *args, **kwargs)
 
         return use_ge
 
     def _sent_public_chat(self) -> bool:
-        chat: ChatBox = self.gds_client.get_chat_box()
-        messages: List[Message] = [m for m in chat.messages if m.time >= self.session_start]
-        return any(msg.sender == self.player_name for msg in messages)
-
-    def _get_next_available_ge_slot(self) -> int:
-        exchange: Exchange = self.gds_client.get_exchange()
-        for slot in exchange.slots:
-            if slot.state == ExchangeSlotState.EMPTY:
-                return slot.position
-        raise NoAvailableGeSlotError()
-
-    def _get_inv_slot(self, item_id: int) -> int:
-        inventory: Inventory = self.gds_client.get_inventory()
-        for item in inventory.items:
-            if item.id == item_id:
-                return item.inventory_position
-        raise MissingInventoryItemError(item_id)
+        # only chat that arrived since the last check is scanned, including messages pulled by other reads
+        messages: List[Message] = self.game_state.read_messages()
+        return any(msg.sender == self.player_name and msg.time >= self.session_start for msg in messages)
 
     @check_abort
     def _cancel_order(self, ge_slot: int) -> None:
@@ -103,98 +126,177 @@ class OrderExecutor:
         self.controller.click_location("ge_confirm")
 
     @check_abort
-    def _handle_order(self, action: OrderAction) -> int:
+    def _handle_order(self, planned: PlannedAction) -> None:
+        action: OrderAction = planned.action
         if isinstance(action, CancelOrderAction):
             self._cancel_order(action.ge_slot)
-            return action.ge_slot
-
-        if isinstance(action, InputOrderAction):
-            ge_slot: int = self._get_next_available_ge_slot()
-            if isinstance(action, BuyAction):
-                self.controller.click_ge_slot(ge_slot)
-                self.controller.type(action.item_name)
-                self.controller.press("enter")
-            elif isinstance(action, SellAction):
-                inv_slot: int = self._get_inv_slot(action.item_id)
-                self.controller.click_inventory_slot(inv_slot)
-            else:
-                raise UnsupportedOrderActionError(
-                    actual=type(action).__name__,
-                    expected=InputOrderAction.__name__,
-                )
-            order_msg: str = f"item {action.item_name}, price: {action.price}, quantity: {action.quantity}"
-            logger.info(f"Submitting {type(action).__name__} in GE slot {ge_slot} - {order_msg}")
-            self._input_order(action)
-            return ge_slot
-
-        raise UnsupportedOrderActionError(
-            actual=type(action).__name__,
-            expected=OrderAction.__name__,
-        )
+            return
+
+        if isinstance(action, BuyAction):
+            self.controller.click_ge_slot(planned.metadata.ge_slot)
+            self.controller.type(action.item_name)
+            self.controller.press("enter")
+        elif isinstance(action, SellAction):
+            self.controller.click_inventory_slot(planned.inv_slot)
+        else:
+            raise UnsupportedOrderActionError(
+                actual=type(action).__name__,
+                expected=OrderAction.__name__,
+            )
+        order_msg: str = f"item {action.item_name}, price: {action.price}, quantity: {action.quantity}"
+        logger.info(f"Submitting {type(action).__name__} in GE slot {planned.metadata.ge_slot} - {order_msg}")
+        self._input_order(action)
 
-    def _create_order(
-        self,
-        action: OrderAction,
-        calc_cycle: int,
+    @staticmethod
+    def _plan_action(
         strat_name: str,
-        ge_slot: int,
-        cur_time: float,
-    ) -> Order:
+        action: OrderAction,
+        slots: Dict[int, ExchangeSlot],
+        free_slots: List[int],
+        held: Dict[int, Item],
+    ) -> Optional[PlannedAction]:
         if isinstance(action, CancelOrderAction):
-            exchange: Exchange = self.gds_client.get_exchange()
-            slot: ExchangeSlot = next(s for s in exchange.slots if s.position == ge_slot)
-            item_id: int = slot.item_id
-            price: int = slot.price
-            quantity: int = slot.total_quantity
-        elif isinstance(action, InputOrderAction):
-            item_id: int = action.item_id
-            price: int = action.price
-            quantity: int = action.quantity
-        else:
+            slot: Optional[ExchangeSlot] = slots.get(action.ge_slot)
+            if slot is None or slot.state not in (ExchangeSlotState.BUYING, ExchangeSlotState.SELLING):
+                logger.info(
+                    f"Dropping {type(action).__name__} from {strat_name}. GE slot {action.ge_slot} is not active"
+                )
+                return None
+            metadata: OfferMetadata = OfferMetadata(
+                type=action.get_offer_type(),
+                item_id=slot.item_id,
+                price=slot.price,
+                quantity=slot.total_quantity,
+                ge_slot=slot.position,
+            )
+            return PlannedAction(strat_name=strat_name, action=action, metadata=metadata)
+
+        if not isinstance(action, InputOrderAction):
             raise UnsupportedOrderActionError(
                 actual=type(action).__name__,
                 expected=OrderAction.__name__,
             )
-
+        if not free_slots:
+            logger.info(f"Dropping {type(action).__name__} from {strat_name}. No GE slots left")
+            return None
+
+        # the ge takes the gp for a buy and the items for a sell as soon as the offer is placed
+        item_id: int = GP_ITEM_ID if isinstance(action, BuyAction) else action.item_id
+        needed: int = action.price * action.quantity if isinstance(action, BuyAction) else action.quantity
+        item: Optional[Item] = held.get(item_id)
+        if item is None or item.quantity < needed:
+            logger.info(f"Dropping {type(action).__name__} from {strat_name}. Not enough of item {item_id} left")
+            return None
+        held[item_id] = replace(item, quantity=item.quantity - needed)
+
+        # the ge puts an offer into the lowest empty slot, which is also the one clicked for buys
         metadata: OfferMetadata = OfferMetadata(
             type=action.get_offer_type(),
-            item_id=item_id,
-            price=price,
-            quantity=quantity,
-            ge_slot=ge_slot,
+            item_id=action.item_id,
+            price=action.price,
+            quantity=action.quantity,
+            ge_slot=free_slots.pop(0),
         )
-        return Order(
-            id=str(uuid4()),
-            calc_cycle=calc_cycle,
-            strat_name=strat_name,
-            metadata=metadata,
-            time=cur_time,
+        inv_slot: Optional[int] = item.inventory_position if isinstance(action, SellAction) else None
+        return PlannedAction(strat_name=strat_name, action=action, metadata=metadata, inv_slot=inv_slot)
+
+    def plan(
+        self,
+        strat_actions: Dict[str, List[OrderAction]],
+        exchange: Exchange,
+        inventory: Inventory,
+    ) -> List[PlannedAction]:
+        # slots and inventory are assigned for the whole batch up front, from one snapshot, so executing it
+        # needs no further reads. cancels run first, then sells, then buys, across every strat. a cancelled
+        # slot holds its items until the next cycle books and collects it, so only empty slots are handed out
+        phases: Tuple[type, ...] = (CancelOrderAction, SellAction, BuyAction)
+        slots: Dict[int, ExchangeSlot] = {slot.position: slot for slot in exchange.slots}
+        free_slots: List[int] = sorted(
+            slot.position for slot in exchange.slots if slot.state == ExchangeSlotState.EMPTY
+        )
+        held: Dict[int, Item] = {}
+        for item in inventory.items:
+            if item.id not in held:
+                held[item.id] = item
+
+        plan: List[PlannedAction] = []
+        for phase in phases:
+            for strat_name, actions in strat_actions.items():
+                for action in actions:
+                    if not isinstance(action, phase):
+                        continue
+                    planned: Optional[PlannedAction] = self._plan_action(
+                        strat_name=strat_name,
+                        action=action,
+                        slots=slots,
+                        free_slots=free_slots,
+                        held=held,
+                    )
+                    if planned is not None:
+                        plan.append(planned)
+        return plan
+
+    @staticmethod
+    def _is_placed(planned: PlannedAction, slot: ExchangeSlot) -> bool:
+        metadata: OfferMetadata = planned.metadata
+        if isinstance(planned.action, CancelOrderAction):
+            return slot.state in (ExchangeSlotState.CANCELLED_BUY, ExchangeSlotState.CANCELLED_SELL)
+        return (
+            slot.state != ExchangeSlotState.EMPTY
+            and slot.item_id == metadata.item_id
+            and slot.price == metadata.price
+            and slot.total_quantity == metadata.quantity
         )
 
     @control_ge_interface
-    def execute(self, actions: List[OrderAction], calc_cycle: int, strat_name: str) -> None:
+    def execute(self, plan: List[PlannedAction], calc_cycle: int) -> None:
         orders: List[Order] = []
-
-        for action in actions:
-            action_pause: float = random.uniform(self.MIN_ORDER_ACTION_PAUSE, self.MAX_ORDER_ACTION_PAUSE)
-            time.sleep(action_pause)
-
+        for planned in plan:
+            if self.pause_actions:
+                action_pause: float = random.uniform(self.MIN_ORDER_ACTION_PAUSE, self.MAX_ORDER_ACTION_PAUSE)
+                time.sleep(action_pause)
+
+            # the player can start typing at any point in the batch, so chat is checked right before every
+            # action. only the chat is read here, the exchange and inventory are not needed until validation
+            self.game_state.refresh_chat()
             if self._sent_public_chat():
                 raise PlayerStateError("Player sent a message in chat box. Aborting to avoid bot detection")
 
-            ge_slot: int = self._handle_order(action)
+            self._handle_order(planned)
             orders.append(
-                self._create_order(
-                    action=action,
+                Order(
+                    id=str(uuid4()),
                     calc_cycle=calc_cycle,
-                    strat_name=strat_name,
-                    ge_slot=ge_slot,
-                    cur_time=datetime.now().timestamp(),
+                    strat_name=planned.strat_name,
+                    metadata=planned.metadata,
+                    time=datetime.now().timestamp(),
                 )
             )
 
-        logger.info(f"Saving {len(orders)} orders generated by strat")
-        self.tdp_client.save_orders(session_id=self.session_id, orders=orders)
+        # one read after the batch checks every slot ended up as planned. orders that did not land are not
+        # saved, since the tdp would never be able to book them
+        self.game_state.invalidate()
+        slots: Dict[int, ExchangeSlot] = {slot.position: slot for slot in self.game_state.exchange.slots}
+        placed: List[Order] = []
+        unplaced: int = 0
+        for planned, order in zip(plan, orders):
+            slot: ExchangeSlot = slots[planned.metadata.ge_slot]
+            if self._is_placed(planned=planned, slot=slot):
+                placed.append(order)
+            elif isinstance(planned.action, CancelOrderAction) and slot.state in self.FILLED_STATES:
+                # the offer completed before the abort landed, so it is booked as a normal trade
+                logger.info(f"Offer in GE slot {slot.position} filled before it could be cancelled")
+            else:
+                logger.error(f"{type(planned.action).__name__} did not land as planned: {slot}")
+                unplaced += 1
+
+        logger.info(f"Saving {len(placed)} of {len(orders)} planned orders")
+        self.tdp_client.save_orders(session_id=self.session_id, orders=placed)
+
+        if self._sent_public_chat():
+            raise PlayerStateError("Player sent a message in chat box. Aborting to avoid bot detection")
+        if unplaced:
+            raise UnplacedOrdersError(expected=len(orders), unplaced=unplaced)
 
     @control_ge_interface
     def book_trades(self, calc_cycle: int, cur_time: float) -> None:
@@ -205,26 +307,45 @@ class OrderExecutor:
         )
         trades: List[Trade] = [t for trade_list in trades_map.values() for t in trade_list]
 
-        exchange: Exchange = self.gds_client.get_exchange()
-        slots: List[ExchangeSlot] = [
-            s
-            for s in exchange.slots
-            if s.state not in (ExchangeSlotState.BUYING, ExchangeSlotState.SELLING, ExchangeSlotState.EMPTY)
-        ]
+        # the tdp booked from its own read of the exchange, so the slots to collect come from its trades. the
+        # cached snapshot predates that read and can miss offers that finished in between
+        self.game_state.invalidate()
+        exchange: Exchange = self.game_state.exchange
+        booked: Set[int] = set(t.metadata.ge_slot for t in trades)
+        slots: List[ExchangeSlot] = [s for s in exchange.slots if s.position in booked]
 
-        assert len(trades) == len(slots), f"TDP booked {len(trades)} trades, but {len(slots)} slots are ready"
-        assert set(t.metadata.ge_slot for t in trades) == set(s.position for s in slots)
+        assert len(trades) == len(booked), f"TDP booked {len(trades)} trades for {len(booked)} GE slots"
+        unfinished: List[ExchangeSlot] = [s for s in slots if s.state in self.OPEN_STATES]
+        assert not unfinished, f"TDP booked trades for GE slots that are not finished: {unfinished}"
 
-        for slot in slots:
-            self.controller.click_ge_slot(slot.position)
+        self._collect(exchange=exchange, positions=booked)
+        self.game_state.invalidate()
+
+    @check_abort
+    def _collect(self, exchange: Exchange, positions: Set[int]) -> None:
+        # the collect button also empties slots that finished after the exchange was read, and their trades would
+        # never be booked. it is only used when every finished slot is one of the slots to collect
+        if not positions:
+            return
+        finished: Set[int] = set(s.position for s in exchange.slots if s.state not in self.OPEN_STATES)
+        if finished <= positions:
+            self.controller.click_location("ge_collect")
+            return
+
+        for position in sorted(positions):
+            self.controller.click_ge_slot(position)
             self.controller.click_location("ge_collect_coins")
             self.controller.click_location("ge_collect_items")
 
     @control_ge_interface
     def liquidate(self) -> None:
-        exchange: Exchange = self.gds_client.get_exchange()
+        # runs before the trade session exists, so every slot that holds an offer is cancelled if needed and collected
+        self.game_state.invalidate()
+        exchange: Exchange = self.game_state.exchange
         for slot in exchange.slots:
             if slot.state in (ExchangeSlotState.BUYING, ExchangeSlotState.SELLING):
                 self._cancel_order(slot.position)
 
-        self.controller.click_location("ge_collect")
+        positions: Set[int] = set(s.position for s in exchange.slots if s.state != ExchangeSlotState.EMPTY)
+        self._collect(exchange=exchange, positions=positions)
+        self.game_state.invalidate()
@@ -2,9 +2,15 @@ import random
 import time
 from typing import Any, Callable, List
 
-import pyautogui
 import pytweening
 
+
+try:
+    import pyautogui
+except Exception:
+    # pyautogui needs a display when it is imported. headless runs can still use controllers that never touch it
+    pyautogui = None
+
 from interface.screen_locator import ScreenLocator
 
 
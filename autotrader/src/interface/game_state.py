@@ -0,0 +1,64 @@
+from typing import List, Optional
+
+from core.clients.gds.gds_client import GdsClient
+from core.clients.gds.models.chat.chat_box import ChatBox
+from core.clients.gds.models.chat.message import Message
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.game_data_snapshot import GameDataSnapshot
+from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.player.player_state import PlayerState
+from core.logger import logger
+
+
+class GameState:
+
+    def __init__(self, gds_client: GdsClient) -> None:
+        self.gds_client: GdsClient = gds_client
+        self._snapshot: Optional[GameDataSnapshot] = None
+        # every refresh only pulls chat after the cursor, so new messages are kept until they are read
+        self.chat_cursor: Optional[int] = None
+        self.unread_messages: List[Message] = []
+
+    @property
+    def snapshot(self) -> GameDataSnapshot:
+        if self._snapshot is None:
+            return self.refresh()
+        return self._snapshot
+
+    @property
+    def exchange(self) -> Exchange:
+        return self.snapshot.exchange
+
+    @property
+    def inventory(self) -> Inventory:
+        return self.snapshot.inventory
+
+    @property
+    def player_state(self) -> PlayerState:
+        return self.snapshot.player_state
+
+    @property
+    def chat_box(self) -> ChatBox:
+        return self.snapshot.chat_box
+
+    def refresh(self) -> GameDataSnapshot:
+        self._snapshot = self.gds_client.get_snapshot(chat_since=self.chat_cursor)
+        self.chat_cursor = self._snapshot.chat_box.last_sequence
+        self.unread_messages.extend(self._snapshot.chat_box.messages)
+        logger.debug(f"Refreshed game data snapshot created at {self._snapshot.creation_time}")
+        return self._snapshot
+
+    def refresh_chat(self) -> ChatBox:
+        # pulls only the chat after the cursor and leaves the cached snapshot alone
+        chat: ChatBox = self.gds_client.get_chat_box(since=self.chat_cursor)
+        self.chat_cursor = chat.last_sequence
+        self.unread_messages.extend(chat.messages)
+        return chat
+
+    def read_messages(self) -> List[Message]:
+        messages: List[Message] = self.unread_messages
+        self.unread_messages = []
+        return messages
+
+    def invalidate(self) -> None:
+        self._snapshot = None
@@ -1,4 +1,3 @@
-from core.clients.gds.gds_client import GdsClient
 from core.clients.gds.models.player.camera import Camera
 from core.clients.gds.models.player.player_location import PlayerLocation
 from core.clients.gds.models.player.player_state import PlayerState
@@ -6,6 +5,7 @@ from core.logger import logger
 
 from interface.controller import Controller
 from interface.exceptions import UnexpectedPlayerStateError
+from interface.game_state import GameState
 
 
 class Player:
@@ -17,12 +17,12 @@ class Player:
     )
     DOWN_DURATION_SECS: int = 3
 
-    def __init__(self, controller: Controller, gds_client: GdsClient) -> None:
+    def __init__(self, controller: Controller, game_state: GameState) -> None:
         self.controller: Controller = controller
-        self.gds_client: GdsClient = gds_client
+        self.game_state: GameState = game_state
 
     def _is_player_ready(self) -> bool:
-        player_state: PlayerState = self.gds_client.get_player_data()
+        player_state: PlayerState = self.game_state.player_state
         return (
             player_state.logged_in == self.EXPECTED_PLAYER_STATE.logged_in
             and player_state.location == self.EXPECTED_PLAYER_STATE.location
@@ -40,8 +40,9 @@ class Player:
         self.controller.click_location("compass")
         self.controller.scroll_full_zoom()
         self.controller.hold("down", self.DOWN_DURATION_SECS)
+        self.game_state.invalidate()
         if not self._is_player_ready():
-            player_state: PlayerState = self.gds_client.get_player_data()
+            player_state: PlayerState = self.game_state.player_state
             raise UnexpectedPlayerStateError(
                 player_state=player_state,
                 expected_player_state=self.EXPECTED_PLAYER_STATE,
@@ -1,14 +1,20 @@
 import time
+from typing import Optional
 
 from core.clients.gds.gds_client import GdsClient
+from core.clients.price.price_cache import PriceCache
 from core.clients.price.price_client import PriceClient
+from core.clients.price.price_history import PriceHistory
 from core.clients.redis.redis_client import RedisClient
 from core.clients.tdp.tdp_client import TdpClient
 from core.logger import logger
+from core.tracing.span_exporter import JsonlSpanExporter
+from core.tracing.tracer import Tracer
 
 from config.autotrader_config import AutotraderConfig
 from executor import OrderExecutor
 from interface.controller import Controller
+from interface.game_state import GameState
 from interface.player import Player
 from interface.screen_locator import ScreenLocator
 from strategy.strategy_factory import StrategyFactory
@@ -16,25 +22,42 @@ from strategy.strategy_manager import StrategyManager
 from trader import Trader
 
 
-def create_trader(config: AutotraderConfig) -> Trader:
-    redis_client: RedisClient = RedisClient(host=config.redis_host, port=config.redis_port)
-    price_client: PriceClient = PriceClient()
+def create_trader(
+    config: AutotraderConfig,
+    price_cache: Optional[PriceCache],
+    controller: Optional[Controller] = None,
+) -> Trader:
+    redis_client: RedisClient = RedisClient(
+        host=config.redis_host,
+        port=config.redis_port,
+        pool_config=config.redis_pool_config,
+    )
+    price_client: PriceClient = PriceClient(cache=price_cache, url=config.price_api_url)
     gds_client: GdsClient = GdsClient(host=config.gds_host, port=config.gds_port)
     tdp_client: TdpClient = TdpClient(host=config.tdp_host, port=config.tdp_port)
+    price_history: PriceHistory = PriceHistory(
+        root_dir=config.price_history_dir,
+        max_buckets=config.price_history_buckets,
+    )
 
-    locator: ScreenLocator = ScreenLocator(randomize=config.humanize)
-    controller: Controller = Controller(locator=locator, randomize=config.humanize)
-    player: Player = Player(controller=controller, gds_client=gds_client)
+    if controller is None:
+        locator: ScreenLocator = ScreenLocator(randomize=config.humanize)
+        controller: Controller = Controller(locator=locator, randomize=config.humanize)
+    game_state: GameState = GameState(gds_client=gds_client)
+    player: Player = Player(controller=controller, game_state=game_state)
     order_executor: OrderExecutor = OrderExecutor(
         controller=controller,
         redis_client=redis_client,
         gds_client=gds_client,
         tdp_client=tdp_client,
+        game_state=game_state,
     )
 
     strat_factory: StrategyFactory = StrategyFactory(
         redis_client=redis_client,
+        player_name=gds_client.session_metadata.player_name,
         item_map=price_client.item_map,
+        price_history=price_history,
         is_f2p=gds_client.session_metadata.is_f2p,
     )
     strat_manager: StrategyManager = StrategyManager(strat_factory=strat_factory, gds_client=gds_client)
@@ -44,8 +67,10 @@ def create_trader(config: AutotraderConfig) -> Trader:
         autotrader_wait=config.autotrader_wait,
         redis_client=redis_client,
         price_client=price_client,
+        price_history=price_history,
         gds_client=gds_client,
         tdp_client=tdp_client,
+        game_state=game_state,
         player=player,
         order_executor=order_executor,
         strat_manager=strat_manager,
@@ -54,12 +79,22 @@ def create_trader(config: AutotraderConfig) -> Trader:
 
 def main() -> None:
     config: AutotraderConfig = AutotraderConfig()
+    if config.trace_export_path is not None:
+        Tracer.configure(JsonlSpanExporter(path=config.trace_export_path, service_name="autotrader"))
 
     logger.info(f"Waiting {int(config.autotrader_start_delay)} seconds before autotrader is activated.")
     time.sleep(config.autotrader_start_delay)
 
-    trader: Trader = create_trader(config)
-    trader.start()
+    price_cache: PriceCache = PriceCache(
+        host=config.redis_host,
+        port=config.redis_port,
+        pool_config=config.redis_pool_config,
+    )
+    trader: Trader = create_trader(config, price_cache=price_cache)
+    try:
+        trader.start()
+    finally:
+        Tracer.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
+
+from strategy.action import OrderAction
+
+
+@dataclass(frozen=True)
+class PlannedAction:
+    strat_name: str
+    action: OrderAction
+    # the offer this action is expected to leave in its ge slot
+    metadata: OfferMetadata
+    inv_slot: Optional[int] = None
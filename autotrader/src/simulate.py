@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from core.clients.price.price_history import PriceHistory
+from core.logger import logger
+
+from config.autotrader_config import AutotraderConfig
+from interface.screen_locator import ScreenLocator
+from main import create_trader
+from simulation.gds_simulator_server import GdsSimulatorServer
+from simulation.ge_simulator import GeSimulator
+from simulation.price_replay import PriceReplay
+from simulation.sim_controller import SimController
+from strategy.constants import GP_ITEM_ID
+from trader import Trader
+
+
+SIMULATOR_HOST: str = "localhost"
+PLAYER_NAME: str = "simulator"
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    price_history: str
+    mapping: Optional[str]
+    cycles: int
+    port: int
+    start_gp: int
+    min_gp: int
+    max_offer_time: int
+    output: Optional[str]
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(
+        description=(
+            "Script that runs headless autotrader cycles against a simulated GDS and GE, replaying a recorded "
+            "price history. The TDP must be started with GDS_HOST and GDS_PORT pointing at the simulator port"
+        )
+    )
+    parser.add_argument("--price-history", type=str, required=True, help="Price history archive to replay")
+    parser.add_argument("--mapping", type=str, required=False, default=None, help="Wiki /mapping JSON file")
+    parser.add_argument("--cycles", type=int, required=False, default=100, help="Max calc cycles to run")
+    parser.add_argument("--port", type=int, required=False, default=8081, help="Port the simulated GDS serves on")
+    parser.add_argument("--start-gp", type=int, required=False, default=10_000_000, help="Starting GP")
+    parser.add_argument("--min-gp", type=int, required=False, default=1, help="Min expected profit in GP for a buy")
+    parser.add_argument("--max-offer-time", type=int, required=False, default=3600, help="Max offer time in seconds")
+    parser.add_argument("--output", type=str, required=False, default=None, help="Optional JSON report path")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def load_mapping(path: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    if path is None:
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def run_cycles(trader: Trader, simulator: GeSimulator, replay: PriceReplay, num_cycles: int) -> List[float]:
+    latencies: List[float] = []
+    for calc_cycle in range(1, num_cycles + 1):
+        if replay.exhausted:
+            logger.info(f"Price history exhausted after {calc_cycle - 1} cycles")
+            break
+
+        # every cycle replays one bucket, so offers fill against the prices of the bucket that just passed
+        cur_time: float = replay.current_time
+        simulator.advance(snapshot=replay.step(), elapsed_secs=replay.bucket_secs, cur_time=cur_time)
+
+        start_time: float = time.perf_counter()
+        trader.run_cycle(calc_cycle, cur_time)
+        latencies.append(time.perf_counter() - start_time)
+    return latencies
+
+
+def create_report(latencies: List[float], simulator: GeSimulator, args: ProgramArgs) -> Dict[str, Any]:
+    latencies_ms: np.ndarray = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        "price_history": args.price_history,
+        "cycles": len(latencies),
+        "cycles_per_sec": len(latencies) / sum(latencies) if latencies else 0.0,
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies_ms.max()) if len(latencies) else 0.0,
+        "filled_quantity": simulator.filled_quantity,
+        "start_gp": args.start_gp,
+        "inventory_gp": simulator.inventory.get(GP_ITEM_ID, 0),
+    }
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+    if not os.path.exists(os.path.join(args.price_history, PriceHistory.METADATA_FILE)):
+        raise FileNotFoundError(f"No price history archive at {args.price_history}")
+
+    replay: PriceReplay = PriceReplay(
+        price_history=PriceHistory(root_dir=args.price_history, max_buckets=0),
+        mapping=load_mapping(args.mapping),
+    )
+    if not len(replay):
+        raise ValueError(f"Price history at {args.price_history} has no buckets to replay")
+
+    start_time: float = replay.current_time
+    simulator: GeSimulator = GeSimulator(
+        player_name=PLAYER_NAME,
+        start_time=start_time,
+        start_gp=args.start_gp,
+        min_gp=args.min_gp,
+        strat_wait_duration=replay.bucket_secs,
+        max_offer_time=args.max_offer_time,
+    )
+    simulator.advance(snapshot=replay.step(), elapsed_secs=0, cur_time=start_time)
+    server: GdsSimulatorServer = GdsSimulatorServer(
+        simulator=simulator,
+        replay=replay,
+        host=SIMULATOR_HOST,
+        port=args.port,
+    )
+    server.start()
+
+    config: AutotraderConfig = AutotraderConfig()
+    config.gds_host = server.host
+    config.gds_port = server.port
+    config.price_api_url = server.price_url
+    # the trader archives the prices it sees, so keep it away from the archive being replayed
+    config.price_history_dir = tempfile.mkdtemp(prefix="simulated-price-history-")
+
+    controller: SimController = SimController(
+        locator=ScreenLocator(randomize=False),
+        simulator=simulator,
+        item_ids={item["name"]: item["id"] for item in replay.mapping},
+    )
+    try:
+        # the shared price cache is keyed by endpoint and expires on wall clock time, so replayed prices would
+        # leak into the live keys and go stale between cycles. every cycle fetches its bucket from the simulator
+        trader: Trader = create_trader(config, price_cache=None, controller=controller)
+        trader.order_executor.pause_actions = False
+        latencies: List[float] = run_cycles(trader=trader, simulator=simulator, replay=replay, num_cycles=args.cycles)
+    finally:
+        server.stop()
+
+    report: Dict[str, Any] = create_report(latencies=latencies, simulator=simulator, args=args)
+    logger.info(f"Simulation report: {report}")
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
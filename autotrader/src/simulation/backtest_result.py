@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+@dataclass
+class BacktestResult:
+    strat_name: str
+    start_time: float
+    end_time: float
+    cycles: int
+    strat_cycles: int
+    orders: int
+    rejected_orders: int
+    bought: int
+    sold: int
+    tax_paid: int
+    start_value: float
+    end_value: float
+    max_drawdown: float
+    # (time, marked value) after every cycle
+    equity_curve: List[Tuple[float, float]]
+
+    @property
+    def pnl(self) -> float:
+        return self.end_value - self.start_value
@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
+from core.logger import logger
+
+from exceptions import NoAvailableGeSlotError, UnsupportedOrderActionError
+from simulation.backtest_result import BacktestResult
+from simulation.exceptions import SimulatedOfferError
+from simulation.ge_simulator import GeSimulator
+from simulation.price_replay import PriceReplay
+from strategy.action import BuyAction, CancelOrderAction, InputOrderAction, OrderAction
+from strategy.constants import GP_ITEM_ID
+from strategy.strategy import BaseStrategy
+
+
+class Backtester:
+
+    # held items are marked at the price they could be instantly sold for
+    MARK_FIELD: PriceField = PriceField.LATEST_LOW
+
+    def __init__(self, strategy: BaseStrategy, replay: PriceReplay, simulator: GeSimulator) -> None:
+        self.strategy: BaseStrategy = strategy
+        self.replay: PriceReplay = replay
+        self.simulator: GeSimulator = simulator
+
+        self.marks: Dict[int, float] = {}
+        self.cycles: int = 0
+        self.strat_cycles: int = 0
+        self.orders: int = 0
+        self.rejected_orders: int = 0
+        self.equity_curve: List[Tuple[float, float]] = []
+
+    def _update_marks(self, snapshot: PriceDataSnapshot, holdings: Dict[int, int]) -> None:
+        # items missing from a bucket keep the last price they were seen at
+        item_ids: List[int] = [item_id for item_id in holdings if item_id != GP_ITEM_ID and item_id in snapshot]
+        prices: np.ndarray = snapshot.column(self.MARK_FIELD)[snapshot.positions(item_ids)]
+        for item_id, price in zip(item_ids, prices.tolist()):
+            if not np.isnan(price):
+                self.marks[item_id] = price
+
+    def _get_value(self, snapshot: PriceDataSnapshot) -> float:
+        holdings: Dict[int, int] = self.simulator.get_holdings()
+        self._update_marks(snapshot=snapshot, holdings=holdings)
+        return float(
+            sum(
+                quantity if item_id == GP_ITEM_ID else quantity * self.marks.get(item_id, 0.0)
+                for item_id, quantity in holdings.items()
+            )
+        )
+
+    def _place_order(self, action: OrderAction) -> None:
+        if isinstance(action, CancelOrderAction):
+            self.simulator.abort_offer(action.ge_slot)
+            return
+
+        if isinstance(action, InputOrderAction):
+            position: Optional[int] = self.simulator.get_first_empty_slot()
+            if position is None:
+                raise NoAvailableGeSlotError()
+            self.simulator.place_offer(
+                position=position,
+                is_buy=isinstance(action, BuyAction),
+                item_id=action.item_id,
+                price=action.price,
+                quantity=action.quantity,
+            )
+            return
+
+        raise UnsupportedOrderActionError(
+            actual=type(action).__name__,
+            expected=OrderAction.__name__,
+        )
+
+    def _run_strategy(self, snapshot: PriceDataSnapshot) -> None:
+        exchange: Exchange = self.simulator.get_exchange()
+        inventory: Inventory = self.simulator.get_inventory()
+        if self.strategy.universe is not None:
+            snapshot = PriceDataSnapshot.filter_by_items(full_snapshot=snapshot, item_ids=self.strategy.universe)
+
+        actions: List[OrderAction] = self.strategy.compute(exchange=exchange, inventory=inventory, price_data=snapshot)
+        for action in actions:
+            try:
+                self._place_order(action)
+                self.orders += 1
+            except (SimulatedOfferError, NoAvailableGeSlotError) as e:
+                logger.warn(f"Rejected {type(action).__name__}: {e}")
+                self.rejected_orders += 1
+
+    def step(self) -> None:
+        cur_time: float = self.replay.current_time
+        snapshot: PriceDataSnapshot = self.replay.step()
+        self.simulator.advance(
+            snapshot=snapshot,
+            elapsed_secs=self.replay.bucket_secs if self.cycles else 0,
+            cur_time=cur_time,
+        )
+        # the executor books and collects finished offers at the start of every cycle
+        self.simulator.collect_all()
+
+        # strats only see prices up to the bucket being replayed, never the rest of the archive
+        if self.strategy.price_history is not None:
+            self.strategy.price_history.append(snapshot=snapshot, timestamp=cur_time)
+
+        if cur_time >= self.strategy.next_run_time:
+            # strats read buy limits from redis, where the tdp book keeper would have left them
+            buy_limits: Dict[int, BuyLimit] = self.simulator.get_buy_limits(cur_time)
+            if buy_limits:
+                self.strategy.redis_client.set_all_buy_limits(
+                    player_name=self.strategy.player_name, buy_limits=buy_limits
+                )
+            self.strategy.next_run_time = cur_time + self.strategy.strat_config.wait_duration
+            self._run_strategy(snapshot)
+            self.strat_cycles += 1
+
+        self.equity_curve.append((cur_time, self._get_value(snapshot)))
+        self.cycles += 1
+
+    def reset_buy_limits(self) -> None:
+        # overwrite whatever an earlier run left behind for the backtest player
+        self.strategy.redis_client.set_all_buy_limits(
+            player_name=self.strategy.player_name,
+            buy_limits={
+                item_id: BuyLimit(item_id=item_id, bought=0, limit=limit)
+                for item_id, limit in self.simulator.item_limits.items()
+            },
+        )
+
+    def run(self, max_cycles: Optional[int] = None) -> BacktestResult:
+        self.reset_buy_limits()
+        while not self.replay.exhausted and (max_cycles is None or self.cycles < max_cycles):
+            self.step()
+
+        values: np.ndarray = np.array([value for _, value in self.equity_curve])
+        drawdowns: np.ndarray = np.maximum.accumulate(values) - values if len(values) else np.zeros(1)
+        return BacktestResult(
+            strat_name=self.strategy.name,
+            start_time=self.equity_curve[0][0] if self.equity_curve else 0.0,
+            end_time=self.equity_curve[-1][0] if self.equity_curve else 0.0,
+            cycles=self.cycles,
+            strat_cycles=self.strat_cycles,
+            orders=self.orders,
+            rejected_orders=self.rejected_orders,
+            bought=self.simulator.bought_quantity,
+            sold=self.simulator.sold_quantity,
+            tax_paid=self.simulator.tax_paid,
+            start_value=float(values[0]) if len(values) else 0.0,
+            end_value=float(values[-1]) if len(values) else 0.0,
+            max_drawdown=float(drawdowns.max()),
+            equity_curve=self.equity_curve,
+        )
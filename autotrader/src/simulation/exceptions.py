@@ -0,0 +1,8 @@
+class SimulatedOfferError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Simulated GE rejected offer: {reason}")
+
+
+class UnknownItemNameError(Exception):
+    def __init__(self, name: str) -> None:
+        super().__init__(f"No item named {name} in the simulator's item mapping")
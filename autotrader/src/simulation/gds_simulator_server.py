@@ -0,0 +1,67 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any, Optional, Type
+
+from simulation.ge_simulator import GeSimulator
+from simulation.price_replay import PriceReplay
+
+
+class GdsSimulatorServer:
+
+    # the replayed price api is served next to the gds endpoints, so strategies and fills see the same prices
+    PRICE_PREFIX: str = "/prices"
+
+    def __init__(self, simulator: GeSimulator, replay: PriceReplay, host: str, port: int) -> None:
+        self.simulator: GeSimulator = simulator
+        self.replay: PriceReplay = replay
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self._create_handler())
+        self.thread: Thread = Thread(target=self.server.serve_forever, name="gds-simulator", daemon=True)
+
+    @property
+    def host(self) -> str:
+        return self.server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    @property
+    def price_url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.PRICE_PREFIX}"
+
+    def _get_payload(self, path: str) -> Optional[Any]:
+        if path.startswith(self.PRICE_PREFIX):
+            return self.replay.payloads.get(path[len(self.PRICE_PREFIX) :])
+        return self.simulator.get_payload(path)
+
+    def _create_handler(self) -> Type[BaseHTTPRequestHandler]:
+        server: GdsSimulatorServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version: str = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                payload: Optional[Any] = server._get_payload(self.path.split("?")[0])
+                if payload is None:
+                    self.send_error(404)
+                    return
+                body: bytes = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,355 @@
+import math
+import time
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import numpy as np
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.inventory.item import Item
+from core.clients.gds.models.player.player_state import PlayerState
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
+from core.logger import logger
+
+from interface.player import Player
+from simulation.exceptions import SimulatedOfferError
+from strategy.constants import GE_TAX_CAP, GE_TAX_EXEMPT_PRICE, GE_TAX_RATE, GP_ITEM_ID
+
+
+@dataclass
+class SimulatedOffer:
+    slot: ExchangeSlot
+    # items and coins waiting in the slot's collection box
+    collect_items: int = 0
+    collect_coins: int = 0
+
+
+class GeSimulator:
+
+    NUM_SLOTS: int = 8
+    NUM_F2P_SLOTS: int = 3
+    NUM_INV_SLOTS: int = 28
+    AVG_WINDOW_SECS: int = 5 * 60
+    # share of the market's traded volume at a price level that our offer is assumed to capture
+    PARTICIPATION_RATE: float = 0.25
+    # same window the tdp book keeper resets buy limits on
+    BUY_LIMIT_RESET_SECS: int = 4 * 60 * 60
+
+    ACTIVE_STATES: Dict[ExchangeSlotState, ExchangeSlotState] = {
+        ExchangeSlotState.BUYING: ExchangeSlotState.BOUGHT,
+        ExchangeSlotState.SELLING: ExchangeSlotState.SOLD,
+    }
+    CANCELLED_STATES: Dict[ExchangeSlotState, ExchangeSlotState] = {
+        ExchangeSlotState.BUYING: ExchangeSlotState.CANCELLED_BUY,
+        ExchangeSlotState.SELLING: ExchangeSlotState.CANCELLED_SELL,
+    }
+
+    def __init__(
+        self,
+        player_name: str,
+        start_time: float,
+        start_gp: int,
+        min_gp: int,
+        strat_wait_duration: int,
+        max_offer_time: int,
+        is_f2p: bool = False,
+        item_limits: Optional[Dict[int, int]] = None,
+    ) -> None:
+        self.lock: Lock = Lock()
+        self.session: Dict[str, Any] = {
+            "id": str(uuid4()),
+            "startTime": start_time,
+            "playerName": player_name,
+            "isF2p": is_f2p,
+        }
+        self.config: Dict[str, Any] = {
+            "autotraderOn": True,
+            "topLevelConfig": {"minGp": min_gp},
+            "stratConfigs": [
+                {
+                    "type": "mmConfig",
+                    "activated": True,
+                    "waitDuration": strat_wait_duration,
+                    "maxOfferTime": max_offer_time,
+                }
+            ],
+        }
+        self.num_slots: int = self.NUM_F2P_SLOTS if is_f2p else self.NUM_SLOTS
+        self.offers: List[Optional[SimulatedOffer]] = [None] * self.NUM_SLOTS
+        # buys stop filling once an item's limit is used up, until its 4h window resets
+        self.item_limits: Dict[int, int] = item_limits or {}
+        self.buy_limits: Dict[int, BuyLimit] = {}
+        # insertion ordered, so an item keeps its inventory position until it is used up
+        self.inventory: Dict[int, int] = {GP_ITEM_ID: start_gp}
+        self.snapshot: Optional[PriceDataSnapshot] = None
+        self.filled_quantity: int = 0
+        self.bought_quantity: int = 0
+        self.sold_quantity: int = 0
+        self.tax_paid: int = 0
+
+    @staticmethod
+    def _empty_slot(position: int) -> ExchangeSlot:
+        return ExchangeSlot(
+            position=position,
+            item_id=-1,
+            price=0,
+            quantity_transacted=0,
+            total_quantity=0,
+            state=ExchangeSlotState.EMPTY,
+        )
+
+    def _get_slot(self, position: int) -> ExchangeSlot:
+        offer: Optional[SimulatedOffer] = self.offers[position]
+        return self._empty_slot(position) if offer is None else offer.slot
+
+    def _add_items(self, item_id: int, quantity: int) -> None:
+        if quantity:
+            self.inventory[item_id] = self.inventory.get(item_id, 0) + quantity
+
+    def _remove_items(self, item_id: int, quantity: int) -> None:
+        held: int = self.inventory.get(item_id, 0)
+        if held < quantity:
+            raise SimulatedOfferError(f"holding {held} of item {item_id}, needed {quantity}")
+        if held == quantity and item_id != GP_ITEM_ID:
+            del self.inventory[item_id]
+        else:
+            self.inventory[item_id] = held - quantity
+
+    def get_inventory_item(self, inventory_position: int) -> Optional[int]:
+        with self.lock:
+            item_ids: List[int] = list(self.inventory)
+            return item_ids[inventory_position] if inventory_position < len(item_ids) else None
+
+    def is_slot_empty(self, position: int) -> bool:
+        with self.lock:
+            return self.offers[position] is None
+
+    def get_first_empty_slot(self) -> Optional[int]:
+        with self.lock:
+            return next((position for position in range(self.num_slots) if self.offers[position] is None), None)
+
+    def place_offer(self, position: int, is_buy: bool, item_id: int, price: int, quantity: int) -> None:
+        with self.lock:
+            if position >= self.num_slots:
+                raise SimulatedOfferError(f"slot {position} is not available")
+            if self.offers[position] is not None:
+                raise SimulatedOfferError(f"slot {position} is not empty")
+            if price <= 0 or quantity <= 0:
+                raise SimulatedOfferError(f"price {price} and quantity {quantity} must be positive")
+            if is_buy:
+                self._remove_items(GP_ITEM_ID, price * quantity)
+            else:
+                self._remove_items(item_id, quantity)
+
+            self.offers[position] = SimulatedOffer(
+                slot=ExchangeSlot(
+                    position=position,
+                    item_id=item_id,
+                    price=price,
+                    quantity_transacted=0,
+                    total_quantity=quantity,
+                    state=ExchangeSlotState.BUYING if is_buy else ExchangeSlotState.SELLING,
+                )
+            )
+            logger.debug(f"Simulated GE placed {'buy' if is_buy else 'sell'} offer in slot {position}")
+
+    def abort_offer(self, position: int) -> None:
+        with self.lock:
+            offer: Optional[SimulatedOffer] = self.offers[position]
+            if offer is None or offer.slot.state not in self.CANCELLED_STATES:
+                return
+
+            slot: ExchangeSlot = offer.slot
+            remaining: int = slot.total_quantity - slot.quantity_transacted
+            if slot.state == ExchangeSlotState.BUYING:
+                offer.collect_coins += remaining * slot.price
+            else:
+                offer.collect_items += remaining
+            slot.state = self.CANCELLED_STATES[slot.state]
+
+    def collect(self, position: int) -> None:
+        with self.lock:
+            offer: Optional[SimulatedOffer] = self.offers[position]
+            if offer is None:
+                return
+
+            self._add_items(offer.slot.item_id, offer.collect_items)
+            self._add_items(GP_ITEM_ID, offer.collect_coins)
+            offer.collect_items = offer.collect_coins = 0
+            if offer.slot.state not in self.ACTIVE_STATES:
+                self.offers[position] = None
+
+    def collect_all(self) -> None:
+        for position in range(self.NUM_SLOTS):
+            self.collect(position)
+
+    @staticmethod
+    def get_tax(price: int, quantity: int) -> int:
+        if price < GE_TAX_EXEMPT_PRICE:
+            return 0
+        return min(math.floor(price * GE_TAX_RATE), GE_TAX_CAP) * quantity
+
+    def _get_buy_limit(self, item_id: int, cur_time: float) -> Optional[BuyLimit]:
+        limit: Optional[int] = self.item_limits.get(item_id)
+        if limit is None:
+            return None
+
+        buy_limit: Optional[BuyLimit] = self.buy_limits.get(item_id)
+        if buy_limit is None:
+            buy_limit = self.buy_limits[item_id] = BuyLimit(item_id=item_id, bought=0, limit=limit)
+        if buy_limit.reset_time is not None and buy_limit.reset_time <= cur_time:
+            buy_limit.bought = 0
+            buy_limit.reset_time = None
+        return buy_limit
+
+    def get_buy_limits(self, cur_time: float) -> Dict[int, BuyLimit]:
+        # only items bought since the start are tracked, every other item still has its full limit
+        with self.lock:
+            return {item_id: replace(self._get_buy_limit(item_id, cur_time)) for item_id in list(self.buy_limits)}
+
+    def _get_fill_quantity(self, slot: ExchangeSlot, row: int, elapsed_secs: float, cur_time: float) -> int:
+        values: np.ndarray = self.snapshot.values[row]
+        is_buy: bool = slot.state == ExchangeSlotState.BUYING
+        # a buy fills against instant sells at the low price, a sell against instant buys at the high price
+        market_price: float = values[PriceField.LATEST_LOW if is_buy else PriceField.LATEST_HIGH]
+        volume: float = values[PriceField.AVG_5M_LOW_VOLUME if is_buy else PriceField.AVG_5M_HIGH_VOLUME]
+        if np.isnan(market_price) or (slot.price < market_price if is_buy else slot.price > market_price):
+            return 0
+
+        volume = 0.0 if np.isnan(volume) else volume
+        capacity: int = math.floor(volume * self.PARTICIPATION_RATE * elapsed_secs / self.AVG_WINDOW_SECS)
+        filled: int = min(slot.total_quantity - slot.quantity_transacted, max(capacity, 1))
+        if not is_buy:
+            return filled
+
+        buy_limit: Optional[BuyLimit] = self._get_buy_limit(slot.item_id, cur_time)
+        if buy_limit is None:
+            return filled
+        filled = min(filled, max(buy_limit.limit - buy_limit.bought, 0))
+        if filled and buy_limit.reset_time is None:
+            buy_limit.reset_time = cur_time + self.BUY_LIMIT_RESET_SECS
+        buy_limit.bought += filled
+        return filled
+
+    def advance(self, snapshot: PriceDataSnapshot, elapsed_secs: float, cur_time: float) -> None:
+        with self.lock:
+            self.snapshot = snapshot
+            for offer in self.offers:
+                if offer is None or offer.slot.state not in self.ACTIVE_STATES:
+                    continue
+
+                slot: ExchangeSlot = offer.slot
+                row: Optional[int] = snapshot.index.get(slot.item_id)
+                filled: int = 0 if row is None else self._get_fill_quantity(slot, row, elapsed_secs, cur_time)
+                slot.quantity_transacted += filled
+                self.filled_quantity += filled
+                if slot.state == ExchangeSlotState.BUYING:
+                    offer.collect_items += filled
+                    self.bought_quantity += filled
+                else:
+                    tax: int = self.get_tax(slot.price, filled)
+                    offer.collect_coins += filled * slot.price - tax
+                    self.sold_quantity += filled
+                    self.tax_paid += tax
+
+                if slot.quantity_transacted == slot.total_quantity:
+                    slot.state = self.ACTIVE_STATES[slot.state]
+
+    def get_exchange(self) -> Exchange:
+        with self.lock:
+            return Exchange(slots=[replace(self._get_slot(position)) for position in range(self.num_slots)])
+
+    def get_inventory(self) -> Inventory:
+        with self.lock:
+            return Inventory(
+                items=[
+                    Item(id=item_id, quantity=quantity, inventory_position=position)
+                    for position, (item_id, quantity) in enumerate(self.inventory.items())
+                ]
+            )
+
+    def get_holdings(self) -> Dict[int, int]:
+        # everything the player owns, wherever it currently sits: inventory, offers and collection boxes
+        with self.lock:
+            holdings: Dict[int, int] = dict(self.inventory)
+            for offer in self.offers:
+                if offer is None:
+                    continue
+                slot: ExchangeSlot = offer.slot
+                holdings[slot.item_id] = holdings.get(slot.item_id, 0) + offer.collect_items
+                holdings[GP_ITEM_ID] = holdings.get(GP_ITEM_ID, 0) + offer.collect_coins
+                remaining: int = slot.total_quantity - slot.quantity_transacted
+                if slot.state == ExchangeSlotState.BUYING:
+                    holdings[GP_ITEM_ID] = holdings.get(GP_ITEM_ID, 0) + remaining * slot.price
+                elif slot.state == ExchangeSlotState.SELLING:
+                    holdings[slot.item_id] = holdings.get(slot.item_id, 0) + remaining
+            return {item_id: quantity for item_id, quantity in holdings.items() if quantity}
+
+    def _exchange_payload(self) -> Dict[str, Any]:
+        return {
+            "slots": [
+                {
+                    "position": slot.position,
+                    "itemId": slot.item_id,
+                    "price": slot.price,
+                    "quantityTransacted": slot.quantity_transacted,
+                    "totalQuantity": slot.total_quantity,
+                    "state": slot.state.name,
+                }
+                for slot in (self._get_slot(position) for position in range(self.NUM_SLOTS))
+            ]
+        }
+
+    def _inventory_payload(self) -> Dict[str, Any]:
+        return {
+            "items": [
+                {"id": item_id, "quantity": quantity, "inventoryPosition": position}
+                for position, (item_id, quantity) in enumerate(self.inventory.items())
+            ]
+        }
+
+    @staticmethod
+    def _player_payload() -> Dict[str, Any]:
+        expected: PlayerState = Player.EXPECTED_PLAYER_STATE
+        return {
+            "loggedIn": expected.logged_in,
+            "camera": {"z": expected.camera.z, "yaw": expected.camera.yaw, "scale": expected.camera.scale + 1},
+            "location": {"x": expected.location.x, "y": expected.location.y},
+        }
+
+    @staticmethod
+    def _chat_payload() -> Dict[str, Any]:
+        return {"messages": [], "lastSequence": 0}
+
+    def get_payload(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            if endpoint == "/health":
+                return {"status": "healthy"}
+            if endpoint == "/session":
+                return dict(self.session)
+            if endpoint == "/config":
+                return self.config
+            if endpoint == "/exchange":
+                return self._exchange_payload()
+            if endpoint == "/inventory":
+                return self._inventory_payload()
+            if endpoint == "/player":
+                return self._player_payload()
+            if endpoint == "/chat":
+                return self._chat_payload()
+            if endpoint == "/snapshot":
+                return {
+                    "session": dict(self.session),
+                    "exchange": self._exchange_payload(),
+                    "inventory": self._inventory_payload(),
+                    "player": self._player_payload(),
+                    "chatBox": self._chat_payload(),
+                    "creationTime": int(time.time() * 1000),
+                }
+            return None
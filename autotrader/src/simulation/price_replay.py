@@ -0,0 +1,92 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from core.clients.price.models.price import AvgPrice
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.price_history import PriceHistory
+
+
+class PriceReplay:
+
+    def __init__(self, price_history: PriceHistory, mapping: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.price_history: PriceHistory = price_history
+        self.bucket_times: np.ndarray = price_history.get_bucket_times()
+        self.mapping: List[Dict[str, Any]] = mapping or [
+            {"id": item_id, "name": f"Item {item_id}", "members": False}
+            for item_id in sorted(price_history.metadata.item_ids)
+        ]
+        self.position: int = 0
+        self.snapshot: Optional[PriceDataSnapshot] = None
+        self.snapshot_time: Optional[int] = None
+        # wiki shaped responses are only built when something asks for them, so backtests never pay for them
+        self.lock: Lock = Lock()
+        self._payloads: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.bucket_times)
+
+    @property
+    def bucket_secs(self) -> int:
+        return self.price_history.metadata.bucket_secs
+
+    @property
+    def current_time(self) -> int:
+        return int(self.bucket_times[self.position])
+
+    @property
+    def exhausted(self) -> bool:
+        return self.position >= len(self.bucket_times)
+
+    @staticmethod
+    def _to_avg_payload(avg_map: Dict[int, AvgPrice], timestamp: int) -> Dict[str, Any]:
+        return {
+            "data": {
+                str(item_id): {
+                    "avgLowPrice": price.low_price,
+                    "avgHighPrice": price.high_price,
+                    "lowPriceVolume": price.low_volume,
+                    "highPriceVolume": price.high_volume,
+                }
+                for item_id, price in avg_map.items()
+            },
+            "timestamp": timestamp,
+        }
+
+    def _to_payloads(self, snapshot: PriceDataSnapshot, timestamp: int) -> Dict[str, Any]:
+        latest: Dict[str, Any] = {
+            "data": {
+                str(item_id): {
+                    "low": price.low_price,
+                    "high": price.high_price,
+                    "lowTime": price.low_time or timestamp,
+                    "highTime": price.high_time or timestamp,
+                }
+                for item_id, price in snapshot.latest_map.items()
+            }
+        }
+        return {
+            "/mapping": self.mapping,
+            "/latest": latest,
+            "/5m": self._to_avg_payload(snapshot.avg_5m_map, timestamp),
+            "/1h": self._to_avg_payload(snapshot.avg_1h_map, timestamp),
+        }
+
+    @property
+    def payloads(self) -> Dict[str, Any]:
+        with self.lock:
+            if self.snapshot is None:
+                return {"/mapping": self.mapping}
+            if self._payloads is None:
+                self._payloads = self._to_payloads(snapshot=self.snapshot, timestamp=self.snapshot_time)
+            return self._payloads
+
+    def step(self) -> PriceDataSnapshot:
+        timestamp: int = self.current_time
+        snapshot: PriceDataSnapshot = self.price_history.get_snapshot(timestamp)
+        with self.lock:
+            self.snapshot = snapshot
+            self.snapshot_time = timestamp
+            self._payloads = None
+        self.position += 1
+        return snapshot
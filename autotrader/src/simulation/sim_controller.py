@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import pytweening
+
+from interface.controller import Controller
+from interface.screen_locator import ScreenLocator
+from simulation.exceptions import SimulatedOfferError, UnknownItemNameError
+from simulation.ge_simulator import GeSimulator
+
+
+@dataclass
+class PendingOffer:
+    position: int
+    is_buy: bool
+    item_id: Optional[int] = None
+    quantity: Optional[int] = None
+    price: Optional[int] = None
+
+
+class SimController(Controller):
+
+    def __init__(self, locator: ScreenLocator, simulator: GeSimulator, item_ids: Dict[str, int]) -> None:
+        super().__init__(locator=locator, randomize=False)
+        self.simulator: GeSimulator = simulator
+        self.item_ids: Dict[str, int] = item_ids
+
+        self.selected_slot: Optional[int] = None
+        self.offer: Optional[PendingOffer] = None
+        self.field: Optional[str] = None
+        self.typed: str = ""
+
+    # there is no screen, so raw input only feeds the typed text buffer
+    def click(
+        self,
+        x: int,
+        y: int,
+        duration: float = 0.0,
+        tween: Callable[[float], float] = pytweening.linear,
+    ) -> None:
+        pass
+
+    def move_to(
+        self,
+        x: int,
+        y: int,
+        duration: float = 0.0,
+        tween: Callable[[float], float] = pytweening.linear,
+    ) -> None:
+        pass
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        self.typed += text
+
+    def press(self, key: str) -> None:
+        if key == "enter":
+            self._commit_field()
+        elif key == "esc":
+            self.typed = ""
+
+    def hold(self, key: str, duration: float) -> None:
+        pass
+
+    def scroll(self, scroll_amt: int) -> None:
+        pass
+
+    def _commit_field(self) -> None:
+        text: str = self.typed
+        self.typed = ""
+        if self.offer is None or self.field is None:
+            return
+
+        if self.field == "item":
+            item_id: Optional[int] = self.item_ids.get(text)
+            if item_id is None:
+                raise UnknownItemNameError(text)
+            self.offer.item_id = item_id
+        elif self.field == "quantity":
+            self.offer.quantity = int(text)
+        elif self.field == "price":
+            self.offer.price = int(text)
+        self.field = None
+
+    def _confirm_offer(self) -> None:
+        offer: Optional[PendingOffer] = self.offer
+        if offer is None or offer.item_id is None or offer.quantity is None or offer.price is None:
+            raise SimulatedOfferError(f"offer was confirmed before it was fully entered: {offer}")
+        self.simulator.place_offer(
+            position=offer.position,
+            is_buy=offer.is_buy,
+            item_id=offer.item_id,
+            price=offer.price,
+            quantity=offer.quantity,
+        )
+        self.offer = None
+
+    def click_location(self, location: str) -> None:
+        self.locator.get_coords(location)
+
+        if location == "ge_enter_quantity":
+            self.field = "quantity"
+        elif location == "ge_enter_price":
+            self.field = "price"
+        elif location == "ge_confirm":
+            self._confirm_offer()
+        elif location == "ge_abort_offer" and self.selected_slot is not None:
+            self.simulator.abort_offer(self.selected_slot)
+        elif location in ("ge_collect_coins", "ge_collect_items") and self.selected_slot is not None:
+            self.simulator.collect(self.selected_slot)
+        elif location == "ge_collect":
+            self.simulator.collect_all()
+        elif location == "ge_back":
+            self.selected_slot = None
+
+    def click_ge_slot(self, slot_num: int) -> None:
+        self.locator.get_ge_slot_coords(slot_num)
+
+        self.selected_slot = slot_num
+        if self.simulator.is_slot_empty(slot_num):
+            self.offer = PendingOffer(position=slot_num, is_buy=True)
+            self.field = "item"
+
+    def click_inventory_slot(self, slot_num: int) -> None:
+        self.locator.get_inv_slot_coords(slot_num)
+
+        item_id: Optional[int] = self.simulator.get_inventory_item(slot_num)
+        position: Optional[int] = self.simulator.get_first_empty_slot()
+        if item_id is None or position is None:
+            raise SimulatedOfferError(f"cannot offer inventory slot {slot_num}")
+        # offering an inventory item puts the sell offer in the first free ge slot
+        self.offer = PendingOffer(position=position, is_buy=False, item_id=item_id)
+
+    def exit_ge(self) -> None:
+        super().exit_ge()
+        self.selected_slot = None
+        self.offer = None
+        self.field = None
@@ -1 +1,6 @@
 GP_ITEM_ID: int = 995
+
+# the ge keeps 2% of every sale, rounded down per item and capped per item. items sold below 50gp are exempt
+GE_TAX_RATE: float = 0.02
+GE_TAX_CAP: int = 5_000_000
+GE_TAX_EXEMPT_PRICE: int = 50
@@ -1,11 +1,15 @@
 from typing import Dict, List, Optional
 
+import numpy as np
 from core.clients.gds.models.config.strat_config import MMStratConfig
 from core.clients.gds.models.config.top_level_config import TopLevelConfig
 from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
 from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.inventory.item import Item
 from core.clients.price.models.item_metadata import ItemMetadata
 from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.price_history import PriceHistory
 from core.clients.redis.redis_client import RedisClient
 
 from strategy.action import (
@@ -16,6 +20,8 @@ from strategy.action import (
     OrderAction,
     SellAction,
 )
+from strategy.implementations.mm_pricer import MMPricer
+from strategy.implementations.mm_quotes import MMQuotes
 from strategy.strategy import BaseStrategy
 
 
@@ -47,27 +53,30 @@ class MMStrategy(BaseStrategy):
     def __init__(
         self,
         redis_client: RedisClient,
+        player_name: str,
         top_level_config: TopLevelConfig,
         strat_config: MMStratConfig,
         universe: Optional[List[int]],
         item_map: Dict[int, ItemMetadata],
+        price_history: Optional[PriceHistory] = None,
     ) -> None:
         super().__init__(
             redis_client=redis_client,
+            player_name=player_name,
             top_level_config=top_level_config,
             strat_config=strat_config,
             universe=universe,
             item_map=item_map,
+            price_history=price_history,
         )
         self.items_traded: List[int] = []
+        self.pricer: MMPricer = MMPricer()
+        self.item_ids: np.ndarray = np.array(sorted(self.item_map), dtype=np.int64)
 
     @property
     def name(self) -> str:
         return "Market Maker"
 
-    def is_over_buy_limit(self, item_id: int) -> bool:
-        pass
-
     def generate_cancel_orders(self, exchange: Exchange) -> List[CancelOrderAction]:
         orders: List[CancelOrderAction] = []
         for slot in exchange.slots:
@@ -76,48 +85,59 @@ class MMStrategy(BaseStrategy):
         return orders
 
     def generate_sell_orders(self, inventory: Inventory, price_data: PriceDataSnapshot) -> List[SellAction]:
-        orders: List[SellAction] = []
-        for item in inventory.items:
-            if item.id not in self.universe:
-                continue
-
-            # TODO: calculate sell price
-            price: int = 0
+        items: List[Item] = [item for item in inventory.items if item.id in self.item_map and item.id in price_data]
+        if not items:
+            return []
 
-            orders.append(
-                SellAction(
-                    item_id=item.id,
-                    item_name=self.item_map[item.id].name,
-                    price=price,
-                    quantity=item.quantity,
-                )
+        prices: np.ndarray = self.pricer.get_sell_prices(
+            price_data=price_data,
+            item_ids=np.array([item.id for item in items], dtype=np.int64),
+        )
+        return [
+            SellAction(
+                item_id=item.id,
+                item_name=self.item_map[item.id].name,
+                price=int(price),
+                quantity=item.quantity,
             )
-        return orders
-
-    def generate_buy_orders(self, inventory: Inventory, price_data: PriceDataSnapshot) -> List[BuyAction]:
-        orders: List[BuyAction] = []
-        for item_id in self.universe:
-            if self.is_over_buy_limit(item_id):
-                continue
+            for item, price in zip(items, prices.tolist())
+            if not np.isnan(price)
+        ]
 
-            # TODO: calculate buy price, qty, and expected profit (based on sell price)
-            price: int = 0
-            quantity: int = 0
-            expected_profit: int = 0
-
-            if expected_profit < self.top_level_config.min_gp:
-                continue
-
-            orders.append(
-                BuyAction(
-                    item_id=item_id,
-                    item_name=self.item_map[item_id].name,
-                    price=price,
-                    quantity=quantity,
-                )
+    def generate_buy_orders(
+        self,
+        exchange: Exchange,
+        inventory: Inventory,
+        price_data: PriceDataSnapshot,
+        max_orders: int,
+    ) -> List[BuyAction]:
+        item_ids: np.ndarray = self.item_ids[np.isin(self.item_ids, price_data.item_ids)]
+        if not len(item_ids) or max_orders <= 0:
+            return []
+
+        quotes: MMQuotes = self.pricer.quote(
+            price_data=price_data,
+            item_ids=item_ids,
+            remaining_limits=self.get_remaining_buy_limits(item_ids=item_ids, exchange=exchange),
+            gp=self.get_gp(inventory),
+            max_offer_time=self.strat_config.max_offer_time,
+            max_orders=max_orders,
+        )
+        return [
+            BuyAction(
+                item_id=item_id,
+                item_name=self.item_map[item_id].name,
+                price=price,
+                quantity=quantity,
             )
-
-        return orders
+            for item_id, price, quantity, expected_profit in zip(
+                quotes.item_ids.tolist(),
+                quotes.buy_prices.tolist(),
+                quotes.quantities.tolist(),
+                quotes.expected_profits.tolist(),
+            )
+            if expected_profit >= self.top_level_config.min_gp
+        ]
 
     def compute(
         self,
@@ -127,7 +147,15 @@ class MMStrategy(BaseStrategy):
     ) -> List[OrderAction]:
         cancels: List[CancelOrderAction] = self.generate_cancel_orders(exchange=exchange)
         sells: List[SellAction] = self.generate_sell_orders(inventory=inventory, price_data=price_data)
-        buys: List[BuyAction] = self.generate_buy_orders(inventory=inventory, price_data=price_data)
+        # only as many buys as there are empty slots left after the sells are priced and funded. slots freed by
+        # cancels only open up next cycle
+        free_slots: int = sum(slot.state == ExchangeSlotState.EMPTY for slot in exchange.slots)
+        buys: List[BuyAction] = self.generate_buy_orders(
+            exchange=exchange,
+            inventory=inventory,
+            price_data=price_data,
+            max_orders=free_slots - len(sells),
+        )
 
         orders: List[OrderAction] = self.extract_executable_orders(
             exchange=exchange,
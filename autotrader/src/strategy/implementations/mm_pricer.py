@@ -0,0 +1,78 @@
+import numpy as np
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
+
+from strategy.constants import GE_TAX_CAP, GE_TAX_EXEMPT_PRICE, GE_TAX_RATE
+from strategy.implementations.mm_quotes import MMQuotes
+
+
+class MMPricer:
+
+    AVG_WINDOW_SECS: int = 5 * 60
+    # share of the market's traded volume our offers are assumed to capture
+    PARTICIPATION_RATE: float = 0.25
+    # quotes sit one gp inside the spread so they fill ahead of offers at the instant prices
+    UNDERCUT: int = 1
+
+    @staticmethod
+    def get_tax(prices: np.ndarray) -> np.ndarray:
+        tax: np.ndarray = np.minimum(np.floor(prices * GE_TAX_RATE), GE_TAX_CAP)
+        return np.where(prices < GE_TAX_EXEMPT_PRICE, 0.0, tax)
+
+    def get_sell_prices(self, price_data: PriceDataSnapshot, item_ids: np.ndarray) -> np.ndarray:
+        # NaN for items the snapshot has no instant buy price for
+        return price_data.column(PriceField.LATEST_HIGH)[price_data.positions(item_ids.tolist())] - self.UNDERCUT
+
+    def quote(
+        self,
+        price_data: PriceDataSnapshot,
+        item_ids: np.ndarray,
+        remaining_limits: np.ndarray,
+        gp: int,
+        max_offer_time: int,
+        max_orders: int,
+    ) -> MMQuotes:
+        values: np.ndarray = price_data.columns(
+            [
+                PriceField.LATEST_LOW,
+                PriceField.LATEST_HIGH,
+                PriceField.AVG_5M_LOW_VOLUME,
+                PriceField.AVG_5M_HIGH_VOLUME,
+            ]
+        )[price_data.positions(item_ids.tolist())]
+        buy_prices: np.ndarray = values[:, 0] + self.UNDERCUT
+        sell_prices: np.ndarray = values[:, 1] - self.UNDERCUT
+        margins: np.ndarray = sell_prices - buy_prices - self.get_tax(sell_prices)
+
+        # a round trip needs both sides to trade, so the thinner side bounds how much can fill
+        volumes: np.ndarray = np.nan_to_num(values[:, 2:]).min(axis=1)
+        expected_volumes: np.ndarray = volumes * self.PARTICIPATION_RATE * max_offer_time / self.AVG_WINDOW_SECS
+
+        with np.errstate(invalid="ignore"):
+            valid: np.ndarray = (margins > 0) & (remaining_limits > 0) & (expected_volumes > 0)
+        # gp is split evenly over the orders being placed, so one expensive item cannot take every slot's share
+        affordable: np.ndarray = np.floor(gp / max(max_orders, 1) / np.where(valid, buy_prices, 1.0))
+        # beyond the expected volume extra quantity mostly sits unfilled, locking up gp another item could use
+        quantities: np.ndarray = np.where(
+            valid,
+            np.minimum(np.minimum(remaining_limits, affordable), np.maximum(np.floor(expected_volumes), 1.0)),
+            0.0,
+        )
+
+        # fills are modelled as arriving at the expected volume over the offer's lifetime, so
+        # quantity * likelihood is the quantity expected to fill and grows ever slower with size
+        fill_likelihoods: np.ndarray = -np.expm1(-expected_volumes / np.maximum(quantities, 1.0))
+        expected_profits: np.ndarray = margins * quantities * fill_likelihoods
+
+        ranked: np.ndarray = np.flatnonzero(valid & (quantities > 0))
+        ranked = ranked[np.argsort(-expected_profits[ranked], kind="stable")][:max_orders]
+
+        return MMQuotes(
+            item_ids=item_ids[ranked],
+            buy_prices=buy_prices[ranked].astype(np.int64),
+            sell_prices=sell_prices[ranked].astype(np.int64),
+            margins=margins[ranked],
+            quantities=quantities[ranked].astype(np.int64),
+            fill_likelihoods=fill_likelihoods[ranked],
+            expected_profits=expected_profits[ranked],
+        )
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class MMQuotes:
+    # one entry per quoted item, ranked by expected profit, best first
+    item_ids: np.ndarray
+    buy_prices: np.ndarray
+    sell_prices: np.ndarray
+    margins: np.ndarray
+    quantities: np.ndarray
+    fill_likelihoods: np.ndarray
+    expected_profits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
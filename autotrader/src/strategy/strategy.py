@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
+import numpy as np
 from core.clients.gds.models.config.strat_config import StratConfig
 from core.clients.gds.models.config.top_level_config import TopLevelConfig
 from core.clients.gds.models.exchange.exchange import Exchange
@@ -9,6 +10,8 @@ from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotSta
 from core.clients.gds.models.inventory.inventory import Inventory
 from core.clients.price.models.item_metadata import ItemMetadata
 from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.price_history import PriceHistory
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
 from core.clients.redis.redis_client import RedisClient
 
 from strategy.action import BuyAction, CancelOrderAction, OrderAction, SellAction
@@ -21,18 +24,22 @@ class BaseStrategy(ABC):
     def __init__(
         self,
         redis_client: RedisClient,
+        player_name: str,
         top_level_config: TopLevelConfig,
         strat_config: StratConfig,
         universe: Optional[List[int]],
         item_map: Dict[int, ItemMetadata],
+        price_history: Optional[PriceHistory] = None,
     ) -> None:
         self.redis_client: RedisClient = redis_client
+        self.player_name: str = player_name
         self.top_level_config: TopLevelConfig = top_level_config
         self.strat_config: StratConfig = strat_config
         self.universe: Optional[List[int]] = universe
         self.item_map: Dict[int, ItemMetadata] = (
             item_map if universe is None else {id: meta for id, meta in item_map.items() if id in universe}
         )
+        self.price_history: Optional[PriceHistory] = price_history
         self.next_run_time: float = 0.0
 
     @property
@@ -57,6 +64,21 @@ class BaseStrategy(ABC):
                 return item.quantity
         raise MissingGpError()
 
+    def get_remaining_buy_limits(self, item_ids: np.ndarray, exchange: Exchange) -> np.ndarray:
+        buy_limits: Dict[int, BuyLimit] = self.redis_client.get_all_buy_limits(player_name=self.player_name)
+        # quantities still waiting in open buy offers count against the limit once they fill
+        pending: Dict[int, int] = {}
+        for slot in exchange.slots:
+            if slot.state == ExchangeSlotState.BUYING:
+                pending[slot.item_id] = pending.get(slot.item_id, 0) + slot.total_quantity - slot.quantity_transacted
+
+        remaining: List[int] = []
+        for item_id in item_ids.tolist():
+            buy_limit: Optional[BuyLimit] = buy_limits.get(item_id)
+            limit: int = self.item_map[item_id].limit if buy_limit is None else buy_limit.limit - buy_limit.bought
+            remaining.append(limit - pending.get(item_id, 0))
+        return np.maximum(np.array(remaining, dtype=np.float64), 0.0)
+
     def extract_executable_orders(
         self,
         exchange: Exchange,
@@ -64,8 +86,10 @@ class BaseStrategy(ABC):
         sells: List[SellAction],
         buys: List[BuyAction],
     ) -> List[OrderAction]:
+        # a cancelled slot keeps its items until the next cycle collects it, so only empty slots take new orders.
+        # OrderExecutor.plan hands out slots the same way
         available_slots: List[ExchangeSlot] = [s for s in exchange.slots if s.state == ExchangeSlotState.EMPTY]
-        remaining_slots: int = len(available_slots) + len(cancels)
+        remaining_slots: int = len(available_slots)
         if not remaining_slots:
             return cancels
 
@@ -4,6 +4,7 @@ from typing import Dict, List
 from core.clients.gds.models.config.strat_config import MMStratConfig, StratConfig
 from core.clients.gds.models.config.top_level_config import TopLevelConfig
 from core.clients.price.models.item_metadata import ItemMetadata
+from core.clients.price.price_history import PriceHistory
 from core.clients.redis.redis_client import RedisClient
 
 from strategy.exceptions import UnsupportedStratError
@@ -13,9 +14,18 @@ from strategy.strategy import BaseStrategy
 
 class StrategyFactory:
 
-    def __init__(self, redis_client: RedisClient, item_map: Dict[int, ItemMetadata], is_f2p: bool) -> None:
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        player_name: str,
+        item_map: Dict[int, ItemMetadata],
+        price_history: PriceHistory,
+        is_f2p: bool,
+    ) -> None:
         self.redis_client: RedisClient = redis_client
+        self.player_name: str = player_name
         self.item_map: Dict[int, ItemMetadata] = item_map
+        self.price_history: PriceHistory = price_history
         self.universe_map: Dict[str, List[int]] = self.get_universe_map(is_f2p)
 
     def get_universe_map(self, is_f2p: bool) -> Dict[str, List[int]]:
@@ -31,9 +41,11 @@ class StrategyFactory:
         if isinstance(strat_config, MMStratConfig):
             return MMStrategy(
                 redis_client=self.redis_client,
+                player_name=self.player_name,
                 top_level_config=top_level_config,
                 strat_config=strat_config,
                 universe=self.universe_map.get(MMStrategy.__name__.lower()),
                 item_map=self.item_map.copy(),
+                price_history=self.price_history,
             )
         raise UnsupportedStratError(type(strat_config).__name__)
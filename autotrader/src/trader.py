@@ -1,7 +1,9 @@
 import signal
 import time
 import types
-from typing import Any, Callable, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional
 
 from core.clients.gds.gds_client import GdsClient
 from core.clients.gds.models.config.live_config import LiveConfig
@@ -10,14 +12,18 @@ from core.clients.gds.models.inventory.inventory import Inventory
 from core.clients.gds.models.session_metadata import SessionMetadata
 from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
 from core.clients.price.price_client import PriceClient
+from core.clients.price.price_history import PriceHistory
 from core.clients.redis.models.trade_session.trade_session import TradeSession
 from core.clients.redis.redis_client import RedisClient
 from core.clients.tdp.tdp_client import TdpClient
 from core.config.environment import Environment
 from core.logger import logger
+from core.tracing.tracer import Tracer
 
 from executor import OrderExecutor
+from interface.game_state import GameState
 from interface.player import Player
+from planned_action import PlannedAction
 from strategy.action import OrderAction
 from strategy.strategy import BaseStrategy
 from strategy.strategy_manager import StrategyManager
@@ -25,14 +31,18 @@ from strategy.strategy_manager import StrategyManager
 
 class Trader:
 
+    STRAT_COMPUTE_WORKERS: int = 4
+
     def __init__(
         self,
         env: Environment,
         autotrader_wait: float,
         redis_client: RedisClient,
         price_client: PriceClient,
+        price_history: PriceHistory,
         gds_client: GdsClient,
         tdp_client: TdpClient,
+        game_state: GameState,
         player: Player,
         order_executor: OrderExecutor,
         strat_manager: StrategyManager,
@@ -41,12 +51,19 @@ class Trader:
         self.autotrader_wait: float = autotrader_wait
         self.redis_client: RedisClient = redis_client
         self.price_client: PriceClient = price_client
+        self.price_history: PriceHistory = price_history
         self.gds_client: GdsClient = gds_client
         self.tdp_client: TdpClient = tdp_client
+        self.game_state: GameState = game_state
         self.player: Player = player
         self.order_executor: OrderExecutor = order_executor
         self.strat_manager: StrategyManager = strat_manager
 
+        self.strat_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.STRAT_COMPUTE_WORKERS,
+            thread_name_prefix="strat-compute",
+        )
+
         self._autotrader_active: bool = True
         self.session_metadata: SessionMetadata = gds_client.session_metadata
         self.trade_session: TradeSession = self.setup_trade_session()
@@ -67,9 +84,10 @@ class Trader:
     def lock_resources(f: Callable) -> Callable:
         def lock(self: "Trader", *args, **kwargs) -> Any:
             self.redis_client.set_session_validity(session_id=self.trade_session.session_id, valid=False)
-            result: Any = f(self, *args, **kwargs)
-            self.redis_client.set_session_validity(session_id=self.trade_session.session_id, valid=True)
-            return result
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                self.redis_client.set_session_validity(session_id=self.trade_session.session_id, valid=True)
 
         return lock
 
@@ -109,39 +127,73 @@ class Trader:
         logger.info(f"====== Trading enabled. Entering calc cycle {calc_cycle} ======")
 
         logger.info("Refreshing buy limits")
-        self.tdp_client.update_limits(self.trade_session.player_name, cur_time)
-
-        logger.info("Booking any completed trades in GE")
-        self.order_executor.book_trades(calc_cycle, cur_time)
-
-        logger.info("Fetching data snapshots required for strats")
-        exchange: Exchange = self.gds_client.get_exchange()
-        inventory: Inventory = self.gds_client.get_inventory()
-        price_data: PriceDataSnapshot = self.price_client.get_price_data_snapshot()
-
-        strats_to_compute: List[BaseStrategy] = self.strat_manager.prepare_strats(cur_time)
-        logger.info(f"Prepared {len(strats_to_compute)} active strategies to compute")
-        for strat in strats_to_compute:
-            logger.info(f"--- Processing strat: {strat.name} ---")
-            if strat.universe is not None:
-                price_data: PriceDataSnapshot = PriceDataSnapshot.filter_by_items(
-                    full_snapshot=price_data,
-                    item_ids=strat.universe,
+        with Tracer.span(name="trade.refresh_buy_limits"):
+            self.tdp_client.update_limits(self.trade_session.player_name, cur_time)
+
+        # booking, computing and executing share one ge session, so the interface is opened once per cycle
+        with self.order_executor.ge_session():
+            logger.info("Booking any completed trades in GE")
+            with Tracer.span(name="trade.book_trades"):
+                self.order_executor.book_trades(calc_cycle, cur_time)
+
+            logger.info("Fetching data snapshots required for strats")
+            with Tracer.span(name="trade.fetch_snapshots"):
+                exchange: Exchange = self.game_state.exchange
+                inventory: Inventory = self.game_state.inventory
+                price_data: PriceDataSnapshot = self.price_client.get_price_data_snapshot()
+                self.price_history.append(snapshot=price_data, timestamp=cur_time)
+
+            strats_to_compute: List[BaseStrategy] = self.strat_manager.prepare_strats(cur_time)
+            logger.info(f"Prepared {len(strats_to_compute)} active strategies to compute")
+            # strats only read the snapshot and their own state, so they compute side by side. every task runs
+            # in its own copy of the cycle's context so its span joins the cycle's trace
+            futures: List[Future] = [
+                self.strat_executor.submit(
+                    copy_context().run, self.compute_strat, strat, exchange, inventory, price_data
                 )
-
-            logger.info("Computing strat")
-            actions: List[OrderAction] = strat.compute(exchange=exchange, inventory=inventory, price_data=price_data)
-            if not actions:
+                for strat in strats_to_compute
+            ]
+            strat_actions: Dict[str, List[OrderAction]] = {
+                strat.name: future.result() for strat, future in zip(strats_to_compute, futures)
+            }
+
+            plan: List[PlannedAction] = self.order_executor.plan(
+                strat_actions=strat_actions,
+                exchange=exchange,
+                inventory=inventory,
+            )
+            if not plan:
                 logger.info("No order actions generated")
-                continue
+                return
 
-            logger.info(f"Executing {len(actions)} order actions generated by strat")
-            self.order_executor.execute(
-                actions=actions,
-                calc_cycle=calc_cycle,
-                strat_name=strat.name,
+            logger.info(f"Executing {len(plan)} order actions generated by {len(strat_actions)} strats")
+            with Tracer.span(name="trade.execute_orders", num_actions=len(plan)):
+                self.order_executor.execute(plan=plan, calc_cycle=calc_cycle)
+
+    @staticmethod
+    def compute_strat(
+        strat: BaseStrategy,
+        exchange: Exchange,
+        inventory: Inventory,
+        price_data: PriceDataSnapshot,
+    ) -> List[OrderAction]:
+        logger.info(f"--- Computing strat: {strat.name} ---")
+        if strat.universe is not None:
+            price_data: PriceDataSnapshot = PriceDataSnapshot.filter_by_items(
+                full_snapshot=price_data,
+                item_ids=strat.universe,
             )
 
+        with Tracer.span(name="trade.compute_strat", strat=strat.name):
+            return strat.compute(exchange=exchange, inventory=inventory, price_data=price_data)
+
+    def run_cycle(self, calc_cycle: int, cur_time: float) -> None:
+        self.game_state.invalidate()
+        self.player.prepare()
+
+        with Tracer.span(name="trade.calc_cycle", calc_cycle=calc_cycle):
+            self.trade(calc_cycle, cur_time)
+
     def start(self) -> None:
         logger.info("Starting auto trader")
 
@@ -154,10 +206,8 @@ class Trader:
                 self.wait()
                 continue
 
-            self.player.prepare()
-
             calc_cycle += 1
-            self.trade(calc_cycle, cur_time)
+            self.run_cycle(calc_cycle, cur_time)
 
             duration: float = self.strat_manager.next_strat_wait_time(cur_time)
             self.wait(duration)
@@ -0,0 +1,209 @@
+from typing import Dict, List
+from unittest.mock import MagicMock, call
+
+import pytest
+from core.clients.gds.models.chat.message import Message
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.inventory.item import Item
+from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
+from core.clients.redis.models.trade_session.offer_type import OfferType
+from core.clients.redis.models.trade_session.trade import Trade
+
+from exceptions import PlayerStateError
+from executor import OrderExecutor
+from planned_action import PlannedAction
+from strategy.action import BuyAction, CancelBuyAction, CancelSellAction, OrderAction, SellAction
+from strategy.constants import GP_ITEM_ID
+
+
+NUM_SLOTS: int = 8
+PLAYER_NAME: str = "player"
+
+
+def create_executor() -> OrderExecutor:
+    gds_client: MagicMock = MagicMock()
+    gds_client.session_metadata.player_name = PLAYER_NAME
+    gds_client.session_metadata.start_time = 0.0
+    executor: OrderExecutor = OrderExecutor(
+        controller=MagicMock(),
+        redis_client=MagicMock(),
+        gds_client=gds_client,
+        tdp_client=MagicMock(),
+        game_state=MagicMock(),
+    )
+    executor.pause_actions = False
+    return executor
+
+
+def create_exchange(active: Dict[int, ExchangeSlotState]) -> Exchange:
+    slots: List[ExchangeSlot] = []
+    for position in range(NUM_SLOTS):
+        state: ExchangeSlotState = active.get(position, ExchangeSlotState.EMPTY)
+        if state == ExchangeSlotState.EMPTY:
+            slots.append(ExchangeSlot(position, -1, 0, 0, 0, state))
+        else:
+            slots.append(ExchangeSlot(position, 100 + position, 50, 0, 10, state))
+    return Exchange(slots=slots)
+
+
+def create_trade(ge_slot: int) -> Trade:
+    metadata: OfferMetadata = OfferMetadata(OfferType.BUY, 100 + ge_slot, 50, 10, ge_slot)
+    return Trade(id=str(ge_slot), calc_cycle=1, strat_name="mm", transacted=10, metadata=metadata, time=1.0)
+
+
+def buy(item_id: int, price: int = 10, quantity: int = 10) -> BuyAction:
+    return BuyAction(item_id=item_id, item_name=f"item {item_id}", price=price, quantity=quantity)
+
+
+def sell(item_id: int, price: int = 10, quantity: int = 10) -> SellAction:
+    return SellAction(item_id=item_id, item_name=f"item {item_id}", price=price, quantity=quantity)
+
+
+def test_plan_runs_every_cancel_before_any_input() -> None:
+    exchange: Exchange = create_exchange({0: ExchangeSlotState.BUYING, 1: ExchangeSlotState.SELLING})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 1_000_000, 0), Item(7, 10, 1)])
+    strat_actions: Dict[str, List[OrderAction]] = {
+        "first": [buy(5), CancelBuyAction(ge_slot=0)],
+        "second": [sell(7), CancelSellAction(ge_slot=1)],
+    }
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(p.strat_name, type(p.action)) for p in plan] == [
+        ("first", CancelBuyAction),
+        ("second", CancelSellAction),
+        ("second", SellAction),
+        ("first", BuyAction),
+    ]
+
+
+def test_plan_does_not_reuse_cancelled_slots() -> None:
+    # every slot but the last is active, and cancelling one does not free it until the next cycle collects it
+    exchange: Exchange = create_exchange({p: ExchangeSlotState.BUYING for p in range(NUM_SLOTS - 1)})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 1_000_000, 0)])
+    strat_actions: Dict[str, List[OrderAction]] = {"mm": [CancelBuyAction(ge_slot=0), buy(5), buy(6)]}
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(type(p.action), p.metadata.ge_slot) for p in plan] == [(CancelBuyAction, 0), (BuyAction, NUM_SLOTS - 1)]
+
+
+def test_plan_assigns_lowest_empty_slots_in_order() -> None:
+    exchange: Exchange = create_exchange({0: ExchangeSlotState.BUYING, 2: ExchangeSlotState.SELLING})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 1_000_000, 0)])
+    strat_actions: Dict[str, List[OrderAction]] = {"first": [buy(5), buy(6)], "second": [buy(7)]}
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(p.action.item_id, p.metadata.ge_slot) for p in plan] == [(5, 1), (6, 3), (7, 4)]
+    assert all(p.inv_slot is None for p in plan)
+
+
+def test_plan_drops_cancels_of_inactive_slots() -> None:
+    exchange: Exchange = create_exchange({0: ExchangeSlotState.BOUGHT, 1: ExchangeSlotState.SELLING})
+    inventory: Inventory = Inventory(items=[])
+    strat_actions: Dict[str, List[OrderAction]] = {
+        "mm": [CancelBuyAction(ge_slot=0), CancelSellAction(ge_slot=1), CancelBuyAction(ge_slot=2)]
+    }
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert len(plan) == 1
+    # the order metadata of a cancel comes from the offer in its slot
+    assert plan[0].metadata.ge_slot == 1
+    assert plan[0].metadata.item_id == 101
+    assert plan[0].metadata.quantity == 10
+
+
+def test_plan_gives_earlier_strats_the_last_free_slots() -> None:
+    exchange: Exchange = create_exchange({p: ExchangeSlotState.BUYING for p in range(NUM_SLOTS - 1)})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 1_000_000, 0)])
+    strat_actions: Dict[str, List[OrderAction]] = {"first": [buy(5)], "second": [buy(6)]}
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(p.strat_name, p.metadata.ge_slot) for p in plan] == [("first", NUM_SLOTS - 1)]
+
+
+def test_plan_drops_buys_the_remaining_gp_cannot_cover() -> None:
+    exchange: Exchange = create_exchange({})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 1_500, 0)])
+    # the second buy no longer fits once the first took its gp, but the cheaper third one still does
+    strat_actions: Dict[str, List[OrderAction]] = {
+        "mm": [buy(5, price=100, quantity=10), buy(6, price=100, quantity=10), buy(7, price=10, quantity=50)]
+    }
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(p.action.item_id, p.metadata.ge_slot) for p in plan] == [(5, 0), (7, 1)]
+
+
+def test_plan_sells_from_the_inventory_slot_holding_the_item() -> None:
+    exchange: Exchange = create_exchange({})
+    inventory: Inventory = Inventory(items=[Item(GP_ITEM_ID, 100, 0), Item(5, 10, 3), Item(6, 4, 7)])
+    # the second sell of item 5 is dropped because the first one already offered all of it
+    strat_actions: Dict[str, List[OrderAction]] = {"mm": [sell(5), sell(5), sell(6, quantity=5), sell(8)]}
+
+    plan: List[PlannedAction] = create_executor().plan(
+        strat_actions=strat_actions, exchange=exchange, inventory=inventory
+    )
+
+    assert [(p.action.item_id, p.metadata.ge_slot, p.inv_slot) for p in plan] == [(5, 0, 3)]
+
+
+def test_execute_checks_chat_before_every_action() -> None:
+    executor: OrderExecutor = create_executor()
+    exchange: Exchange = create_exchange({0: ExchangeSlotState.BUYING, 1: ExchangeSlotState.BUYING})
+    strat_actions: Dict[str, List[OrderAction]] = {"mm": [CancelBuyAction(ge_slot=0), CancelBuyAction(ge_slot=1)]}
+    plan: List[PlannedAction] = executor.plan(strat_actions=strat_actions, exchange=exchange, inventory=Inventory([]))
+    # the player speaks after the first cancel was clicked
+    executor.game_state.read_messages.side_effect = [[], [Message("hi", PLAYER_NAME, 1.0, 1)]]
+
+    with pytest.raises(PlayerStateError):
+        executor.execute(plan=plan, calc_cycle=1)
+
+    assert executor.game_state.refresh_chat.call_count == 2
+    executor.controller.click_ge_slot.assert_called_once_with(0)
+    executor.tdp_client.save_orders.assert_not_called()
+
+
+def test_book_trades_reads_the_exchange_after_the_tdp_booked() -> None:
+    executor: OrderExecutor = create_executor()
+    executor.tdp_client.book_trades.return_value = {"mm": [create_trade(ge_slot=2)]}
+    # slot 3 finished after the tdp read the exchange, so it is left for the next cycle to book
+    executor.game_state.exchange = create_exchange({2: ExchangeSlotState.BOUGHT, 3: ExchangeSlotState.SOLD})
+
+    executor.book_trades(calc_cycle=1, cur_time=1.0)
+
+    assert executor.game_state.invalidate.call_count == 2
+    # collecting everything at once would also empty slot 3 before it is booked
+    executor.controller.click_ge_slot.assert_called_once_with(2)
+    assert executor.controller.click_location.call_args_list == [call("ge_collect_coins"), call("ge_collect_items")]
+
+
+def test_book_trades_collects_everything_when_every_finished_slot_was_booked() -> None:
+    executor: OrderExecutor = create_executor()
+    executor.tdp_client.book_trades.return_value = {"mm": [create_trade(ge_slot=2)], "other": [create_trade(ge_slot=5)]}
+    executor.game_state.exchange = create_exchange(
+        {1: ExchangeSlotState.BUYING, 2: ExchangeSlotState.BOUGHT, 5: ExchangeSlotState.CANCELLED_SELL}
+    )
+
+    executor.book_trades(calc_cycle=1, cur_time=1.0)
+
+    executor.controller.click_ge_slot.assert_not_called()
+    executor.controller.click_location.assert_called_once_with("ge_collect")
@@ -0,0 +1,122 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
+
+from strategy.implementations.mm_pricer import MMPricer
+from strategy.implementations.mm_quotes import MMQuotes
+
+
+MAX_OFFER_TIME: int = 5 * 60  # one averaging window, so expected volume is a quarter of the thinner side
+NO_LIMIT: int = 1_000_000
+
+# item id: (latest low, latest high, 5m low volume, 5m high volume)
+PRICES: Dict[int, Tuple[float, float, float, float]] = {
+    1: (100, 120, 400, 400),  # margin 16 after tax, expected volume 100
+    2: (1000, 1100, 40, 80),  # margin 77 after tax, expected volume 10
+    3: (100, 102, 400, 400),  # spread does not cover tax
+    4: (200, 260, 400, 400),  # profitable, but given no buy limit left below
+    5: (100, 120, 0, 400),  # nothing trades on one side
+    6: (100, np.nan, 400, 400),  # no instant sell price
+    7: (10, 20, 1000, 1000),  # under the tax exempt price, margin 8, expected volume 250
+}
+
+
+def create_snapshot() -> PriceDataSnapshot:
+    item_ids: np.ndarray = np.array(sorted(PRICES), dtype=np.int64)
+    values: np.ndarray = np.full((len(item_ids), len(PriceField)), np.nan)
+    for row, item_id in enumerate(item_ids.tolist()):
+        low, high, low_volume, high_volume = PRICES[item_id]
+        values[row, PriceField.LATEST_LOW] = low
+        values[row, PriceField.LATEST_HIGH] = high
+        values[row, PriceField.AVG_5M_LOW_VOLUME] = low_volume
+        values[row, PriceField.AVG_5M_HIGH_VOLUME] = high_volume
+    return PriceDataSnapshot.from_arrays(item_ids=item_ids, values=values)
+
+
+def quote(gp: int, max_orders: int, limits: Dict[int, int]) -> MMQuotes:
+    item_ids: np.ndarray = np.array(sorted(PRICES), dtype=np.int64)
+    return MMPricer().quote(
+        price_data=create_snapshot(),
+        item_ids=item_ids,
+        remaining_limits=np.array([limits.get(i, NO_LIMIT) for i in item_ids.tolist()], dtype=np.float64),
+        gp=gp,
+        max_offer_time=MAX_OFFER_TIME,
+        max_orders=max_orders,
+    )
+
+
+def expected_profit(margin: float, quantity: int, expected_volume: float) -> float:
+    return margin * quantity * -math.expm1(-expected_volume / quantity)
+
+
+def test_quotes_only_profitable_tradeable_items() -> None:
+    quotes: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0})
+    assert sorted(quotes.item_ids.tolist()) == [1, 2, 7]
+
+
+def test_quotes_price_inside_the_spread_after_tax() -> None:
+    quotes: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0})
+    by_item: Dict[int, Tuple[int, int, float]] = {
+        item_id: (buy, sell, margin)
+        for item_id, buy, sell, margin in zip(
+            quotes.item_ids.tolist(),
+            quotes.buy_prices.tolist(),
+            quotes.sell_prices.tolist(),
+            quotes.margins.tolist(),
+        )
+    }
+    assert by_item[1] == (101, 119, 16)
+    assert by_item[2] == (1001, 1099, 77)
+    assert by_item[7] == (11, 19, 8)
+
+
+def test_quotes_are_ranked_by_expected_profit() -> None:
+    quotes: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0})
+    profits: Dict[int, float] = {
+        1: expected_profit(margin=16, quantity=100, expected_volume=100),
+        2: expected_profit(margin=77, quantity=10, expected_volume=10),
+        7: expected_profit(margin=8, quantity=250, expected_volume=250),
+    }
+    assert quotes.item_ids.tolist() == sorted(profits, key=profits.get, reverse=True)
+    np.testing.assert_allclose(quotes.expected_profits, sorted(profits.values(), reverse=True))
+    assert np.all(np.diff(quotes.expected_profits) <= 0)
+
+
+def test_quotes_are_capped_at_max_orders() -> None:
+    full: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0})
+    capped: MMQuotes = quote(gp=100_000_000, max_orders=2, limits={4: 0})
+    assert capped.item_ids.tolist() == full.item_ids.tolist()[:2]
+    assert not len(quote(gp=100_000_000, max_orders=0, limits={4: 0}))
+
+
+def test_quantity_is_capped_by_expected_volume() -> None:
+    quotes: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0})
+    quantities: Dict[int, int] = dict(zip(quotes.item_ids.tolist(), quotes.quantities.tolist()))
+    assert quantities == {1: 100, 2: 10, 7: 250}
+
+
+def test_quantity_is_capped_by_remaining_buy_limit() -> None:
+    quotes: MMQuotes = quote(gp=100_000_000, max_orders=8, limits={4: 0, 7: 40})
+    quantities: Dict[int, int] = dict(zip(quotes.item_ids.tolist(), quotes.quantities.tolist()))
+    assert quantities[7] == 40
+
+
+def test_gp_is_split_evenly_over_orders() -> None:
+    max_orders: int = 4
+    # every order gets a quarter of the gp, which covers only 5 of item 2
+    gp: int = max_orders * 5 * 1001 + 3
+    quotes: MMQuotes = quote(gp=gp, max_orders=max_orders, limits={4: 0})
+    quantities: Dict[int, int] = dict(zip(quotes.item_ids.tolist(), quotes.quantities.tolist()))
+    assert quantities[2] == 5
+    assert quantities[1] == math.floor(gp / max_orders / 101)
+    spent: List[int] = (quotes.quantities * quotes.buy_prices).tolist()
+    assert all(cost <= gp / max_orders for cost in spent)
+
+
+def test_sell_prices_undercut_the_instant_sell_price() -> None:
+    prices: np.ndarray = MMPricer().get_sell_prices(price_data=create_snapshot(), item_ids=np.array([1, 2, 6]))
+    assert prices[:2].tolist() == [119, 1099]
+    assert np.isnan(prices[2])
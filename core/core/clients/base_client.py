@@ -15,3 +15,13 @@ class BaseClient(ABC):
     @abstractmethod
     def establish_connection(self) -> None:
         pass
+
+    def is_healthy(self) -> bool:
+        try:
+            self.establish_connection()
+        except Exception:
+            return False
+        return True
+
+    def close(self) -> None:
+        pass
@@ -1,5 +1,5 @@
 from functools import cached_property
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from requests import Response, Session
 
@@ -13,14 +13,17 @@ from core.clients.gds.models.config.top_level_config import TopLevelConfig
 from core.clients.gds.models.exchange.exchange import Exchange
 from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
 from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.gds.models.game_data_snapshot import GameDataSnapshot
 from core.clients.gds.models.inventory.inventory import Inventory
 from core.clients.gds.models.inventory.item import Item
 from core.clients.gds.models.player.camera import Camera
 from core.clients.gds.models.player.player_location import PlayerLocation
 from core.clients.gds.models.player.player_state import PlayerState
 from core.clients.gds.models.session_metadata import SessionMetadata
+from core.instrumentation import instrument_client
 
 
+@instrument_client("gds")
 class GdsClient(BaseClient):
 
     MAX_F2P_EXCHANGE_SLOTS: int = 3
@@ -31,13 +34,26 @@ class GdsClient(BaseClient):
 
     def establish_connection(self) -> None:
         data: Dict[str, Any] = self.get("/health")
-        if data["health"] != "healthy":
-            raise GdsApiError(f"RuneLite server health status: {data['health']}")
+        if data["status"] != "healthy":
+            raise GdsApiError(f"RuneLite server health status: {data['status']}")
+
+    def close(self) -> None:
+        self.session.close()
 
     @cached_property
     def session_metadata(self) -> SessionMetadata:
         endpoint: str = "/session"
         data: Dict[str, Any] = self.get(endpoint)
+        return self._parse_session_metadata(data)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        resp: Response = self.session.get(url=self.url + endpoint, params=params)
+        if resp.status_code != 200:
+            raise GdsApiError(resp.text)
+        return resp.json()
+
+    @staticmethod
+    def _parse_session_metadata(data: Dict[str, Any]) -> SessionMetadata:
         return SessionMetadata(
             id=data["id"],
             start_time=data["startTime"],
@@ -45,11 +61,57 @@ class GdsClient(BaseClient):
             is_f2p=data["isF2p"],
         )
 
-    def get(self, endpoint: str) -> Dict[str, Any]:
-        resp: Response = self.session.get(url=self.url + endpoint)
-        if resp.status_code != 200:
-            raise GdsApiError(resp.text)
-        return resp.json()
+    def _parse_exchange(self, data: Dict[str, Any], is_f2p: bool) -> Exchange:
+        slots: List[ExchangeSlot] = [
+            ExchangeSlot(
+                position=slot["position"],
+                item_id=slot["itemId"],
+                price=slot["price"],
+                quantity_transacted=slot["quantityTransacted"],
+                total_quantity=slot["totalQuantity"],
+                state=ExchangeSlotState.from_str(slot["state"]),
+            )
+            for slot in data["slots"]
+        ]
+        return Exchange(slots=slots[: self.MAX_F2P_EXCHANGE_SLOTS] if is_f2p else slots)
+
+    @staticmethod
+    def _parse_inventory(data: Dict[str, Any]) -> Inventory:
+        item_data: List[Dict[str, Any]] = data.get("items", [])
+
+        items: List[Item] = [
+            Item(
+                id=item["id"],
+                quantity=item["quantity"],
+                inventory_position=item["inventoryPosition"],
+            )
+            for item in item_data
+        ]
+        return Inventory(items=items)
+
+    @staticmethod
+    def _parse_player_state(data: Dict[str, Any]) -> PlayerState:
+        camera_data: Dict[str, int] = data["camera"]
+        camera: Camera = Camera(
+            z=camera_data["z"],
+            yaw=camera_data["yaw"],
+            scale=camera_data["scale"],
+        )
+
+        location_data: Dict[str, int] = data["location"]
+        location: PlayerLocation = PlayerLocation(x=location_data["x"], y=location_data["y"])
+
+        return PlayerState(logged_in=data["loggedIn"], camera=camera, location=location)
+
+    @staticmethod
+    def _parse_chat_box(data: Dict[str, Any]) -> ChatBox:
+        msg_data: List[Dict[str, Any]] = data.get("messages", [])
+
+        messages: List[Message] = [
+            Message(content=msg["content"], sender=msg["sender"], time=msg["timestamp"], sequence=msg["sequence"])
+            for msg in msg_data
+        ]
+        return ChatBox(messages=messages, last_sequence=data["lastSequence"])
 
     def get_live_config(self) -> LiveConfig:
         endpoint: str = "/config"
@@ -83,57 +145,34 @@ class GdsClient(BaseClient):
     def get_exchange(self) -> Exchange:
         endpoint: str = "/exchange"
         data: Dict[str, Any] = self.get(endpoint)
-
-        slots: List[ExchangeSlot] = [
-            ExchangeSlot(
-                position=slot["position"],
-                item_id=slot["itemId"],
-                price=slot["price"],
-                quantity_transacted=slot["quantityTransacted"],
-                total_quantity=slot["totalQuantity"],
-                state=ExchangeSlotState.from_str(slot["state"]),
-            )
-            for slot in data["slots"]
-        ]
-        return Exchange(slots=slots[: self.MAX_F2P_EXCHANGE_SLOTS] if self.session_metadata.is_f2p else slots)
+        return self._parse_exchange(data=data, is_f2p=self.session_metadata.is_f2p)
 
     def get_inventory(self) -> Inventory:
         endpoint: str = "/inventory"
         data: Dict[str, Any] = self.get(endpoint)
-        item_data: List[Dict[str, Any]] = data.get("items", [])
-
-        items: List[Item] = [
-            Item(
-                id=item["id"],
-                quantity=item["quantity"],
-                inventory_position=item["inventoryPosition"],
-            )
-            for item in item_data
-        ]
-        return Inventory(items=items)
+        return self._parse_inventory(data)
 
     def get_player_data(self) -> PlayerState:
         endpoint: str = "/player"
         data: Dict[str, Any] = self.get(endpoint)
+        return self._parse_player_state(data)
 
-        camera_data: Dict[str, int] = data["camera"]
-        camera: Camera = Camera(
-            z=camera_data["z"],
-            yaw=camera_data["yaw"],
-            scale=camera_data["scale"],
-        )
-
-        location_data: Dict[str, int] = data["location"]
-        location: PlayerLocation = PlayerLocation(x=location_data["x"], y=location_data["y"])
-
-        return PlayerState(logged_in=data["loggedIn"], camera=camera, location=location)
-
-    def get_chat_box(self) -> ChatBox:
+    def get_chat_box(self, since: Optional[int] = None) -> ChatBox:
+        # only messages after the since sequence are sent. pass the last_sequence of the previous read to tail chat
         endpoint: str = "/chat"
-        data: Dict[str, Any] = self.get(endpoint)
-        msg_data: List[Dict[str, Any]] = data.get("messages", [])
-
-        messages: List[Message] = [
-            Message(content=msg["content"], sender=msg["sender"], time=msg["timestamp"]) for msg in msg_data
-        ]
-        return ChatBox(messages=messages)
+        data: Dict[str, Any] = self.get(endpoint, params=None if since is None else {"since": since})
+        return self._parse_chat_box(data)
+
+    def get_snapshot(self, chat_since: Optional[int] = None) -> GameDataSnapshot:
+        endpoint: str = "/snapshot"
+        data: Dict[str, Any] = self.get(endpoint, params=None if chat_since is None else {"chatSince": chat_since})
+
+        session: SessionMetadata = self._parse_session_metadata(data["session"])
+        return GameDataSnapshot(
+            session=session,
+            exchange=self._parse_exchange(data=data["exchange"], is_f2p=session.is_f2p),
+            inventory=self._parse_inventory(data["inventory"]),
+            player_state=self._parse_player_state(data["player"]),
+            chat_box=self._parse_chat_box(data["chatBox"]),
+            creation_time=data["creationTime"] / 1000,
+        )
@@ -7,3 +7,4 @@ from core.clients.gds.models.chat.message import Message
 @dataclass
 class ChatBox:
     messages: List[Message]
+    last_sequence: int
@@ -6,3 +6,4 @@ class Message:
     content: str
     sender: str
     time: float
+    sequence: int
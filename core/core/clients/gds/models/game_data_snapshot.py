@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+from core.clients.gds.models.chat.chat_box import ChatBox
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.inventory.inventory import Inventory
+from core.clients.gds.models.player.player_state import PlayerState
+from core.clients.gds.models.session_metadata import SessionMetadata
+
+
+@dataclass(frozen=True)
+class GameDataSnapshot:
+    session: SessionMetadata
+    exchange: Exchange
+    inventory: Inventory
+    player_state: PlayerState
+    chat_box: ChatBox
+    creation_time: float
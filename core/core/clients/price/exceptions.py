@@ -1,5 +1,6 @@
-from typing import FrozenSet
+from typing import FrozenSet, List
 
+from core.clients.price.models.price_field import PriceField
 from core.clients.price.models.price_window import PriceWindow
 
 
@@ -13,3 +14,9 @@ class UnsupportedPriceWindowError(Exception):
     def __init__(self, actual: PriceWindow, supported: FrozenSet[PriceWindow]) -> None:
         msg: str = f"Unsupported PriceWindow {actual.name}. OSRS wiki api supports {[s.name for s in supported]}"
         super().__init__(msg)
+
+
+class PriceFieldNotArchivedError(Exception):
+    def __init__(self, field: PriceField, archived: List[str]) -> None:
+        msg: str = f"PriceField {field.name} is not stored in price history. Archived fields: {archived}"
+        super().__init__(msg)
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float  # seconds
+    aligned: bool  # expire on the next multiple of ttl, matching the wiki's bucket cadence
+    stale_ttl: float  # seconds an expired response may still be served while it is revalidated
@@ -1,14 +1,29 @@
 from dataclasses import dataclass
-from typing import Dict, List, Type
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Type
+
+import numpy as np
 
 from core.clients.price.models.price import AvgPrice, LatestPrice
+from core.clients.price.models.price_field import PriceField
+from core.clients.price.models.price_window import PriceWindow
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class PriceDataSnapshot:
-    latest_map: Dict[int, LatestPrice]
-    avg_5m_map: Dict[int, AvgPrice]
-    avg_1h_map: Dict[int, AvgPrice]
+    # one row per item and one column per PriceField. NaN marks a price the wiki has no data for.
+    # filtered snapshots share the parent's arrays and only carry the row positions they select.
+    all_item_ids: np.ndarray
+    values: np.ndarray
+    rows: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_arrays(cls: Type["PriceDataSnapshot"], item_ids: np.ndarray, values: np.ndarray) -> "PriceDataSnapshot":
+        if values.shape != (len(item_ids), len(PriceField)):
+            raise ValueError(f"Expected price values of shape {(len(item_ids), len(PriceField))}, got {values.shape}")
+        item_ids.setflags(write=False)
+        values.setflags(write=False)
+        return cls(all_item_ids=item_ids, values=values)
 
     @classmethod
     def filter_by_items(
@@ -16,8 +31,114 @@ class PriceDataSnapshot:
         full_snapshot: "PriceDataSnapshot",
         item_ids: List[int],
     ) -> "PriceDataSnapshot":
-        return cls(
-            latest_map={i: p for i, p in full_snapshot.latest_map.items() if i in item_ids},
-            avg_5m_map={i: p for i, p in full_snapshot.avg_5m_map.items() if i in item_ids},
-            avg_1h_map={i: p for i, p in full_snapshot.avg_1h_map.items() if i in item_ids},
+        rows: np.ndarray = full_snapshot._rows[full_snapshot.positions(item_ids, skip_missing=True)]
+        return cls(all_item_ids=full_snapshot.all_item_ids, values=full_snapshot.values, rows=rows)
+
+    @property
+    def _rows(self) -> np.ndarray:
+        if self.rows is None:
+            return np.arange(len(self.all_item_ids))
+        return self.rows
+
+    @cached_property
+    def item_ids(self) -> np.ndarray:
+        if self.rows is None:
+            return self.all_item_ids
+        return self.all_item_ids[self.rows]
+
+    @cached_property
+    def index(self) -> Dict[int, int]:
+        return {item_id: pos for pos, item_id in enumerate(self.item_ids.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self.index
+
+    def positions(self, item_ids: Iterable[int], skip_missing: bool = False) -> np.ndarray:
+        if skip_missing:
+            return np.array([self.index[i] for i in item_ids if i in self.index], dtype=np.intp)
+        return np.array([self.index[i] for i in item_ids], dtype=np.intp)
+
+    def column(self, field: PriceField) -> np.ndarray:
+        if self.rows is None:
+            return self.values[:, field]
+        return self.values[self.rows, field]
+
+    def columns(self, fields: List[PriceField]) -> np.ndarray:
+        if self.rows is None:
+            return self.values[:, fields]
+        return self.values[np.ix_(self.rows, fields)]
+
+    def get(self, item_id: int, field: PriceField) -> float:
+        return float(self.values[self._rows[self.index[item_id]], field])
+
+    def _present(self, fields: List[PriceField]) -> np.ndarray:
+        return ~np.isnan(self.columns(fields)).all(axis=1)
+
+    @staticmethod
+    def _to_int(val: float) -> Optional[int]:
+        return None if np.isnan(val) else int(val)
+
+    @cached_property
+    def latest_map(self) -> Dict[int, LatestPrice]:
+        fields: List[PriceField] = [
+            PriceField.LATEST_LOW,
+            PriceField.LATEST_HIGH,
+            PriceField.LATEST_LOW_TIME,
+            PriceField.LATEST_HIGH_TIME,
+        ]
+        present: np.ndarray = self._present(fields)
+        return {
+            item_id: LatestPrice(
+                low_price=self._to_int(low),
+                high_price=self._to_int(high),
+                low_time=self._to_int(low_time),
+                high_time=self._to_int(high_time),
+            )
+            for item_id, (low, high, low_time, high_time) in zip(
+                self.item_ids[present].tolist(),
+                self.columns(fields)[present].tolist(),
+            )
+        }
+
+    def _avg_map(self, window: PriceWindow, fields: List[PriceField]) -> Dict[int, AvgPrice]:
+        present: np.ndarray = self._present(fields)
+        return {
+            item_id: AvgPrice(
+                low_price=self._to_int(low),
+                high_price=self._to_int(high),
+                low_volume=self._to_int(low_volume),
+                high_volume=self._to_int(high_volume),
+                price_window=window,
+            )
+            for item_id, (low, high, low_volume, high_volume) in zip(
+                self.item_ids[present].tolist(),
+                self.columns(fields)[present].tolist(),
+            )
+        }
+
+    @cached_property
+    def avg_5m_map(self) -> Dict[int, AvgPrice]:
+        return self._avg_map(
+            window=PriceWindow.AVG_5M,
+            fields=[
+                PriceField.AVG_5M_LOW,
+                PriceField.AVG_5M_HIGH,
+                PriceField.AVG_5M_LOW_VOLUME,
+                PriceField.AVG_5M_HIGH_VOLUME,
+            ],
+        )
+
+    @cached_property
+    def avg_1h_map(self) -> Dict[int, AvgPrice]:
+        return self._avg_map(
+            window=PriceWindow.AVG_1H,
+            fields=[
+                PriceField.AVG_1H_LOW,
+                PriceField.AVG_1H_HIGH,
+                PriceField.AVG_1H_LOW_VOLUME,
+                PriceField.AVG_1H_HIGH_VOLUME,
+            ],
         )
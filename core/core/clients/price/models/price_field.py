@@ -0,0 +1,17 @@
+from enum import IntEnum
+
+
+class PriceField(IntEnum):
+
+    LATEST_LOW = 0
+    LATEST_HIGH = 1
+    LATEST_LOW_TIME = 2
+    LATEST_HIGH_TIME = 3
+    AVG_5M_LOW = 4
+    AVG_5M_HIGH = 5
+    AVG_5M_LOW_VOLUME = 6
+    AVG_5M_HIGH_VOLUME = 7
+    AVG_1H_LOW = 8
+    AVG_1H_HIGH = 9
+    AVG_1H_LOW_VOLUME = 10
+    AVG_1H_HIGH_VOLUME = 11
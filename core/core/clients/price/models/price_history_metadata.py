@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class PriceHistoryMetadata:
+    bucket_secs: int
+    max_buckets: int
+    max_items: int
+    fields: List[str]
+    item_ids: List[int] = field(default_factory=list)
+    first_bucket: Optional[int] = None
+    last_bucket: Optional[int] = None
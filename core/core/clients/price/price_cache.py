@@ -0,0 +1,117 @@
+import math
+import time
+from dataclasses import replace
+from threading import Thread
+from typing import Callable, Dict, Optional
+
+from redis import Redis
+from redis.client import Pipeline
+
+from core.clients.price.models.cache_policy import CachePolicy
+from core.clients.price.models.cached_response import CachedResponse
+from core.clients.redis.redis_client import RedisClient
+from core.config.redis_pool_config import RedisPoolConfig
+from core.instrumentation import instrument_client
+from core.logger import logger
+
+
+# returns None when the server answers 304 Not Modified for the given etag
+Fetcher = Callable[[str, Optional[str]], Optional[CachedResponse]]
+
+
+@instrument_client("price_cache")
+class PriceCache:
+
+    POLICIES: Dict[str, CachePolicy] = {
+        "/mapping": CachePolicy(ttl=24 * 60 * 60, aligned=False, stale_ttl=24 * 60 * 60),
+        "/latest": CachePolicy(ttl=60, aligned=False, stale_ttl=60),
+        "/5m": CachePolicy(ttl=5 * 60, aligned=True, stale_ttl=60),
+        "/1h": CachePolicy(ttl=60 * 60, aligned=True, stale_ttl=5 * 60),
+    }
+    DEFAULT_POLICY: CachePolicy = CachePolicy(ttl=60, aligned=False, stale_ttl=0)
+
+    PUBLISH_DELAY_SECS: int = 30
+    REFRESH_LOCK_SECS: int = 30
+
+    def __init__(self, host: str, port: int, pool_config: Optional[RedisPoolConfig] = None) -> None:
+        self.client: Redis = RedisClient.create_client(host=host, port=port, db="cache", pool_config=pool_config)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _get_expiry(self, policy: CachePolicy, now: float) -> float:
+        if not policy.aligned:
+            return now + policy.ttl
+        # a fetch in the publish delay after a boundary still gets the previous bucket, so it must expire at
+        # this boundary's publish time rather than the next one
+        delay: int = self.PUBLISH_DELAY_SECS
+        return math.floor((now - delay) / policy.ttl + 1) * policy.ttl + delay
+
+    def _load(self, endpoint: str) -> Optional[CachedResponse]:
+        data: Dict[bytes, bytes] = self.client.hgetall(RedisClient._get_name(prefix="price_cache", name=endpoint))
+        if not data:
+            return None
+        return CachedResponse(
+            body=data[b"body"],
+            etag=data[b"etag"].decode() or None,
+            expires_at=float(data[b"expires_at"]),
+            stale_at=float(data[b"stale_at"]),
+        )
+
+    def _store(self, endpoint: str, response: CachedResponse) -> None:
+        name: str = RedisClient._get_name(prefix="price_cache", name=endpoint)
+        pipe: Pipeline = self.client.pipeline(transaction=True)
+        pipe.hset(
+            name=name,
+            mapping={
+                "body": response.body,
+                "etag": response.etag or "",
+                "expires_at": response.expires_at,
+                "stale_at": response.stale_at,
+            },
+        )
+        pipe.expireat(name=name, when=math.ceil(response.stale_at))
+        pipe.execute()
+
+    def _acquire_refresh_lock(self, endpoint: str) -> bool:
+        name: str = RedisClient._get_name(prefix="price_cache_lock", name=endpoint)
+        return bool(self.client.set(name=name, value=1, nx=True, ex=self.REFRESH_LOCK_SECS))
+
+    def _release_refresh_lock(self, endpoint: str) -> None:
+        self.client.delete(RedisClient._get_name(prefix="price_cache_lock", name=endpoint))
+
+    def _revalidate(self, endpoint: str, cached: Optional[CachedResponse], fetch: Fetcher) -> CachedResponse:
+        policy: CachePolicy = self.POLICIES.get(endpoint, self.DEFAULT_POLICY)
+        now: float = time.time()
+        expires_at: float = self._get_expiry(policy=policy, now=now)
+
+        fetched: Optional[CachedResponse] = fetch(endpoint, cached.etag if cached is not None else None)
+        if fetched is None and cached is not None:
+            logger.debug(f"Price data for {endpoint} not modified since last fetch")
+            fetched = cached
+
+        response: CachedResponse = replace(fetched, expires_at=expires_at, stale_at=expires_at + policy.stale_ttl)
+        self._store(endpoint=endpoint, response=response)
+        return response
+
+    def _revalidate_in_background(self, endpoint: str, cached: CachedResponse, fetch: Fetcher) -> None:
+        try:
+            self._revalidate(endpoint=endpoint, cached=cached, fetch=fetch)
+        except Exception as e:
+            logger.warn(f"Background refresh of cached price data for {endpoint} failed: {str(e)}")
+        finally:
+            self._release_refresh_lock(endpoint)
+
+    def get(self, endpoint: str, fetch: Fetcher) -> bytes:
+        cached: Optional[CachedResponse] = self._load(endpoint)
+        now: float = time.time()
+
+        if cached is not None and now < cached.expires_at:
+            return cached.body
+
+        if cached is not None and now < cached.stale_at:
+            if self._acquire_refresh_lock(endpoint):
+                Thread(target=self._revalidate_in_background, args=(endpoint, cached, fetch), daemon=True).start()
+            return cached.body
+
+        return self._revalidate(endpoint=endpoint, cached=cached, fetch=fetch).body
@@ -1,16 +1,34 @@
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from functools import cached_property
-from typing import Any, Dict, FrozenSet, List
-
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
 from requests import Response, Session
 
 from core.clients.base_client import BaseClient
 from core.clients.price.exceptions import PriceApiError, UnsupportedPriceWindowError
+from core.clients.price.models.cached_response import CachedResponse
 from core.clients.price.models.item_metadata import ItemMetadata
 from core.clients.price.models.price import AvgPrice, LatestPrice
 from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
 from core.clients.price.models.price_window import PriceWindow
+from core.clients.price.price_cache import PriceCache
+from core.instrumentation import instrument_client
+from core.logger import logger
 
 
+@instrument_client("price")
 class PriceClient(BaseClient):
 
     OSRS_WIKI_URL: str = "https://prices.runescape.wiki/api/v1/osrs"
@@ -20,35 +38,62 @@ class PriceClient(BaseClient):
 
     MAX_INT: int = 2**31 - 1
 
-    def __init__(self) -> None:
+    SNAPSHOT_FETCH_WORKERS: int = 3
+    LATEST_KEYS: Tuple[str, ...] = ("low", "high", "lowTime", "highTime")
+    AVG_KEYS: Tuple[str, ...] = ("avgLowPrice", "avgHighPrice", "lowPriceVolume", "highPriceVolume")
+
+    def __init__(self, cache: Optional[PriceCache] = None, url: Optional[str] = None) -> None:
         self.session: Session = Session()
-        self.url: str = self.OSRS_WIKI_URL
+        self.url: str = url or self.OSRS_WIKI_URL
+        self.cache: Optional[PriceCache] = cache
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.SNAPSHOT_FETCH_WORKERS,
+            thread_name_prefix="price-fetch",
+        )
         super().__init__()
 
-    @cached_property
-    def item_map(self) -> Dict[int, ItemMetadata]:
-        data: List[Dict[str, Any]] = self.get("/mapping")
+    @classmethod
+    def parse_item_map(cls, data: List[Dict[str, Any]]) -> Dict[int, ItemMetadata]:
         return {
             d["id"]: ItemMetadata(
                 id=d["id"],
                 name=d["name"],
-                limit=d.get("limit", self.MAX_INT),
+                limit=d.get("limit", cls.MAX_INT),
                 members=d["members"],
             )
             for d in data
         }
 
+    @cached_property
+    def item_map(self) -> Dict[int, ItemMetadata]:
+        data: List[Dict[str, Any]] = self.get("/mapping")
+        return self.parse_item_map(data)
+
     def establish_connection(self) -> None:
         if not self.item_map:
             raise PriceApiError("OSRS prices API is not returning any item metadata")
         if not self.get_latest_prices():
             raise PriceApiError("OSRS prices API is not returning any price data")
 
-    def get(self, endpoint: str) -> Dict[str, Any]:
-        resp: Response = self.session.get(url=self.url + endpoint, headers=self.HEADERS)
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _fetch(self, endpoint: str, etag: Optional[str] = None) -> Optional[CachedResponse]:
+        headers: Dict[str, str] = self.HEADERS if etag is None else {**self.HEADERS, "If-None-Match": etag}
+        resp: Response = self.session.get(url=self.url + endpoint, headers=headers)
+        if resp.status_code == 304:
+            return None
         if resp.status_code != 200:
             raise PriceApiError(resp.text)
-        return resp.json()
+        return CachedResponse(body=resp.content, etag=resp.headers.get("ETag"))
+
+    def get(self, endpoint: str) -> Dict[str, Any]:
+        if self.cache is None:
+            return json.loads(self._fetch(endpoint).body)
+        return json.loads(self.cache.get(endpoint=endpoint, fetch=self._fetch))
 
     def get_latest_prices(self) -> Dict[int, LatestPrice]:
         resp_data: Dict[str, Any] = self.get("/latest")
@@ -64,15 +109,15 @@ class PriceClient(BaseClient):
             for item_id, price_data in data.items()
         }
 
-    def get_avg_prices(self, window: PriceWindow) -> Dict[int, AvgPrice]:
+    def _get_avg_endpoint(self, window: PriceWindow) -> str:
         if window == PriceWindow.AVG_5M:
-            endpoint: str = "/5m"
-        elif window == PriceWindow.AVG_1H:
-            endpoint: str = "/1h"
-        else:
-            raise UnsupportedPriceWindowError(actual=window, supported=self.SUPPORTED_PRICE_WINDOWS)
+            return "/5m"
+        if window == PriceWindow.AVG_1H:
+            return "/1h"
+        raise UnsupportedPriceWindowError(actual=window, supported=self.SUPPORTED_PRICE_WINDOWS)
 
-        resp_data: Dict[str, Any] = self.get(endpoint)
+    def get_avg_prices(self, window: PriceWindow) -> Dict[int, AvgPrice]:
+        resp_data: Dict[str, Any] = self.get(self._get_avg_endpoint(window))
         data: Dict[int, Dict[str, int]] = resp_data["data"]
 
         return {
@@ -86,9 +131,59 @@ class PriceClient(BaseClient):
             for item_id, price_data in data.items()
         }
 
-    def get_price_data_snapshot(self) -> PriceDataSnapshot:
-        latest_map: Dict[int, LatestPrice] = self.get_latest_prices()
-        avg_5m_map: Dict[int, AvgPrice] = self.get_avg_prices(window=PriceWindow.AVG_5M)
-        avg_1h_map: Dict[int, AvgPrice] = self.get_avg_prices(window=PriceWindow.AVG_1H)
+    def _get_data(self, endpoint: str) -> Dict[str, Dict[str, Any]]:
+        return self.get(endpoint)["data"]
+
+    @staticmethod
+    def _fill_columns(
+        values: np.ndarray,
+        index: Dict[int, int],
+        data: Dict[str, Dict[str, Any]],
+        keys: Tuple[str, ...],
+        first_field: PriceField,
+    ) -> None:
+        if not data:
+            return
+        rows: List[int] = [index[int(item_id)] for item_id in data]
+        block: np.ndarray = np.array([[d.get(k) for k in keys] for d in data.values()], dtype=np.float64)
+        values[rows, first_field : first_field + len(keys)] = block
+
+    def _parse_price_data_snapshot(
+        self,
+        latest_data: Dict[str, Dict[str, Any]],
+        avg_5m_data: Dict[str, Dict[str, Any]],
+        avg_1h_data: Dict[str, Dict[str, Any]],
+    ) -> PriceDataSnapshot:
+        item_ids: np.ndarray = np.array(
+            sorted({int(item_id) for data in (latest_data, avg_5m_data, avg_1h_data) for item_id in data}),
+            dtype=np.int64,
+        )
+        index: Dict[int, int] = {item_id: row for row, item_id in enumerate(item_ids.tolist())}
+        values: np.ndarray = np.full((len(item_ids), len(PriceField)), np.nan, dtype=np.float64)
+
+        self._fill_columns(values, index, latest_data, self.LATEST_KEYS, PriceField.LATEST_LOW)
+        self._fill_columns(values, index, avg_5m_data, self.AVG_KEYS, PriceField.AVG_5M_LOW)
+        self._fill_columns(values, index, avg_1h_data, self.AVG_KEYS, PriceField.AVG_1H_LOW)
+
+        return PriceDataSnapshot.from_arrays(item_ids=item_ids, values=values)
 
-        return PriceDataSnapshot(latest_map=latest_map, avg_5m_map=avg_5m_map, avg_1h_map=avg_1h_map)
+    def get_price_data_snapshot(self) -> PriceDataSnapshot:
+        start_time: float = time.perf_counter()
+
+        # each worker downloads and decodes its own endpoint, so the three round trips overlap.
+        # every task runs in its own copy of the caller's context so its spans join the caller's trace
+        latest_future: Future = self.executor.submit(copy_context().run, self._get_data, "/latest")
+        avg_5m_future: Future = self.executor.submit(
+            copy_context().run, self._get_data, self._get_avg_endpoint(PriceWindow.AVG_5M)
+        )
+        avg_1h_future: Future = self.executor.submit(
+            copy_context().run, self._get_data, self._get_avg_endpoint(PriceWindow.AVG_1H)
+        )
+
+        snapshot: PriceDataSnapshot = self._parse_price_data_snapshot(
+            latest_data=latest_future.result(),
+            avg_5m_data=avg_5m_future.result(),
+            avg_1h_data=avg_1h_future.result(),
+        )
+        logger.info(f"Fetched price data snapshot in {time.perf_counter() - start_time:.4f} seconds")
+        return snapshot
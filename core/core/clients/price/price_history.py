@@ -0,0 +1,191 @@
+import json
+import os
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.clients.price.exceptions import PriceFieldNotArchivedError
+from core.clients.price.models.price_data_snapshot import PriceDataSnapshot
+from core.clients.price.models.price_field import PriceField
+from core.clients.price.models.price_history_metadata import PriceHistoryMetadata
+from core.logger import logger
+
+
+class PriceHistory:
+
+    METADATA_FILE: str = "metadata.json"
+    DTYPE: np.dtype = np.dtype(np.float64)
+
+    DEFAULT_BUCKET_SECS: int = 5 * 60
+    DEFAULT_MAX_ITEMS: int = 5000
+    DEFAULT_FIELDS: Tuple[PriceField, ...] = (
+        PriceField.LATEST_LOW,
+        PriceField.LATEST_HIGH,
+        PriceField.AVG_5M_LOW,
+        PriceField.AVG_5M_HIGH,
+        PriceField.AVG_5M_LOW_VOLUME,
+        PriceField.AVG_5M_HIGH_VOLUME,
+    )
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_buckets: int,
+        bucket_secs: int = DEFAULT_BUCKET_SECS,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        fields: Tuple[PriceField, ...] = DEFAULT_FIELDS,
+    ) -> None:
+        self.root_dir: str = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+        # an existing archive keeps the layout it was created with, since its files are sized by it
+        self.metadata: PriceHistoryMetadata = self._load_metadata() or PriceHistoryMetadata(
+            bucket_secs=bucket_secs,
+            max_buckets=max_buckets,
+            max_items=max_items,
+            fields=[f.name for f in fields],
+        )
+        self.index: Dict[int, int] = {item_id: col for col, item_id in enumerate(self.metadata.item_ids)}
+        # one time-major array per field: a row holds every item for one bucket, so appends write one contiguous row
+        self.arrays: Dict[PriceField, np.memmap] = {
+            PriceField[name]: self._open_array(name) for name in self.metadata.fields
+        }
+        self._save_metadata()
+
+    @property
+    def _metadata_path(self) -> str:
+        return os.path.join(self.root_dir, self.METADATA_FILE)
+
+    def _load_metadata(self) -> Optional[PriceHistoryMetadata]:
+        if not os.path.exists(self._metadata_path):
+            return None
+        with open(self._metadata_path, "r") as f:
+            return PriceHistoryMetadata(**json.load(f))
+
+    def _save_metadata(self) -> None:
+        tmp_path: str = self._metadata_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(self.metadata), f)
+        os.replace(tmp_path, self._metadata_path)
+
+    def _open_array(self, field_name: str) -> np.memmap:
+        path: str = os.path.join(self.root_dir, f"{field_name.lower()}.bin")
+        shape: Tuple[int, int] = (self.metadata.max_buckets, self.metadata.max_items)
+        if os.path.exists(path):
+            return np.memmap(path, dtype=self.DTYPE, mode="r+", shape=shape)
+        array: np.memmap = np.memmap(path, dtype=self.DTYPE, mode="w+", shape=shape)
+        array[:] = np.nan
+        return array
+
+    def close(self) -> None:
+        self.flush()
+        self.arrays.clear()
+
+    def flush(self) -> None:
+        for array in self.arrays.values():
+            array.flush()
+        self._save_metadata()
+
+    def _get_bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.metadata.bucket_secs)
+
+    def _get_columns(self, item_ids: Iterable[int], allocate: bool) -> np.ndarray:
+        cols: List[int] = []
+        for item_id in item_ids:
+            col: Optional[int] = self.index.get(item_id)
+            if col is None and allocate and len(self.index) < self.metadata.max_items:
+                col = len(self.index)
+                self.index[item_id] = col
+                self.metadata.item_ids.append(item_id)
+            cols.append(-1 if col is None else col)
+        return np.array(cols, dtype=np.intp)
+
+    def _clear_buckets(self, start: int, end: int) -> None:
+        rows: np.ndarray = np.arange(max(start, end - self.metadata.max_buckets), end) % self.metadata.max_buckets
+        for array in self.arrays.values():
+            array[rows] = np.nan
+
+    def append(self, snapshot: PriceDataSnapshot, timestamp: float) -> None:
+        bucket: int = self._get_bucket(timestamp)
+        last_bucket: Optional[int] = self.metadata.last_bucket
+        if last_bucket is not None and bucket < last_bucket:
+            logger.warn(f"Skipping price history append for bucket {bucket}. Archive is already at {last_bucket}")
+            return
+
+        cols: np.ndarray = self._get_columns(snapshot.item_ids.tolist(), allocate=True)
+        known: np.ndarray = cols >= 0
+        if not known.all():
+            logger.warn(f"Price history is full. Dropping {int((~known).sum())} items without a column")
+
+        # rows are reused as a ring buffer, so wipe the new bucket and any skipped ones before writing
+        if last_bucket is None:
+            self.metadata.first_bucket = bucket
+            self._clear_buckets(start=bucket, end=bucket + 1)
+        elif bucket > last_bucket:
+            self._clear_buckets(start=last_bucket + 1, end=bucket + 1)
+
+        row: int = bucket % self.metadata.max_buckets
+        for field, array in self.arrays.items():
+            array[row, cols[known]] = snapshot.column(field)[known]
+
+        self.metadata.last_bucket = bucket
+        self.metadata.first_bucket = max(self.metadata.first_bucket, bucket - self.metadata.max_buckets + 1)
+        self.flush()
+
+    def _get_window_buckets(self, num_buckets: int, end_time: Optional[float]) -> np.ndarray:
+        end_bucket: int = self.metadata.last_bucket
+        if end_time is not None:
+            end_bucket = min(end_bucket, self._get_bucket(end_time))
+        return np.arange(end_bucket - num_buckets + 1, end_bucket + 1)
+
+    def get_window_times(self, num_buckets: int, end_time: Optional[float] = None) -> np.ndarray:
+        if self.metadata.last_bucket is None:
+            return np.empty(0, dtype=np.int64)
+        return self._get_window_buckets(num_buckets=num_buckets, end_time=end_time) * self.metadata.bucket_secs
+
+    def get_bucket_times(self) -> np.ndarray:
+        if self.metadata.last_bucket is None:
+            return np.empty(0, dtype=np.int64)
+        buckets: np.ndarray = np.arange(self.metadata.first_bucket, self.metadata.last_bucket + 1)
+        return buckets * self.metadata.bucket_secs
+
+    def get_snapshot(self, timestamp: float) -> PriceDataSnapshot:
+        item_ids: np.ndarray = np.array(self.metadata.item_ids, dtype=np.int64)
+        values: np.ndarray = np.full((len(item_ids), len(PriceField)), np.nan, dtype=self.DTYPE)
+
+        bucket: int = self._get_bucket(timestamp)
+        last_bucket: Optional[int] = self.metadata.last_bucket
+        if last_bucket is not None and self.metadata.first_bucket <= bucket <= last_bucket:
+            row: int = bucket % self.metadata.max_buckets
+            for field, array in self.arrays.items():
+                values[:, field] = array[row, : len(item_ids)]
+
+        # fields that are not archived stay NaN, and items the bucket has no prices for are left out
+        present: np.ndarray = ~np.isnan(values).all(axis=1)
+        order: np.ndarray = np.argsort(item_ids[present], kind="stable")
+        return PriceDataSnapshot.from_arrays(item_ids=item_ids[present][order], values=values[present][order])
+
+    def get_window(
+        self,
+        field: PriceField,
+        item_ids: List[int],
+        num_buckets: int,
+        end_time: Optional[float] = None,
+    ) -> np.ndarray:
+        if field not in self.arrays:
+            raise PriceFieldNotArchivedError(field=field, archived=self.metadata.fields)
+
+        window: np.ndarray = np.full((num_buckets, len(item_ids)), np.nan, dtype=self.DTYPE)
+        if self.metadata.last_bucket is None:
+            return window
+
+        buckets: np.ndarray = self._get_window_buckets(num_buckets=num_buckets, end_time=end_time)
+        valid: np.ndarray = buckets >= self.metadata.first_bucket
+        cols: np.ndarray = self._get_columns(item_ids, allocate=False)
+        known: np.ndarray = cols >= 0
+
+        # fancy indexing on the memmap only pages in the requested rows and columns
+        rows: np.ndarray = buckets[valid] % self.metadata.max_buckets
+        window[np.ix_(valid, known)] = self.arrays[field][np.ix_(rows, cols[known])]
+        return window
@@ -0,0 +1,54 @@
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from redis import BlockingConnectionPool, ConnectionPool
+
+from core.config.redis_pool_config import RedisPoolConfig
+from core.logger import logger
+
+
+class RedisConnectionPools:
+
+    # shared by every client in the process, so constructing a client never opens new sockets on its own
+    _lock: Lock = Lock()
+    _pools: Dict[Tuple[str, int, int], ConnectionPool] = {}
+
+    @classmethod
+    def get(
+        cls,
+        host: str,
+        port: int,
+        db: int,
+        config: Optional[RedisPoolConfig] = None,
+    ) -> ConnectionPool:
+        key: Tuple[str, int, int] = (host, port, db)
+        with cls._lock:
+            pool: Optional[ConnectionPool] = cls._pools.get(key)
+            if pool is None:
+                config = config or RedisPoolConfig()
+                logger.info(f"Creating redis connection pool for {host}:{port}/{db} with config {config}")
+                pool = BlockingConnectionPool(
+                    host=host,
+                    port=port,
+                    db=db,
+                    max_connections=config.max_connections,
+                    timeout=config.pool_timeout,
+                    health_check_interval=config.health_check_interval,
+                    socket_timeout=config.socket_timeout,
+                    socket_connect_timeout=config.socket_connect_timeout,
+                )
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def install(cls, host: str, port: int, db: int, pool: ConnectionPool) -> None:
+        # lets benchmarks and simulations point every client at a stand-in server without touching client code
+        with cls._lock:
+            cls._pools[(host, port, db)] = pool
+
+    @classmethod
+    def disconnect_all(cls) -> None:
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.disconnect()
+            cls._pools.clear()
@@ -1,3 +1,16 @@
+from typing import List
+
+
 class RedisKeyError(Exception):
     def __init__(self, key: str) -> None:
         super().__init__(f"Key {key} not found in Redis")
+
+
+class UnsupportedPnlResolutionError(Exception):
+    def __init__(self, actual: str, supported: List[str]) -> None:
+        super().__init__(f"Unsupported pnl resolution {actual}. Supported resolutions: {supported}")
+
+
+class RedisTransactionError(Exception):
+    def __init__(self, name: str, attempts: int) -> None:
+        super().__init__(f"Transaction on {name} aborted after {attempts} conflicting attempts")
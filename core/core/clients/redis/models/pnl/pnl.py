@@ -1,7 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict
 
-from core.clients.redis.models.pnl.pnl_snapshot import PnlSnapshot
 from core.redis_object import RedisObject
 
 
@@ -9,5 +8,5 @@ from core.redis_object import RedisObject
 class Pnl(RedisObject):
     session_id: str
     total_pnl: int
-    pnl_snapshots: List[PnlSnapshot]
+    strat_pnl: Dict[str, int]
     update_time: float
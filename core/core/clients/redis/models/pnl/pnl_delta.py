@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
+from core.redis_object import RedisObject
+
+
+@dataclass
+class PnlDelta(RedisObject):
+    time: float
+    keyframe: bool
+    strat_pnl: Dict[str, int]  # only strats whose pnl changed since the previous point, unless a keyframe
+    held_prices: Dict[int, int]  # only prices that changed since the previous point, unless a keyframe
+    removed_items: List[int]
+
+    @classmethod
+    def encode(cls: Type["PnlDelta"], prev: Optional[PnlPoint], cur: PnlPoint) -> "PnlDelta":
+        if prev is None:
+            return cls(
+                time=cur.time,
+                keyframe=True,
+                strat_pnl=cur.strat_pnl,
+                held_prices=cur.held_prices,
+                removed_items=[],
+            )
+        return cls(
+            time=cur.time,
+            keyframe=False,
+            strat_pnl={s: pnl for s, pnl in cur.strat_pnl.items() if prev.strat_pnl.get(s) != pnl},
+            held_prices={i: p for i, p in cur.held_prices.items() if prev.held_prices.get(i) != p},
+            removed_items=[i for i in prev.held_prices if i not in cur.held_prices],
+        )
+
+    def apply(self, prev: Optional[PnlPoint]) -> PnlPoint:
+        strat_pnl: Dict[str, int] = {} if self.keyframe else dict(prev.strat_pnl)
+        strat_pnl.update(self.strat_pnl)
+
+        held_prices: Dict[int, int] = {} if self.keyframe else dict(prev.held_prices)
+        held_prices.update(self.held_prices)
+        for item_id in self.removed_items:
+            held_prices.pop(item_id, None)
+
+        return PnlPoint(
+            time=self.time,
+            total_pnl=sum(strat_pnl.values()),
+            strat_pnl=strat_pnl,
+            held_prices=held_prices,
+        )
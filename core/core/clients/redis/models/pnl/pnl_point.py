@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Dict
+
+from core.redis_object import RedisObject
+
+
+@dataclass
+class PnlPoint(RedisObject):
+    time: float
+    total_pnl: int
+    strat_pnl: Dict[str, int]
+    held_prices: Dict[int, int]  # latest low price of every item a strat holds, used to mark the position
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PnlTier:
+    name: str
+    bucket_secs: int  # keep at most one point per bucket, 0 keeps every point
+    retention_secs: int
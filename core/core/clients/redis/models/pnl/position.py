@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Position:
+    item_id: int
+    quantity: int
+    cost_basis: int  # net gp spent on the item: buys minus sells
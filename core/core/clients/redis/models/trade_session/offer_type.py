@@ -9,6 +9,10 @@ class OfferType(Enum):
     BUY = "BUY"
     SELL = "SELL"
 
+    @property
+    def is_buy(self) -> bool:
+        return self in (OfferType.BUY, OfferType.CANCEL_BUY)
+
     @classmethod
     def from_str(cls, order_type: str) -> "OfferType":
         try:
@@ -1,33 +1,77 @@
-from typing import Dict, List, Optional
+import math
+import time
+from dataclasses import replace
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from redis import Redis
+from redis.client import Pipeline
+from redis.exceptions import WatchError
 
 from core.clients.base_client import BaseClient
 from core.clients.gds.models.exchange.exchange import Exchange
-from core.clients.redis.exceptions import RedisKeyError
+from core.clients.redis.connection_pools import RedisConnectionPools
+from core.clients.redis.exceptions import RedisKeyError, RedisTransactionError, UnsupportedPnlResolutionError
 from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
 from core.clients.redis.models.pnl.pnl import Pnl
+from core.clients.redis.models.pnl.pnl_delta import PnlDelta
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
+from core.clients.redis.models.pnl.pnl_tier import PnlTier
+from core.clients.redis.models.pnl.position import Position
 from core.clients.redis.models.trade_session.order import Order
 from core.clients.redis.models.trade_session.trade import Trade
 from core.clients.redis.models.trade_session.trade_session import TradeSession
+from core.config.redis_pool_config import RedisPoolConfig
+from core.instrumentation import instrument_client
+from core.logger import logger
+from core.redis_object import RedisObject
 
 
+@instrument_client("redis")
 class RedisClient(BaseClient):
 
     REDIS_DB_MAP: Dict[str, int] = {
         "session": 0,
         "player": 1,
+        "cache": 2,
     }
 
-    def __init__(self, host: str, port: int) -> None:
-        self.session_client: Redis = Redis(host=host, port=port, db=self.REDIS_DB_MAP["session"])
-        self.player_client: Redis = Redis(host=host, port=port, db=self.REDIS_DB_MAP["player"])
+    MAX_TRANSACTION_ATTEMPTS: int = 5
+
+    # ordered finest first. points are delta encoded against the previous point in their tier, with a full
+    # keyframe every PNL_KEYFRAME_INTERVAL points so a range read never has to decode more than that many extra
+    PNL_TIERS: Tuple[PnlTier, ...] = (
+        PnlTier(name="raw", bucket_secs=0, retention_secs=60 * 60),
+        PnlTier(name="1m", bucket_secs=60, retention_secs=24 * 60 * 60),
+        PnlTier(name="1h", bucket_secs=60 * 60, retention_secs=30 * 24 * 60 * 60),
+    )
+    PNL_KEYFRAME_INTERVAL: int = 32
+
+    def __init__(self, host: str, port: int, pool_config: Optional[RedisPoolConfig] = None) -> None:
+        self.session_client: Redis = self.create_client(host=host, port=port, db="session", pool_config=pool_config)
+        self.player_client: Redis = self.create_client(host=host, port=port, db="player", pool_config=pool_config)
         super().__init__()
 
+    @classmethod
+    def create_client(cls, host: str, port: int, db: str, pool_config: Optional[RedisPoolConfig] = None) -> Redis:
+        return Redis(
+            connection_pool=RedisConnectionPools.get(host=host, port=port, db=cls.REDIS_DB_MAP[db], config=pool_config)
+        )
+
     def establish_connection(self) -> None:
         self.session_client.ping()
         self.player_client.ping()
 
+    def close(self) -> None:
+        self.session_client.close()
+        self.player_client.close()
+
     @staticmethod
     def _get_raw(client: Redis, name: str) -> bytes:
         raw: Optional[bytes] = client.get(name=name)
@@ -51,6 +95,18 @@ class RedisClient(BaseClient):
         raw: bytes = self._hget_raw(client=self.player_client, name=name, key=str(item_id))
         return BuyLimit.deserialize(raw)
 
+    def get_buy_limits(self, player_name: str, item_ids: List[int]) -> Dict[int, BuyLimit]:
+        if not item_ids:
+            return {}
+        name: str = self._get_name(prefix="buy_limit", name=player_name)
+        raw_limits: List[Optional[bytes]] = self.player_client.hmget(name, [str(item_id) for item_id in item_ids])
+        buy_limits: Dict[int, BuyLimit] = {}
+        for item_id, raw in zip(item_ids, raw_limits):
+            if raw is None:
+                raise RedisKeyError(key=str(item_id))
+            buy_limits[item_id] = BuyLimit.deserialize(raw)
+        return buy_limits
+
     def set_buy_limit(self, player_name: str, buy_limit: BuyLimit) -> None:
         name: str = self._get_name(prefix="buy_limit", name=player_name)
         self.player_client.hset(name=name, key=buy_limit.item_id, value=buy_limit.serialize())
@@ -76,56 +132,231 @@ class RedisClient(BaseClient):
         name: str = self._get_name(prefix="exchange", name=player_name)
         self.player_client.set(name=name, value=exchange.serialize())
 
-    def get_trade_session(self, session_id: str) -> TradeSession:
+    @staticmethod
+    def _get_strat_name(prefix: str, strat_name: str, session_id: str) -> str:
+        return RedisClient._get_name(prefix=f"{prefix}.{strat_name.lower().replace(' ', '')}", name=session_id)
+
+    def _raise_if_missing_session(self, session_id: str) -> None:
+        name: str = self._get_name(prefix="trade_session", name=session_id)
+        if not self.session_client.exists(name):
+            raise RedisKeyError(key=name)
+
+    def _get_strats(self, session_id: str) -> List[str]:
+        name: str = self._get_name(prefix="trade_session", name=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=False)
+        pipe.exists(name)
+        pipe.smembers(self._get_name(prefix="strats", name=session_id))
+        exists, strats = pipe.execute()
+        if not exists:
+            raise RedisKeyError(key=name)
+        return sorted(s.decode() for s in strats)
+
+    def _get_strat_lists(self, prefix: str, session_id: str, strats: List[str]) -> Dict[str, List[bytes]]:
+        pipe: Pipeline = self.session_client.pipeline(transaction=False)
+        for strat_name in strats:
+            pipe.lrange(self._get_strat_name(prefix=prefix, strat_name=strat_name, session_id=session_id), 0, -1)
+        return dict(zip(strats, pipe.execute()))
+
+    def _append_strat_lists(
+        self, pipe: Pipeline, prefix: str, session_id: str, vals: Dict[str, List[RedisObject]]
+    ) -> None:
+        for strat_name, strat_vals in vals.items():
+            if not strat_vals:
+                continue
+            pipe.sadd(self._get_name(prefix="strats", name=session_id), strat_name)
+            pipe.rpush(
+                self._get_strat_name(prefix=prefix, strat_name=strat_name, session_id=session_id),
+                *[v.serialize() for v in strat_vals],
+            )
+
+    def _incr_positions(self, pipe: Pipeline, session_id: str, trades: Dict[str, List[Trade]]) -> None:
+        for strat_name, strat_trades in trades.items():
+            name: str = self._get_strat_name(prefix="positions", strat_name=strat_name, session_id=session_id)
+            for t in strat_trades:
+                if not t.transacted:
+                    continue
+                quantity: int = t.transacted if t.metadata.type.is_buy else -t.transacted
+                pipe.hincrby(name, f"{t.metadata.item_id}.quantity", quantity)
+                pipe.hincrby(name, f"{t.metadata.item_id}.cost_basis", quantity * t.metadata.price)
+
+    def get_trade_session_header(self, session_id: str) -> TradeSession:
         name: str = self._get_name(prefix="trade_session", name=session_id)
         raw: bytes = self._get_raw(client=self.session_client, name=name)
         return TradeSession.deserialize(raw)
 
+    def trade_session_exists(self, session_id: str) -> bool:
+        return bool(self.session_client.exists(self._get_name(prefix="trade_session", name=session_id)))
+
+    def get_trade_session(self, session_id: str) -> TradeSession:
+        trade_session: TradeSession = self.get_trade_session_header(session_id=session_id)
+
+        strats: List[str] = self._get_strats(session_id=session_id)
+        trade_session.active_orders = self.get_active_orders(session_id=session_id)
+        trade_session.orders = {
+            s: [Order.deserialize(raw) for raw in raw_orders]
+            for s, raw_orders in self._get_strat_lists(prefix="orders", session_id=session_id, strats=strats).items()
+        }
+        trade_session.trades = {
+            s: [Trade.deserialize(raw) for raw in raw_trades]
+            for s, raw_trades in self._get_strat_lists(prefix="trades", session_id=session_id, strats=strats).items()
+        }
+        return trade_session
+
     def set_trade_session(self, trade_session: TradeSession) -> None:
-        name: str = self._get_name(prefix="trade_session", name=trade_session.session_id)
-        self.session_client.set(name=name, value=trade_session.serialize())
+        session_id: str = trade_session.session_id
+        strats_name: str = self._get_name(prefix="strats", name=session_id)
+        prev_strats: Set[bytes] = self.session_client.smembers(strats_name)
+
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        pipe.delete(strats_name, self._get_name(prefix="active_orders", name=session_id))
+        for strat_name in prev_strats:
+            pipe.delete(
+                self._get_strat_name(prefix="orders", strat_name=strat_name.decode(), session_id=session_id),
+                self._get_strat_name(prefix="trades", strat_name=strat_name.decode(), session_id=session_id),
+                self._get_strat_name(prefix="positions", strat_name=strat_name.decode(), session_id=session_id),
+            )
+        self._write_trade_session(pipe=pipe, trade_session=trade_session)
+        pipe.execute()
+
+    def _write_trade_session(self, pipe: Pipeline, trade_session: TradeSession) -> None:
+        session_id: str = trade_session.session_id
+        header: TradeSession = replace(trade_session, active_orders={}, orders={}, trades={})
+
+        pipe.set(name=self._get_name(prefix="trade_session", name=session_id), value=header.serialize())
+        self._append_strat_lists(pipe=pipe, prefix="orders", session_id=session_id, vals=trade_session.orders)
+        self._append_strat_lists(pipe=pipe, prefix="trades", session_id=session_id, vals=trade_session.trades)
+        self._incr_positions(pipe=pipe, session_id=session_id, trades=trade_session.trades)
+        if trade_session.active_orders:
+            pipe.hset(
+                name=self._get_name(prefix="active_orders", name=session_id),
+                mapping={slot: o.serialize() for slot, o in trade_session.active_orders.items()},
+            )
+
+    def init_trade_session(self, trade_session: TradeSession, pnl: Pnl) -> None:
+        session_id: str = trade_session.session_id
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        self._set_session_validity(pipe=pipe, session_id=session_id, valid=True)
+        pipe.set(name=self._get_name(prefix="pnl", name=session_id), value=pnl.serialize())
+        self._write_trade_session(pipe=pipe, trade_session=trade_session)
+        pipe.execute()
 
     def get_orders(self, session_id: str) -> Dict[str, List[Order]]:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        return trade_session.orders
+        strats: List[str] = self._get_strats(session_id=session_id)
+        raw_map: Dict[str, List[bytes]] = self._get_strat_lists(prefix="orders", session_id=session_id, strats=strats)
+        return {s: [Order.deserialize(raw) for raw in raw_orders] for s, raw_orders in raw_map.items()}
 
     def append_orders(self, session_id: str, orders: Dict[str, List[Order]]) -> None:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        for strat_name, strat_orders in orders.items():
-            if strat_name not in trade_session.orders:
-                trade_session.orders[strat_name] = []
-            trade_session.orders[strat_name].extend(strat_orders)
-        self.set_trade_session(trade_session=trade_session)
+        self._raise_if_missing_session(session_id=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        self._append_strat_lists(pipe=pipe, prefix="orders", session_id=session_id, vals=orders)
+        pipe.execute()
 
     def get_trades(self, session_id: str) -> Dict[str, List[Trade]]:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        return trade_session.trades
+        strats: List[str] = self._get_strats(session_id=session_id)
+        raw_map: Dict[str, List[bytes]] = self._get_strat_lists(prefix="trades", session_id=session_id, strats=strats)
+        return {s: [Trade.deserialize(raw) for raw in raw_trades] for s, raw_trades in raw_map.items()}
 
     def append_trades(self, session_id: str, trades: Dict[str, List[Trade]]) -> None:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        for strat_name, strat_trades in trades.items():
-            if strat_name not in trade_session.trades:
-                trade_session.trades[strat_name] = []
-            trade_session.trades[strat_name].extend(strat_trades)
-        self.set_trade_session(trade_session=trade_session)
+        self._raise_if_missing_session(session_id=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        self._append_strat_lists(pipe=pipe, prefix="trades", session_id=session_id, vals=trades)
+        self._incr_positions(pipe=pipe, session_id=session_id, trades=trades)
+        pipe.execute()
+
+    def get_positions(self, session_id: str) -> Dict[str, Dict[int, Position]]:
+        strats: List[str] = self._get_strats(session_id=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=False)
+        for strat_name in strats:
+            pipe.hgetall(self._get_strat_name(prefix="positions", strat_name=strat_name, session_id=session_id))
+
+        positions: Dict[str, Dict[int, Position]] = {}
+        for strat_name, raw_fields in zip(strats, pipe.execute()):
+            fields: Dict[str, int] = {k.decode(): int(v) for k, v in raw_fields.items()}
+            item_ids: Set[int] = {int(k.split(".")[0]) for k in fields}
+            positions[strat_name] = {
+                item_id: Position(
+                    item_id=item_id,
+                    quantity=fields.get(f"{item_id}.quantity", 0),
+                    cost_basis=fields.get(f"{item_id}.cost_basis", 0),
+                )
+                for item_id in item_ids
+            }
+        return positions
 
     def get_active_orders(self, session_id: str) -> Dict[int, Order]:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        return trade_session.active_orders
+        name: str = self._get_name(prefix="trade_session", name=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=False)
+        pipe.exists(name)
+        pipe.hgetall(self._get_name(prefix="active_orders", name=session_id))
+        exists, raw_orders = pipe.execute()
+        if not exists:
+            raise RedisKeyError(key=name)
+        return {int(slot): Order.deserialize(raw) for slot, raw in raw_orders.items()}
 
     def set_active_orders(self, session_id: str, active_orders: Dict[int, Order]) -> None:
-        trade_session: TradeSession = self.get_trade_session(session_id=session_id)
-        trade_session.active_orders = active_orders
-        self.set_trade_session(trade_session=trade_session)
+        self._raise_if_missing_session(session_id=session_id)
+        name: str = self._get_name(prefix="active_orders", name=session_id)
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        pipe.delete(name)
+        if active_orders:
+            pipe.hset(name=name, mapping={slot: o.serialize() for slot, o in active_orders.items()})
+        pipe.execute()
+
+    def update_active_orders(self, session_id: str, active_orders: Dict[int, Order]) -> None:
+        if not active_orders:
+            return
+        self._raise_if_missing_session(session_id=session_id)
+        name: str = self._get_name(prefix="active_orders", name=session_id)
+        self.session_client.hset(name=name, mapping={slot: o.serialize() for slot, o in active_orders.items()})
+
+    def book_trades(
+        self,
+        session_id: str,
+        match_trades: Callable[[Dict[int, Order]], Dict[str, List[Trade]]],
+    ) -> Dict[str, List[Trade]]:
+        session_name: str = self._get_name(prefix="trade_session", name=session_id)
+        active_orders_name: str = self._get_name(prefix="active_orders", name=session_id)
+
+        for attempt in range(1, self.MAX_TRANSACTION_ATTEMPTS + 1):
+            with self.session_client.pipeline(transaction=True) as pipe:
+                try:
+                    pipe.watch(active_orders_name)
+                    if not pipe.exists(session_name):
+                        raise RedisKeyError(key=session_name)
+                    raw_orders: Dict[bytes, bytes] = pipe.hgetall(active_orders_name)
+                    active_orders: Dict[int, Order] = {
+                        int(slot): Order.deserialize(raw) for slot, raw in raw_orders.items()
+                    }
+
+                    trades: Dict[str, List[Trade]] = match_trades(active_orders)
+                    booked_slots: List[int] = [t.metadata.ge_slot for t_list in trades.values() for t in t_list]
+
+                    pipe.multi()
+                    self._append_strat_lists(pipe=pipe, prefix="trades", session_id=session_id, vals=trades)
+                    self._incr_positions(pipe=pipe, session_id=session_id, trades=trades)
+                    if booked_slots:
+                        pipe.hdel(active_orders_name, *booked_slots)
+                    pipe.execute()
+                    return trades
+                except WatchError:
+                    logger.info(f"Active orders changed while booking trades. Retrying (attempt {attempt})")
+
+        raise RedisTransactionError(name=active_orders_name, attempts=self.MAX_TRANSACTION_ATTEMPTS)
 
     def get_session_validity(self, session_id: str) -> bool:
         name: str = self._get_name(prefix="valid", name=session_id)
         raw: bytes = self._get_raw(client=self.session_client, name=name)
         return bool(raw)
 
-    def set_session_validity(self, session_id: str, valid: bool) -> None:
+    def _set_session_validity(self, pipe: Pipeline, session_id: str, valid: bool) -> None:
         name: str = self._get_name(prefix="valid", name=session_id)
-        self.session_client.set(name=name, value=bytes(valid))
+        pipe.set(name=name, value=bytes(valid))
+        pipe.publish(channel=name, message=bytes(valid))
+
+    def set_session_validity(self, session_id: str, valid: bool) -> None:
+        pipe: Pipeline = self.session_client.pipeline(transaction=True)
+        self._set_session_validity(pipe=pipe, session_id=session_id, valid=valid)
+        pipe.execute()
 
     def get_pnl_snapshot(self, session_id: str) -> Pnl:
         name: str = self._get_name(prefix="pnl", name=session_id)
@@ -135,3 +366,132 @@ class RedisClient(BaseClient):
     def set_pnl_snapshot(self, session_id: str, pnl: Pnl) -> None:
         name: str = self._get_name(prefix="pnl", name=session_id)
         self.session_client.set(name=name, value=pnl.serialize())
+
+    def _get_pnl_tier(self, resolution: Optional[str], start_time: float) -> PnlTier:
+        if resolution is None:
+            for tier in self.PNL_TIERS:
+                if start_time >= time.time() - tier.retention_secs:
+                    return tier
+            return self.PNL_TIERS[-1]
+
+        for tier in self.PNL_TIERS:
+            if tier.name == resolution:
+                return tier
+        raise UnsupportedPnlResolutionError(actual=resolution, supported=[t.name for t in self.PNL_TIERS])
+
+    @staticmethod
+    def _is_same_bucket(tier: PnlTier, prev: PnlPoint, cur: PnlPoint) -> bool:
+        if not tier.bucket_secs:
+            return False
+        return math.floor(prev.time / tier.bucket_secs) == math.floor(cur.time / tier.bucket_secs)
+
+    def _append_pnl_tier(
+        self,
+        pipe: Pipeline,
+        session_id: str,
+        tier: PnlTier,
+        head: Dict[bytes, bytes],
+        trim_before: Optional[float],
+        point: PnlPoint,
+    ) -> None:
+        points_name: str = self._get_strat_name(prefix="pnl_points", strat_name=tier.name, session_id=session_id)
+        keyframes_name: str = self._get_strat_name(prefix="pnl_keyframes", strat_name=tier.name, session_id=session_id)
+        head_name: str = self._get_strat_name(prefix="pnl_head", strat_name=tier.name, session_id=session_id)
+
+        prev: Optional[PnlPoint] = PnlPoint.deserialize(head[b"point"]) if head else None
+        if prev is not None and self._is_same_bucket(tier=tier, prev=prev, cur=point):
+            return
+
+        since_keyframe: int = int(head[b"since_keyframe"]) + 1 if head else self.PNL_KEYFRAME_INTERVAL
+        keyframe: bool = since_keyframe >= self.PNL_KEYFRAME_INTERVAL
+        delta: PnlDelta = PnlDelta.encode(prev=None if keyframe else prev, cur=point)
+
+        pipe.zadd(points_name, {delta.serialize(): point.time})
+        if keyframe:
+            since_keyframe = 0
+            pipe.zadd(keyframes_name, {str(point.time): point.time})
+        pipe.hset(head_name, mapping={"point": point.serialize(), "since_keyframe": since_keyframe})
+
+        # only trim up to a keyframe, so every remaining delta can still be decoded
+        if trim_before is not None:
+            pipe.zremrangebyscore(points_name, "-inf", f"({trim_before}")
+            pipe.zremrangebyscore(keyframes_name, "-inf", f"({trim_before}")
+
+    def _get_pnl_trim_time(self, client: Redis, session_id: str, tier: PnlTier, point: PnlPoint) -> Optional[float]:
+        keyframes_name: str = self._get_strat_name(prefix="pnl_keyframes", strat_name=tier.name, session_id=session_id)
+        keyframes: List[Tuple[bytes, float]] = client.zrevrangebyscore(
+            keyframes_name,
+            point.time - tier.retention_secs,
+            "-inf",
+            start=0,
+            num=1,
+            withscores=True,
+        )
+        return keyframes[0][1] if keyframes else None
+
+    def append_pnl_point(self, session_id: str, point: PnlPoint) -> None:
+        head_names: List[str] = [
+            self._get_strat_name(prefix="pnl_head", strat_name=tier.name, session_id=session_id)
+            for tier in self.PNL_TIERS
+        ]
+
+        for attempt in range(1, self.MAX_TRANSACTION_ATTEMPTS + 1):
+            with self.session_client.pipeline(transaction=True) as pipe:
+                try:
+                    pipe.watch(*head_names)
+                    heads: List[Dict[bytes, bytes]] = [pipe.hgetall(name) for name in head_names]
+                    trim_times: List[Optional[float]] = [
+                        self._get_pnl_trim_time(client=pipe, session_id=session_id, tier=tier, point=point)
+                        for tier in self.PNL_TIERS
+                    ]
+
+                    pipe.multi()
+                    for tier, head, trim_before in zip(self.PNL_TIERS, heads, trim_times):
+                        self._append_pnl_tier(
+                            pipe=pipe,
+                            session_id=session_id,
+                            tier=tier,
+                            head=head,
+                            trim_before=trim_before,
+                            point=point,
+                        )
+                    pipe.execute()
+                    return
+                except WatchError:
+                    logger.info(f"Pnl history changed while appending point. Retrying (attempt {attempt})")
+
+        raise RedisTransactionError(name=head_names[0], attempts=self.MAX_TRANSACTION_ATTEMPTS)
+
+    def get_pnl_history(
+        self,
+        session_id: str,
+        start_time: float,
+        end_time: float,
+        resolution: Optional[str] = None,
+    ) -> List[PnlPoint]:
+        tier: PnlTier = self._get_pnl_tier(resolution=resolution, start_time=start_time)
+        points_name: str = self._get_strat_name(prefix="pnl_points", strat_name=tier.name, session_id=session_id)
+        keyframes_name: str = self._get_strat_name(prefix="pnl_keyframes", strat_name=tier.name, session_id=session_id)
+
+        # decoding has to start from the last keyframe at or before the requested range
+        keyframes: List[Tuple[bytes, float]] = self.session_client.zrevrangebyscore(
+            keyframes_name,
+            start_time,
+            "-inf",
+            start=0,
+            num=1,
+            withscores=True,
+        )
+        decode_from: float = keyframes[0][1] if keyframes else start_time
+        raw_deltas: List[bytes] = self.session_client.zrangebyscore(points_name, decode_from, end_time)
+
+        points: List[PnlPoint] = []
+        point: Optional[PnlPoint] = None
+        for raw in raw_deltas:
+            delta: PnlDelta = PnlDelta.deserialize(raw)
+            if point is None and not delta.keyframe:
+                continue
+            point = delta.apply(point)
+            if point.time >= start_time:
+                points.append(point)
+        return points
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from core.clients.redis.redis_client import RedisClient
+
+
+class SessionListener:
+
+    def __init__(self, host: str, port: int) -> None:
+        self.client: Redis = Redis(host=host, port=port, db=RedisClient.REDIS_DB_MAP["session"])
+
+    async def wait_for_validity(self, session_id: str, timeout: float) -> bool:
+        name: str = RedisClient._get_name(prefix="valid", name=session_id)
+        async with self.client.pubsub() as pubsub:
+            # subscribe before reading the flag so an unlock published in between is not missed
+            await pubsub.subscribe(name)
+            raw: Optional[bytes] = await self.client.get(name=name)
+            if raw is None or bool(raw):
+                return True
+
+            try:
+                async with asyncio.timeout(timeout):
+                    return await self._wait_for_unlock(pubsub)
+            except TimeoutError:
+                return False
+
+    @staticmethod
+    async def _wait_for_unlock(pubsub: PubSub) -> bool:
+        async for message in pubsub.listen():
+            msg: Dict[str, Any] = message
+            if msg["type"] == "message" and bool(msg["data"]):
+                return True
+        return False
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -2,7 +2,14 @@ from typing import Dict
 
 from core.clients.service import HttpMethod, ServiceCall
 from core.clients.tdp.stubs.limits import GetBuyLimitsRequest, GetBuyLimitsResponse, UpdateBuyLimitsRequest
-from core.clients.tdp.stubs.metrics import GetNetWorthRequest, GetNetWorthResponse, GetPnlRequest, GetPnlResponse
+from core.clients.tdp.stubs.metrics import (
+    GetNetWorthRequest,
+    GetNetWorthResponse,
+    GetPnlHistoryRequest,
+    GetPnlHistoryResponse,
+    GetPnlRequest,
+    GetPnlResponse,
+)
 from core.clients.tdp.stubs.session import (
     CreateTradeSessionRequest,
     CreateTradeSessionResponse,
@@ -80,6 +87,12 @@ SERVICE_DEFINITIONS: Dict[str, ServiceCall] = {
         request_type=GetPnlRequest,
         response_type=GetPnlResponse,
     ),
+    "GetPnlHistory": ServiceCall(
+        endpoint="/metrics/pnl/history",
+        http_method=HttpMethod.GET,
+        request_type=GetPnlHistoryRequest,
+        response_type=GetPnlHistoryResponse,
+    ),
     "GetNetWorth": ServiceCall(
         endpoint="/metrics/nw",
         http_method=HttpMethod.GET,
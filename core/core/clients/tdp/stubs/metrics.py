@@ -1,4 +1,7 @@
+from typing import List, Optional
+
 from core.clients.redis.models.pnl.pnl import Pnl
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
 from core.clients.service import ApiBaseModel
 
 
@@ -14,6 +17,16 @@ class GetPnlResponse(ApiBaseModel):
     pnl: Pnl
 
 
+class GetPnlHistoryRequest(MetricsRequest):
+    start_time: float
+    end_time: float
+    resolution: Optional[str] = None
+
+
+class GetPnlHistoryResponse(ApiBaseModel):
+    points: List[PnlPoint]
+
+
 class GetNetWorthRequest(MetricsRequest):
     pass
 
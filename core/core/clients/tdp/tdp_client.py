@@ -5,6 +5,7 @@ from requests import Response, Session
 from core.clients.base_client import BaseClient
 from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
 from core.clients.redis.models.pnl.pnl import Pnl
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
 from core.clients.redis.models.trade_session.order import Order
 from core.clients.redis.models.trade_session.trade import Trade
 from core.clients.redis.models.trade_session.trade_session import TradeSession
@@ -13,7 +14,14 @@ from core.clients.tdp.exceptions import TdpApiError, UnsupportedServiceCall
 from core.clients.tdp.models.item_container import ItemContainer
 from core.clients.tdp.stubs import SERVICE_DEFINITIONS
 from core.clients.tdp.stubs.limits import GetBuyLimitsRequest, GetBuyLimitsResponse, UpdateBuyLimitsRequest
-from core.clients.tdp.stubs.metrics import GetNetWorthRequest, GetNetWorthResponse, GetPnlRequest, GetPnlResponse
+from core.clients.tdp.stubs.metrics import (
+    GetNetWorthRequest,
+    GetNetWorthResponse,
+    GetPnlHistoryRequest,
+    GetPnlHistoryResponse,
+    GetPnlRequest,
+    GetPnlResponse,
+)
 from core.clients.tdp.stubs.session import (
     CreateTradeSessionRequest,
     CreateTradeSessionResponse,
@@ -29,9 +37,12 @@ from core.clients.tdp.stubs.session import (
     UpdateTradeSessionRequest,
 )
 from core.config.environment import Environment
+from core.instrumentation import instrument_client
 from core.logger import logger
+from core.tracing.tracer import Tracer
 
 
+@instrument_client("tdp")
 class TdpClient(BaseClient):
 
     HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
@@ -48,7 +59,10 @@ class TdpClient(BaseClient):
 
         data: Dict[str, Any] = resp.json()
         if data["status"] != "healthy":
-            raise TdpApiError(f"Trade Data Platform health status: {data['health']}")
+            raise TdpApiError(f"Trade Data Platform health status: {data['status']}")
+
+    def close(self) -> None:
+        self.session.close()
 
     def invoke(self, call: str, request: ApiBaseModel) -> Optional[ApiBaseModel]:
         try:
@@ -61,7 +75,7 @@ class TdpClient(BaseClient):
         session_method: Callable = getattr(self.session, service_call.http_method.name.lower())
 
         logger.info(f"Invoking {call} - issuing {service_call.http_method.name} request to {service_call.endpoint}")
-        resp: Response = session_method(url=url, json=data, headers=self.HEADERS)
+        resp: Response = session_method(url=url, json=data, headers=Tracer.inject(dict(self.HEADERS)))
         if resp.status_code != 200:
             raise TdpApiError(resp.text)
 
@@ -134,6 +148,22 @@ class TdpClient(BaseClient):
         resp: GetPnlResponse = self.invoke("GetPnl", req)
         return resp.pnl
 
+    def get_pnl_history(
+        self,
+        session_id: str,
+        start_time: float,
+        end_time: float,
+        resolution: Optional[str] = None,
+    ) -> List[PnlPoint]:
+        req: GetPnlHistoryRequest = GetPnlHistoryRequest(
+            session_id=session_id,
+            start_time=start_time,
+            end_time=end_time,
+            resolution=resolution,
+        )
+        resp: GetPnlHistoryResponse = self.invoke("GetPnlHistory", req)
+        return resp.points
+
     def get_nw(self, session_id: str) -> int:
         req: GetNetWorthRequest = GetNetWorthRequest(session_id=session_id)
         resp: GetNetWorthResponse = self.invoke("GetNetWorth", req)
@@ -3,6 +3,7 @@ from typing import Optional
 
 from core.config.environment import Environment
 from core.config.exceptions import MissingConfigError
+from core.config.redis_pool_config import RedisPoolConfig
 
 
 class AppConfig:
@@ -14,8 +15,24 @@ class AppConfig:
         self.log_level: str = os.getenv("LOG_LEVEL", self.DEFAULT_LOG_LEVEL).upper()
         self.redis_host: str = self.extract_env_var("REDIS_HOST")
         self.redis_port: int = int(self.extract_env_var("REDIS_PORT"))
+        self.redis_pool_config: RedisPoolConfig = self.create_redis_pool_config()
         self.gds_host: str = self.extract_env_var("GDS_HOST")
         self.gds_port: int = int(self.extract_env_var("GDS_PORT"))
+        # defaults to the public osrs wiki prices api when unset
+        self.price_api_url: Optional[str] = os.getenv("PRICE_API_URL")
+        # spans are only recorded when an export path is configured
+        self.trace_export_path: Optional[str] = os.getenv("TRACE_EXPORT_PATH")
+
+    @staticmethod
+    def create_redis_pool_config() -> RedisPoolConfig:
+        default: RedisPoolConfig = RedisPoolConfig()
+        return RedisPoolConfig(
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", default.max_connections)),
+            pool_timeout=float(os.getenv("REDIS_POOL_TIMEOUT", default.pool_timeout)),
+            health_check_interval=int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", default.health_check_interval)),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", default.socket_timeout)),
+            socket_connect_timeout=float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", default.socket_connect_timeout)),
+        )
 
     @staticmethod
     def raise_if_missing(val: Optional[str], var_name: str) -> str:
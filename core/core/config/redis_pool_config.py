@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RedisPoolConfig:
+    max_connections: int = 50
+    pool_timeout: float = 5.0  # seconds to wait for a free connection once the pool is exhausted
+    health_check_interval: int = 30
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 5.0
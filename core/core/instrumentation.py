@@ -0,0 +1,73 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, List, Optional, Type
+
+from core.tracing.tracer import Tracer
+
+
+# called with (client, operation, duration in seconds, failed)
+ClientCallObserver = Callable[[str, str, float, bool], None]
+
+# the client whose instrumented call is running, so calls it makes through its own public methods are not counted twice
+_active_client: ContextVar[Optional[str]] = ContextVar("active_client", default=None)
+
+
+class Instrumentation:
+
+    _observers: List[ClientCallObserver] = []
+
+    @classmethod
+    def add_observer(cls, observer: ClientCallObserver) -> None:
+        # replace rather than mutate so threads iterating the old list are unaffected
+        if observer not in cls._observers:
+            cls._observers = [*cls._observers, observer]
+
+    @classmethod
+    def remove_observer(cls, observer: ClientCallObserver) -> None:
+        # compared by equality, since every access to a bound method creates a new object
+        cls._observers = [o for o in cls._observers if o != observer]
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(cls._observers)
+
+    @classmethod
+    def notify(cls, client: str, operation: str, duration: float, failed: bool) -> None:
+        for observer in cls._observers:
+            observer(client, operation, duration, failed)
+
+
+def _instrument(client: str, operation: str, f: Callable) -> Callable:
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs) -> Any:
+        if not Instrumentation.is_enabled() and not Tracer.is_enabled():
+            return f(*args, **kwargs)
+        if _active_client.get() == client:
+            return f(*args, **kwargs)
+
+        token: Token = _active_client.set(client)
+        start_time: float = time.perf_counter()
+        failed: bool = True
+        try:
+            with Tracer.span(name=f"{client}.{operation}", client=client):
+                result: Any = f(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _active_client.reset(token)
+            Instrumentation.notify(client, operation, time.perf_counter() - start_time, failed)
+
+    return wrapper
+
+
+def instrument_client(client: str) -> Callable[[Type], Type]:
+    def decorate(cls: Type) -> Type:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(attr):
+                continue
+            setattr(cls, name, _instrument(client=client, operation=name, f=attr))
+        return cls
+
+    return decorate
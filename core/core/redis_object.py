@@ -1,15 +1,34 @@
-import pickle
 from dataclasses import dataclass
+from typing import Any, ClassVar, List, Optional, Tuple
 
 from core.abstract_dataclasses import AbstractDataclass
+from core.serializers.exceptions import UnknownSerializationFormatError
+from core.serializers.msgpack_serializer import MsgpackSerializer
+from core.serializers.pickle_serializer import PickleSerializer
+from core.serializers.serializer import Serializer
+
+
+SERIALIZERS: Tuple[Serializer, ...] = (MsgpackSerializer(), PickleSerializer())
 
 
 @dataclass
 class RedisObject(AbstractDataclass):
 
+    # payloads carry their serializer's header, so switching SERIALIZER still reads data written by the old one
+    SERIALIZER: ClassVar[Serializer] = SERIALIZERS[0]
+    # bump when fields are added, removed or reordered, and handle the old layout in migrate
+    SCHEMA_VERSION: ClassVar[int] = 1
+
+    @classmethod
+    def migrate(cls, fields: List[Any], version: int) -> Optional[List[Any]]:
+        return None
+
     @classmethod
     def deserialize(cls, data: bytes) -> "RedisObject":
-        return pickle.loads(data)
+        for serializer in SERIALIZERS:
+            if serializer.matches(data):
+                return serializer.deserialize(data=data, cls=cls)
+        raise UnknownSerializationFormatError(header=data[:4])
 
     def serialize(self) -> bytes:
-        return pickle.dumps(self)
+        return self.SERIALIZER.serialize(self)
@@ -0,0 +1,21 @@
+from typing import Any, Type
+
+
+class UnknownSerializationFormatError(Exception):
+    def __init__(self, header: bytes) -> None:
+        super().__init__(f"No serializer recognizes payload starting with {header!r}")
+
+
+class UnsupportedSchemaVersionError(Exception):
+    def __init__(self, cls: Type, version: int) -> None:
+        super().__init__(f"No migration from schema version {version} to {cls.SCHEMA_VERSION} for {cls.__name__}")
+
+
+class UnserializableTypeError(Exception):
+    def __init__(self, obj: Any) -> None:
+        super().__init__(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+class UnserializableSubclassError(Exception):
+    def __init__(self, obj: Any, declared: Type) -> None:
+        super().__init__(f"Cannot serialize {type(obj).__name__} where the schema declares {declared.__name__}")
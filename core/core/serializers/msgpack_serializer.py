@@ -0,0 +1,218 @@
+import struct
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from operator import attrgetter
+from threading import RLock
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import msgpack
+
+from core.serializers.exceptions import (
+    UnserializableSubclassError,
+    UnserializableTypeError,
+    UnsupportedSchemaVersionError,
+)
+from core.serializers.serializer import Serializer
+
+
+# a converter of None means the value is already msgpack native and passes through untouched
+Converter = Optional[Callable[[Any], Any]]
+
+
+class MsgpackSerializer(Serializer):
+
+    # 0xc1 is the one byte msgpack never emits, so it cannot collide with a bare msgpack or pickle payload
+    MAGIC: bytes = b"\xc1"
+    HEADER: struct.Struct = struct.Struct(">cH")
+
+    def __init__(self) -> None:
+        self._encoders: Dict[Any, Converter] = {}
+        self._decoders: Dict[Any, Converter] = {}
+        # codecs are built under the lock and only published once the outermost one is complete, so other threads
+        # never pick up a half built one. the lock is reentrant since building a codec builds those of its fields
+        self._lock: RLock = RLock()
+        self._pending_encoders: Dict[Any, Converter] = {}
+        self._pending_decoders: Dict[Any, Converter] = {}
+
+    def matches(self, data: bytes) -> bool:
+        return data[:1] == self.MAGIC
+
+    @staticmethod
+    def _get_fields(cls: Type) -> List[Tuple[str, Any]]:
+        hints: Dict[str, Any] = get_type_hints(cls)
+        return [(f.name, hints[f.name]) for f in fields(cls)]
+
+    @staticmethod
+    def _get_optional_arg(tp: Any) -> Optional[Any]:
+        if get_origin(tp) not in (Union, UnionType):
+            return None
+        return next(a for a in get_args(tp) if a is not NoneType)
+
+    def _get_codec(
+        self,
+        tp: Any,
+        codecs: Dict[Any, Converter],
+        pending: Dict[Any, Converter],
+        build: Callable[[Any], Converter],
+    ) -> Converter:
+        if tp in codecs:
+            return codecs[tp]
+        with self._lock:
+            if tp in codecs:
+                return codecs[tp]
+            # a type that refers back to itself gets the pass through placeholder for the nested reference
+            if tp in pending:
+                return pending[tp]
+
+            outermost: bool = not pending
+            pending[tp] = None
+            try:
+                codec: Converter = build(tp)
+                pending[tp] = codec
+                if outermost:
+                    codecs.update(pending)
+            finally:
+                if outermost:
+                    pending.clear()
+            return codec
+
+    @staticmethod
+    def _reject(obj: Any) -> Any:
+        # only reached for values the annotations do not describe, which could not be decoded back to their type
+        raise UnserializableTypeError(obj)
+
+    def _build_dataclass_encoder(self, cls: Type) -> Converter:
+        # dataclasses are written as a positional array in field order, so field names never hit the wire
+        getters: List[Callable[[Any], Any]] = []
+        for name, tp in self._get_fields(cls):
+            getter: Callable[[Any], Any] = attrgetter(name)
+            encoder: Converter = self._get_encoder(tp)
+            getters.append(getter if encoder is None else lambda obj, g=getter, e=encoder: e(g(obj)))
+
+        def encode(obj: Any) -> List[Any]:
+            # the wire has no type tags, so the extra fields of a subclass would be dropped without a trace
+            if type(obj) is not cls:
+                raise UnserializableSubclassError(obj=obj, declared=cls)
+            return [getter(obj) for getter in getters]
+
+        return encode
+
+    def _build_encoder(self, tp: Any) -> Converter:
+        origin: Any = get_origin(tp)
+        args: Tuple[Any, ...] = get_args(tp)
+
+        optional_arg: Optional[Any] = self._get_optional_arg(tp)
+        if optional_arg is not None:
+            inner: Converter = self._get_encoder(optional_arg)
+            return None if inner is None else lambda v: None if v is None else inner(v)
+        if isinstance(tp, type) and is_dataclass(tp):
+            return self._build_dataclass_encoder(tp)
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return attrgetter("value")
+        if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+            items: List[Converter] = [self._get_encoder(a) for a in args]
+            if all(e is None for e in items):
+                return None
+            return lambda v: [x if e is None else e(x) for e, x in zip(items, v)]
+        if origin in (list, set, frozenset, tuple) and args:
+            item: Converter = self._get_encoder(args[0])
+            if item is None:
+                return None if origin in (list, tuple) else list
+            return lambda v: [item(x) for x in v]
+        if origin is dict and args:
+            key: Converter = self._get_encoder(args[0])
+            val: Converter = self._get_encoder(args[1])
+            if key is None and val is None:
+                return None
+            key = key or (lambda k: k)
+            val = val or (lambda x: x)
+            return lambda v: {key(k): val(x) for k, x in v.items()}
+        return None
+
+    def _get_encoder(self, tp: Any) -> Converter:
+        return self._get_codec(tp, codecs=self._encoders, pending=self._pending_encoders, build=self._build_encoder)
+
+    def serialize(self, obj: Any) -> bytes:
+        header: bytes = self.HEADER.pack(self.MAGIC, type(obj).SCHEMA_VERSION)
+        encoded: Any = self._get_encoder(type(obj))(obj)
+        return header + msgpack.packb(encoded, default=self._reject, use_bin_type=True)
+
+    def _build_dataclass_decoder(self, cls: Type) -> Converter:
+        # instances go through __init__, so defaults, validation and __post_init__ behave as in normal construction
+        names: List[str] = []
+        decoders: List[Callable[[Any], Any]] = []
+        for name, tp in self._get_fields(cls):
+            decoder: Converter = self._get_decoder(tp)
+            names.append(name)
+            decoders.append(decoder or (lambda x: x))
+        init: List[bool] = [f.init for f in fields(cls)]
+
+        def decode(val: List[Any]) -> Any:
+            kwargs: Dict[str, Any] = {}
+            later: Dict[str, Any] = {}
+            for name, decoder, is_init, x in zip(names, decoders, init, val):
+                (kwargs if is_init else later)[name] = decoder(x)
+            obj: Any = cls(**kwargs)
+            for name, x in later.items():
+                object.__setattr__(obj, name, x)
+            return obj
+
+        return decode
+
+    def _build_decoder(self, tp: Any) -> Converter:
+        origin: Any = get_origin(tp)
+        args: Tuple[Any, ...] = get_args(tp)
+
+        optional_arg: Optional[Any] = self._get_optional_arg(tp)
+        if optional_arg is not None:
+            inner: Converter = self._get_decoder(optional_arg)
+            return None if inner is None else lambda v: None if v is None else inner(v)
+        if isinstance(tp, type) and is_dataclass(tp):
+            return self._build_dataclass_decoder(tp)
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return tp._value2member_map_.__getitem__
+        if origin in (list, set, frozenset) and args:
+            item: Converter = self._get_decoder(args[0])
+            if item is None:
+                return None if origin is list else origin
+            return lambda v: origin(item(x) for x in v)
+        if origin is tuple and args:
+            if len(args) == 2 and args[1] is Ellipsis:
+                item: Converter = self._get_decoder(args[0])
+                return tuple if item is None else lambda v: tuple(item(x) for x in v)
+            items: List[Converter] = [self._get_decoder(a) for a in args]
+            return lambda v: tuple(x if d is None else d(x) for d, x in zip(items, v))
+        if origin is dict and args:
+            key: Converter = self._get_decoder(args[0])
+            val: Converter = self._get_decoder(args[1])
+            if key is None and val is None:
+                return None
+            key = key or (lambda k: k)
+            val = val or (lambda x: x)
+            return lambda v: {key(k): val(x) for k, x in v.items()}
+        return None
+
+    def _get_decoder(self, tp: Any) -> Converter:
+        return self._get_codec(tp, codecs=self._decoders, pending=self._pending_decoders, build=self._build_decoder)
+
+    def deserialize(self, data: bytes, cls: Type) -> Any:
+        _, version = self.HEADER.unpack_from(data)
+        val: List[Any] = msgpack.unpackb(data[self.HEADER.size :], raw=False, strict_map_key=False)
+        if version != cls.SCHEMA_VERSION:
+            val = cls.migrate(fields=val, version=version)
+            if val is None:
+                raise UnsupportedSchemaVersionError(cls=cls, version=version)
+        return self._get_decoder(cls)(val)
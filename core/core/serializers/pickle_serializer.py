@@ -0,0 +1,19 @@
+import pickle
+from typing import Any, Type
+
+from core.serializers.serializer import Serializer
+
+
+class PickleSerializer(Serializer):
+
+    # every pickle written with protocol 2 or above starts with the PROTO opcode
+    PROTO_OPCODE: bytes = b"\x80"
+
+    def matches(self, data: bytes) -> bool:
+        return data[:1] == self.PROTO_OPCODE
+
+    def serialize(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def deserialize(self, data: bytes, cls: Type) -> Any:
+        return pickle.loads(data)
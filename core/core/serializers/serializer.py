@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Any, Type
+
+
+class Serializer(ABC):
+
+    @abstractmethod
+    def matches(self, data: bytes) -> bool:
+        pass
+
+    @abstractmethod
+    def serialize(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def deserialize(self, data: bytes, cls: Type) -> Any:
+        pass
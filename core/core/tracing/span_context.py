@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SpanContext:
+
+    trace_id: str
+    span_id: str
@@ -0,0 +1,55 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Dict, List
+
+from core.tracing.span import Span
+
+
+class SpanExporter(ABC):
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+
+    SCOPE_NAME: str = "core.tracing"
+
+    def __init__(self, path: str, service_name: str) -> None:
+        self.path: str = path
+        self.service_name: str = service_name
+        self.lock: Lock = Lock()
+
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _to_otlp_request(self, spans: List[Span]) -> Dict[str, Any]:
+        # each line is an otlp/json ExportTraceServiceRequest, so collectors can ingest the file as is
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}],
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": self.SCOPE_NAME},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, spans: List[Span]) -> None:
+        line: str = json.dumps(self._to_otlp_request(spans), separators=(",", ":")) + "\n"
+        with self.lock:
+            with open(self.path, "a") as f:
+                f.write(line)
@@ -0,0 +1,142 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.logger import logger
+from core.tracing.span import Span
+from core.tracing.span_context import SpanContext
+from core.tracing.span_exporter import SpanExporter
+
+
+class Tracer:
+
+    TRACEPARENT_HEADER: str = "traceparent"
+    TRACEPARENT_VERSION: str = "00"
+    SAMPLED_FLAGS: str = "01"
+    EXPORT_BATCH_SIZE: int = 512
+    EXPORT_INTERVAL_SECS: float = 1.0
+
+    _exporter: Optional[SpanExporter] = None
+    _current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+    _finished: List[Span] = []
+    _lock: Lock = Lock()
+
+    # spans are exported off the traced threads, so a request or cycle never waits on exporter io
+    _export_thread: Optional[Thread] = None
+    _export_requested: Event = Event()
+    _stopping: bool = False
+
+    @classmethod
+    def configure(cls, exporter: SpanExporter) -> None:
+        cls.shutdown()
+        cls._exporter = exporter
+        cls._stopping = False
+        cls._export_thread = Thread(target=cls._export_loop, name="span-export", daemon=True)
+        cls._export_thread.start()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._exporter is None:
+            return
+        if cls._export_thread is not None:
+            cls._stopping = True
+            cls._export_requested.set()
+            cls._export_thread.join()
+            cls._export_thread = None
+        cls.flush()
+        cls._exporter.close()
+        cls._exporter = None
+
+    @classmethod
+    def _export_loop(cls) -> None:
+        while not cls._stopping:
+            cls._export_requested.wait(timeout=cls.EXPORT_INTERVAL_SECS)
+            cls._export_requested.clear()
+            cls.flush()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._exporter is not None
+
+    @classmethod
+    def current_span(cls) -> Optional[Span]:
+        return cls._current_span.get()
+
+    @staticmethod
+    def _new_id(num_bytes: int) -> str:
+        return os.urandom(num_bytes).hex()
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, parent: Optional[SpanContext] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+        if cls._exporter is None:
+            yield None
+            return
+
+        local_parent: Optional[Span] = cls._current_span.get()
+        if parent is None and local_parent is not None:
+            parent = local_parent.context
+
+        span: Span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else cls._new_id(16),
+            span_id=cls._new_id(8),
+            parent_id=parent.span_id if parent is not None else None,
+            start_time_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token: Token = cls._current_span.set(span)
+        try:
+            yield span
+        except BaseException:
+            span.failed = True
+            raise
+        finally:
+            cls._current_span.reset(token)
+            span.end_time_ns = time.time_ns()
+            cls._finish(span)
+
+    @classmethod
+    def _finish(cls, span: Span) -> None:
+        with cls._lock:
+            cls._finished.append(span)
+            batch_full: bool = len(cls._finished) >= cls.EXPORT_BATCH_SIZE
+        # anything short of a full batch goes out with the next timed export
+        if batch_full:
+            cls._export_requested.set()
+
+    @classmethod
+    def flush(cls) -> None:
+        with cls._lock:
+            spans: List[Span] = cls._finished
+            cls._finished = []
+
+        exporter: Optional[SpanExporter] = cls._exporter
+        if not spans or exporter is None:
+            return
+        try:
+            exporter.export(spans)
+        except Exception as e:
+            # tracing must never take down the traced code path
+            logger.warn(f"Failed to export {len(spans)} spans: {e}")
+
+    @classmethod
+    def inject(cls, headers: Dict[str, str]) -> Dict[str, str]:
+        span: Optional[Span] = cls._current_span.get()
+        if span is not None:
+            headers[cls.TRACEPARENT_HEADER] = (
+                f"{cls.TRACEPARENT_VERSION}-{span.trace_id}-{span.span_id}-{cls.SAMPLED_FLAGS}"
+            )
+        return headers
+
+    @classmethod
+    def extract(cls, traceparent: Optional[str]) -> Optional[SpanContext]:
+        if not traceparent:
+            return None
+        parts: List[str] = traceparent.strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        return SpanContext(trace_id=parts[1], span_id=parts[2])
@@ -0,0 +1,168 @@
+import random
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
+from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
+from core.clients.redis.models.trade_session.offer_type import OfferType
+from core.clients.redis.models.trade_session.order import Order
+from core.clients.redis.models.trade_session.start_metadata import StartMetadata
+from core.clients.redis.models.trade_session.trade import Trade
+from core.clients.redis.models.trade_session.trade_session import TradeSession
+from core.config.environment import Environment
+from core.redis_object import RedisObject
+from core.serializers.msgpack_serializer import MsgpackSerializer
+from core.serializers.pickle_serializer import PickleSerializer
+from core.serializers.serializer import Serializer
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "pickle": PickleSerializer(),
+    "msgpack": MsgpackSerializer(),
+}
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    strats: int
+    orders_per_strat: int
+    iterations: int
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    serializer: str
+    size: int
+    encode_us: float
+    decode_us: float
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(description="Script that compares RedisObject serializers")
+    parser.add_argument("--strats", type=int, required=False, default=3, help="Strategies in the trade session")
+    parser.add_argument("--orders-per-strat", type=int, required=False, default=2000, help="Orders per strategy")
+    parser.add_argument("--iterations", type=int, required=False, default=50, help="Encode/decode runs per object")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def create_order(strat_name: str, calc_cycle: int) -> Order:
+    return Order(
+        id=f"{strat_name}-{calc_cycle}-{random.randrange(8)}",
+        calc_cycle=calc_cycle,
+        strat_name=strat_name,
+        metadata=OfferMetadata(
+            type=random.choice([OfferType.BUY, OfferType.SELL, OfferType.CANCEL_BUY, OfferType.CANCEL_SELL]),
+            item_id=random.randrange(30000),
+            price=random.randrange(1, 10_000_000),
+            quantity=random.randrange(1, 25000),
+            ge_slot=random.randrange(8),
+        ),
+        time=time.time(),
+    )
+
+
+def create_trade_session(strats: int, orders_per_strat: int) -> TradeSession:
+    orders: Dict[str, List[Order]] = {
+        f"strat {s}": [create_order(strat_name=f"strat {s}", calc_cycle=c) for c in range(orders_per_strat)]
+        for s in range(strats)
+    }
+    trades: Dict[str, List[Trade]] = {
+        strat_name: [
+            Trade(
+                id=o.id,
+                calc_cycle=o.calc_cycle,
+                strat_name=strat_name,
+                transacted=o.metadata.quantity,
+                metadata=o.metadata,
+                time=o.time,
+            )
+            for o in strat_orders
+        ]
+        for strat_name, strat_orders in orders.items()
+    }
+    return TradeSession(
+        session_id="benchmark",
+        player_name="benchmark",
+        env=list(Environment)[0],
+        start_metadata=StartMetadata(start_time=time.time(), start_nw=100_000_000, start_items={995: 100_000_000}),
+        active_orders={o.metadata.ge_slot: o for o in orders["strat 0"][:8]},
+        orders=orders,
+        trades=trades,
+    )
+
+
+def create_exchange() -> Exchange:
+    return Exchange(
+        slots=[
+            ExchangeSlot(
+                position=i,
+                item_id=random.randrange(30000),
+                price=random.randrange(1, 10_000_000),
+                quantity_transacted=random.randrange(100),
+                total_quantity=100,
+                state=random.choice(list(ExchangeSlotState)),
+            )
+            for i in range(8)
+        ]
+    )
+
+
+def create_buy_limit() -> BuyLimit:
+    return BuyLimit(item_id=random.randrange(30000), bought=random.randrange(100), limit=25000)
+
+
+def time_us(fn: Callable[[], object], iterations: int) -> float:
+    start_time: float = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start_time) / iterations * 1e6
+
+
+def benchmark(name: str, obj: RedisObject, iterations: int) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for serializer_name, serializer in SERIALIZERS.items():
+        data: bytes = serializer.serialize(obj)
+        assert serializer.deserialize(data=data, cls=type(obj)) == obj
+        results.append(
+            BenchmarkResult(
+                name=name,
+                serializer=serializer_name,
+                size=len(data),
+                encode_us=time_us(lambda: serializer.serialize(obj), iterations),
+                decode_us=time_us(lambda: serializer.deserialize(data=data, cls=type(obj)), iterations),
+            )
+        )
+    return results
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+    random.seed(0)
+
+    objects: Dict[str, RedisObject] = {
+        f"TradeSession ({args.strats}x{args.orders_per_strat})": create_trade_session(
+            strats=args.strats,
+            orders_per_strat=args.orders_per_strat,
+        ),
+        "Order": create_order(strat_name="strat 0", calc_cycle=0),
+        "Exchange": create_exchange(),
+        "BuyLimit": create_buy_limit(),
+    }
+
+    print(f"{'object':<28}{'serializer':<12}{'bytes':>10}{'encode us':>14}{'decode us':>14}")
+    for name, obj in objects.items():
+        iterations: int = args.iterations if isinstance(obj, TradeSession) else args.iterations * 100
+        for r in benchmark(name=name, obj=obj, iterations=iterations):
+            print(f"{r.name:<28}{r.serializer:<12}{r.size:>10}{r.encode_us:>14.1f}{r.decode_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,6 @@ from core.clients.redis.redis_client import RedisClient
 MAX_INT: int = 2**31 - 1
 REDIS_HOST: str = "localhost"
 REDIS_PORT: int = 6379
-REDIS_DB: int = 1
 
 
 @dataclass(frozen=True)
@@ -52,7 +51,7 @@ def main() -> None:
 
     buy_limits: Dict[int, BuyLimit] = create_buy_limits(args.item_ids)
 
-    redis_client: RedisClient = RedisClient(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
+    redis_client: RedisClient = RedisClient(host=REDIS_HOST, port=REDIS_PORT)
     redis_client.set_all_buy_limits(player_name=args.player_name, buy_limits=buy_limits)
 
 
@@ -0,0 +1,28 @@
+from typing import Iterator
+
+import fakeredis
+import pytest
+from redis import BlockingConnectionPool
+
+from core.clients.redis.connection_pools import RedisConnectionPools
+from core.clients.redis.redis_client import RedisClient
+
+
+REDIS_HOST: str = "fakeredis"
+REDIS_PORT: int = 6379
+
+
+@pytest.fixture
+def redis_client() -> Iterator[RedisClient]:
+    server: fakeredis.FakeServer = fakeredis.FakeServer()
+    for db in RedisClient.REDIS_DB_MAP.values():
+        RedisConnectionPools.install(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=db,
+            pool=BlockingConnectionPool(connection_class=fakeredis.FakeRedisConnection, server=server, db=db),
+        )
+    client: RedisClient = RedisClient(host=REDIS_HOST, port=REDIS_PORT)
+    yield client
+    client.close()
+    RedisConnectionPools.disconnect_all()
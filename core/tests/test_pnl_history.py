@@ -0,0 +1,110 @@
+from typing import Dict, List
+
+import pytest
+
+from core.clients.redis.exceptions import UnsupportedPnlResolutionError
+from core.clients.redis.models.pnl.pnl_delta import PnlDelta
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
+from core.clients.redis.models.pnl.pnl_tier import PnlTier
+from core.clients.redis.redis_client import RedisClient
+
+
+SESSION_ID: str = "session"
+
+
+def create_points(num_points: int, start_time: float = 0.0, step_secs: float = 1.0) -> List[PnlPoint]:
+    points: List[PnlPoint] = []
+    for i in range(num_points):
+        # strats and held items change at different rates, and item 3 comes and goes, so deltas are partial
+        held_prices: Dict[int, int] = {1: 100 + i // 3, 2: 200}
+        if i % 4 < 2:
+            held_prices[3] = 300 + i
+        strat_pnl: Dict[str, int] = {"mm": i * 10, "other": (i // 5) * 7}
+        points.append(
+            PnlPoint(
+                time=start_time + i * step_secs,
+                total_pnl=sum(strat_pnl.values()),
+                strat_pnl=strat_pnl,
+                held_prices=held_prices,
+            )
+        )
+    return points
+
+
+def append_points(redis_client: RedisClient, points: List[PnlPoint]) -> None:
+    for point in points:
+        redis_client.append_pnl_point(session_id=SESSION_ID, point=point)
+
+
+def test_raw_tier_round_trip(redis_client: RedisClient) -> None:
+    points: List[PnlPoint] = create_points(num_points=3 * RedisClient.PNL_KEYFRAME_INTERVAL + 5)
+    append_points(redis_client=redis_client, points=points)
+
+    history: List[PnlPoint] = redis_client.get_pnl_history(
+        session_id=SESSION_ID,
+        start_time=points[0].time,
+        end_time=points[-1].time,
+        resolution="raw",
+    )
+    assert history == points
+
+
+def test_range_read_decodes_from_previous_keyframe(redis_client: RedisClient) -> None:
+    points: List[PnlPoint] = create_points(num_points=3 * RedisClient.PNL_KEYFRAME_INTERVAL)
+    append_points(redis_client=redis_client, points=points)
+
+    # starts and ends between keyframes, so the first points returned are rebuilt from deltas
+    start: int = RedisClient.PNL_KEYFRAME_INTERVAL + 5
+    end: int = 2 * RedisClient.PNL_KEYFRAME_INTERVAL + 3
+    history: List[PnlPoint] = redis_client.get_pnl_history(
+        session_id=SESSION_ID,
+        start_time=points[start].time,
+        end_time=points[end].time,
+        resolution="raw",
+    )
+    assert history == points[start : end + 1]
+
+
+def test_bucketed_tier_keeps_first_point_per_bucket(redis_client: RedisClient) -> None:
+    points: List[PnlPoint] = create_points(num_points=10 * 6, step_secs=10.0)
+    append_points(redis_client=redis_client, points=points)
+
+    history: List[PnlPoint] = redis_client.get_pnl_history(
+        session_id=SESSION_ID,
+        start_time=points[0].time,
+        end_time=points[-1].time,
+        resolution="1m",
+    )
+    assert history == points[::6]
+
+
+def test_unknown_resolution_raises(redis_client: RedisClient) -> None:
+    with pytest.raises(UnsupportedPnlResolutionError):
+        redis_client.get_pnl_history(session_id=SESSION_ID, start_time=0, end_time=1, resolution="1s")
+
+
+def test_trim_keeps_history_decodable(redis_client: RedisClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    retention_secs: int = 50
+    keyframe_interval: int = 8
+    monkeypatch.setattr(RedisClient, "PNL_TIERS", (PnlTier(name="raw", bucket_secs=0, retention_secs=retention_secs),))
+    monkeypatch.setattr(RedisClient, "PNL_KEYFRAME_INTERVAL", keyframe_interval)
+
+    points: List[PnlPoint] = create_points(num_points=200)
+    append_points(redis_client=redis_client, points=points)
+
+    points_name: str = RedisClient._get_strat_name(prefix="pnl_points", strat_name="raw", session_id=SESSION_ID)
+    stored: List[bytes] = redis_client.session_client.zrange(points_name, 0, -1)
+    first: PnlDelta = PnlDelta.deserialize(stored[0])
+
+    # trimming stops at the newest keyframe outside retention, so storage stays bounded and starts on a keyframe
+    assert first.keyframe
+    assert points[-1].time - retention_secs - keyframe_interval < first.time <= points[-1].time - retention_secs
+    assert len(stored) <= retention_secs + keyframe_interval + 1
+
+    history: List[PnlPoint] = redis_client.get_pnl_history(
+        session_id=SESSION_ID,
+        start_time=0,
+        end_time=points[-1].time,
+        resolution="raw",
+    )
+    assert history == [p for p in points if p.time >= first.time]
@@ -0,0 +1,212 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import pytest
+
+from core.clients.gds.models.exchange.exchange import Exchange
+from core.clients.gds.models.exchange.exchange_slot import ExchangeSlot
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
+from core.clients.redis.models.pnl.pnl_delta import PnlDelta
+from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
+from core.clients.redis.models.trade_session.offer_type import OfferType
+from core.clients.redis.models.trade_session.order import Order
+from core.clients.redis.models.trade_session.start_metadata import StartMetadata
+from core.clients.redis.models.trade_session.trade import Trade
+from core.clients.redis.models.trade_session.trade_session import TradeSession
+from core.config.environment import Environment
+from core.redis_object import RedisObject
+from core.serializers.exceptions import (
+    UnknownSerializationFormatError,
+    UnserializableSubclassError,
+    UnserializableTypeError,
+    UnsupportedSchemaVersionError,
+)
+from core.serializers.msgpack_serializer import MsgpackSerializer
+from core.serializers.pickle_serializer import PickleSerializer
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Inner:
+    name: str
+    color: Color
+
+
+@dataclass
+class SpecialInner(Inner):
+    extra: int
+
+
+@dataclass
+class Shapes(RedisObject):
+    pair: Tuple[int, Color]
+    many: Tuple[Color, ...]
+    tags: Set[Color]
+    inner: Optional[Inner]
+    by_color: Dict[str, List[Inner]]
+    doubled: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.doubled = self.pair[0] * 2
+
+
+@dataclass
+class Untyped(RedisObject):
+    value: Any
+
+
+@dataclass
+class Versioned(RedisObject):
+    SCHEMA_VERSION: ClassVar[int] = 2
+
+    name: str
+    count: int
+
+    @classmethod
+    def migrate(cls, fields: List[Any], version: int) -> Optional[List[Any]]:
+        if version == 1:
+            return [fields[0], 0]
+        return None
+
+
+def create_trade_session() -> TradeSession:
+    metadata: OfferMetadata = OfferMetadata(type=OfferType.BUY, item_id=2, price=150, quantity=10, ge_slot=3)
+    order: Order = Order(id="order", calc_cycle=1, strat_name="mm", metadata=metadata, time=1.5)
+    trade: Trade = Trade(id="trade", calc_cycle=2, strat_name="mm", transacted=4, metadata=metadata, time=2.5)
+    return TradeSession(
+        session_id="session",
+        player_name="player",
+        env=Environment.DEV,
+        start_metadata=StartMetadata(start_time=1.0, start_nw=1000, start_items={995: 1000}),
+        active_orders={3: order},
+        orders={"mm": [order]},
+        trades={"mm": [trade]},
+    )
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        create_trade_session(),
+        BuyLimit(item_id=2, bought=5, limit=100),
+        BuyLimit(item_id=2, bought=5, limit=100, reset_time=12.5),
+        Exchange(
+            slots=[
+                ExchangeSlot(
+                    position=0,
+                    item_id=2,
+                    price=150,
+                    quantity_transacted=1,
+                    total_quantity=10,
+                    state=ExchangeSlotState.BUYING,
+                )
+            ]
+        ),
+        PnlDelta(time=1.0, keyframe=False, strat_pnl={"mm": 10}, held_prices={2: 150}, removed_items=[3]),
+    ],
+)
+def test_msgpack_round_trip(obj: RedisObject) -> None:
+    data: bytes = obj.serialize()
+    assert MsgpackSerializer().matches(data)
+    assert type(obj).deserialize(data) == obj
+
+
+def test_msgpack_round_trip_shapes() -> None:
+    shapes: Shapes = Shapes(
+        pair=(4, Color.BLUE),
+        many=(Color.RED, Color.BLUE),
+        tags={Color.RED},
+        inner=Inner(name="a", color=Color.RED),
+        by_color={"blue": [Inner(name="b", color=Color.BLUE)]},
+    )
+    decoded: Shapes = Shapes.deserialize(shapes.serialize())
+    assert decoded == shapes
+    assert decoded.pair == (4, Color.BLUE)
+    assert decoded.doubled == 8
+
+
+def test_msgpack_rejects_subclass_values() -> None:
+    shapes: Shapes = Shapes(
+        pair=(1, Color.RED),
+        many=(),
+        tags=set(),
+        inner=SpecialInner(name="a", color=Color.RED, extra=1),
+        by_color={},
+    )
+    with pytest.raises(UnserializableSubclassError):
+        shapes.serialize()
+
+
+def test_msgpack_rejects_values_without_a_schema() -> None:
+    with pytest.raises(UnserializableTypeError):
+        Untyped(value=Inner(name="a", color=Color.RED)).serialize()
+
+
+def test_msgpack_migrates_old_schema_versions() -> None:
+    serializer: MsgpackSerializer = MsgpackSerializer()
+    old: bytes = serializer.HEADER.pack(serializer.MAGIC, 1) + b"\x91\xa4name"
+    assert Versioned.deserialize(old) == Versioned(name="name", count=0)
+
+    unknown: bytes = serializer.HEADER.pack(serializer.MAGIC, 7) + b"\x92\xa4name\x01"
+    with pytest.raises(UnsupportedSchemaVersionError):
+        Versioned.deserialize(unknown)
+
+
+def test_msgpack_codecs_survive_concurrent_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    get_fields: Any = MsgpackSerializer._get_fields
+
+    def slow_get_fields(cls: Type) -> List[Tuple[str, Any]]:
+        # widens the window in which another thread could see a codec that is still being built
+        time.sleep(0.01)
+        return get_fields(cls)
+
+    monkeypatch.setattr(MsgpackSerializer, "_get_fields", staticmethod(slow_get_fields))
+    serializer: MsgpackSerializer = MsgpackSerializer()
+    trade_session: TradeSession = create_trade_session()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        payloads: List[bytes] = list(executor.map(lambda _: serializer.serialize(trade_session), range(8)))
+        decoded: List[TradeSession] = list(
+            executor.map(lambda data: serializer.deserialize(data, TradeSession), payloads)
+        )
+
+    assert all(d == trade_session for d in decoded)
+    assert serializer.deserialize(serializer.serialize(trade_session), TradeSession) == trade_session
+
+
+def test_pickled_payloads_are_still_readable() -> None:
+    trade_session: TradeSession = create_trade_session()
+    legacy: bytes = pickle.dumps(trade_session, protocol=pickle.HIGHEST_PROTOCOL)
+    assert PickleSerializer().matches(legacy)
+    assert TradeSession.deserialize(legacy) == trade_session
+
+
+def test_pickle_serializer_round_trip(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(RedisObject, "SERIALIZER", PickleSerializer())
+    buy_limit: BuyLimit = BuyLimit(item_id=2, bought=5, limit=100)
+    data: bytes = buy_limit.serialize()
+    assert not MsgpackSerializer().matches(data)
+    assert BuyLimit.deserialize(data) == buy_limit
+
+
+def test_unknown_payload_raises() -> None:
+    with pytest.raises(UnknownSerializationFormatError):
+        BuyLimit.deserialize(b'{"item_id": 2}')
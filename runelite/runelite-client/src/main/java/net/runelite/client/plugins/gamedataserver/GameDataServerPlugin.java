@@ -9,7 +9,9 @@ import com.sun.net.httpserver.HttpServer;
 import lombok.extern.slf4j.Slf4j;
 import net.runelite.api.*;
 import net.runelite.api.coords.WorldPoint;
+import net.runelite.api.events.ChatMessage;
 import net.runelite.client.config.ConfigManager;
+import net.runelite.client.eventbus.Subscribe;
 import net.runelite.client.plugins.Plugin;
 import net.runelite.client.plugins.PluginDescriptor;
 import net.runelite.client.plugins.gamedataserver.model.GameDataSnapshot;
@@ -49,6 +51,7 @@ public class GameDataServerPlugin extends Plugin {
 	private static final int SERVER_PORT = 19100;
 	private static final int MAX_GE_SLOTS = 8;
 	private static final int MAX_INVENTORY_SLOTS = 28;
+	private static final int MAX_CHAT_MESSAGES = 256;
 
 	@Inject
 	private Client client;
@@ -61,6 +64,10 @@ public class GameDataServerPlugin extends Plugin {
 	private String sessionId;
 	private long startTime;
 
+	// public chat seen this session, numbered so clients can ask for only what is new since their last read
+	private final Deque<Message> chatMessages = new ArrayDeque<>();
+	private long chatSequence;
+
 	@Provides
 	private GameDataServerConfig provideConfig(ConfigManager configManager) {
 		return configManager.getConfig(GameDataServerConfig.class);
@@ -77,6 +84,10 @@ public class GameDataServerPlugin extends Plugin {
 
 		sessionId = UUID.randomUUID().toString().replace("-", "");
 		startTime = Instant.now().getEpochSecond();
+		synchronized (chatMessages) {
+			chatMessages.clear();
+			chatSequence = 0;
+		}
 
 		server = HttpServer.create(new InetSocketAddress(SERVER_PORT), 0);
 		server.createContext("/health", this::health);
@@ -103,6 +114,24 @@ public class GameDataServerPlugin extends Plugin {
 		}
 	}
 
+	private long getLongParam(HttpExchange httpExchange, String name) {
+		String query = httpExchange.getRequestURI().getQuery();
+		if (query == null) {
+			return 0;
+		}
+		for (String param : query.split("&")) {
+			String[] pair = param.split("=", 2);
+			if (pair.length == 2 && pair[0].equals(name)) {
+				try {
+					return Long.parseLong(pair[1]);
+				} catch (NumberFormatException e) {
+					throw new GameDataServerException(String.format("Invalid %s query param: %s", name, pair[1]));
+				}
+			}
+		}
+		return 0;
+	}
+
 	private void health(HttpExchange httpExchange) throws IOException {
 		log.info("responding to health check");
 		GameState state = client.getGameState();
@@ -122,8 +151,8 @@ public class GameDataServerPlugin extends Plugin {
 			.exchange(getExchangeData())
 			.inventory(getInventoryData())
 			.player(getPlayerData())
-			.chatBox(getChatBox())
-			.creationTime(Instant.now())
+			.chatBox(getChatBox(getLongParam(httpExchange, "chatSince")))
+			.creationTime(Instant.now().toEpochMilli())
 			.build();
 		sendResponse(httpExchange, snapshot);
 	}
@@ -177,7 +206,7 @@ public class GameDataServerPlugin extends Plugin {
 
 	private void serveChatBox(HttpExchange httpExchange) throws IOException {
 		log.info("Fetching chat box contents");
-		ChatBox chatBox = getChatBox();
+		ChatBox chatBox = getChatBox(getLongParam(httpExchange, "since"));
 		sendResponse(httpExchange, chatBox);
 	}
 
@@ -270,23 +299,42 @@ public class GameDataServerPlugin extends Plugin {
 		return input.replaceAll("[^\\x00-\\x7F]", " ");
 	}
 
-	private ChatBox getChatBox() {
-		ChatLineBuffer buffer = client.getChatLineMap().get(ChatMessageType.PUBLICCHAT.getType());
-		if (buffer == null) {
-			return ChatBox.builder().build();
+	@Subscribe
+	public void onChatMessage(ChatMessage chatMessage) {
+		if (chatMessage.getType() != ChatMessageType.PUBLICCHAT) {
+			return;
 		}
-		MessageNode[] lines = buffer.getLines();
-		List<Message> messages = Arrays.stream(lines)
-			.filter(Objects::nonNull)
-			.map(l -> Message.builder()
-				.content(decodeUTF8(l.getValue()))
-				.sender(decodeUTF8(l.getName()))
-				.timestamp(l.getTimestamp())
-				.build())
-			.collect(Collectors.toList());
+		synchronized (chatMessages) {
+			if (chatMessages.size() == MAX_CHAT_MESSAGES) {
+				chatMessages.removeFirst();
+			}
+			chatMessages.addLast(Message.builder()
+				.content(decodeUTF8(chatMessage.getMessage()))
+				.sender(decodeUTF8(chatMessage.getName()))
+				.timestamp(chatMessage.getTimestamp())
+				.sequence(++chatSequence)
+				.build());
+		}
+	}
 
-		return ChatBox.builder()
-			.messages(messages)
-			.build();
+	private ChatBox getChatBox(long since) {
+		synchronized (chatMessages) {
+			// a cursor past the head is from before a restart, so that client gets everything still buffered
+			long after = since > chatSequence ? 0 : since;
+			LinkedList<Message> messages = new LinkedList<>();
+			Iterator<Message> newestFirst = chatMessages.descendingIterator();
+			while (newestFirst.hasNext()) {
+				Message message = newestFirst.next();
+				if (message.getSequence() <= after) {
+					break;
+				}
+				messages.addFirst(message);
+			}
+
+			return ChatBox.builder()
+				.messages(messages)
+				.lastSequence(chatSequence)
+				.build();
+		}
 	}
 }
@@ -7,8 +7,6 @@ import net.runelite.client.plugins.gamedataserver.model.exchange.Exchange;
 import net.runelite.client.plugins.gamedataserver.model.inventory.Inventory;
 import net.runelite.client.plugins.gamedataserver.model.player.Player;
 
-import java.time.Instant;
-
 @Builder
 @Data
 public class GameDataSnapshot {
@@ -17,5 +15,5 @@ public class GameDataSnapshot {
 	private Inventory inventory;
 	private Player player;
 	private ChatBox chatBox;
-	private Instant creationTime;
+	private long creationTime;
 }
@@ -9,4 +9,5 @@ import java.util.List;
 @Data
 public class ChatBox {
 	List<Message> messages;
+	private long lastSequence;
 }
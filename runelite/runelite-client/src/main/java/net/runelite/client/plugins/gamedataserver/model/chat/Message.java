@@ -9,4 +9,5 @@ public class Message {
 	private String content;
 	private String sender;
 	private int timestamp;
+	private long sequence;
 }
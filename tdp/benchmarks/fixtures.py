@@ -0,0 +1,175 @@
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
+from core.clients.redis.models.buy_limit.buy_limit import BuyLimit
+from core.clients.redis.models.pnl.pnl import Pnl
+from core.clients.redis.models.trade_session.offer_metadata import OfferMetadata
+from core.clients.redis.models.trade_session.offer_type import OfferType
+from core.clients.redis.models.trade_session.order import Order
+from core.clients.redis.models.trade_session.start_metadata import StartMetadata
+from core.clients.redis.models.trade_session.trade import Trade
+from core.clients.redis.models.trade_session.trade_session import TradeSession
+from core.config.environment import Environment
+
+
+GP_ITEM_ID: int = 995
+NUM_EXCHANGE_SLOTS: int = 8
+
+
+def create_price_fixture(num_items: int, seed: int) -> Dict[str, Any]:
+    rng: random.Random = random.Random(seed)
+    now: int = int(time.time())
+
+    mapping: List[Dict[str, Any]] = []
+    latest: Dict[str, Dict[str, Any]] = {}
+    avg_5m: Dict[str, Dict[str, Any]] = {}
+    avg_1h: Dict[str, Dict[str, Any]] = {}
+    for item_id in range(2, 2 + num_items):
+        low: int = rng.randint(1, 2_000_000)
+        high: int = low + rng.randint(0, max(low // 50, 1))
+        mapping.append(
+            {"id": item_id, "name": f"item {item_id}", "limit": rng.choice((100, 1000, 10000)), "members": False}
+        )
+        latest[str(item_id)] = {"low": low, "high": high, "lowTime": now - rng.randint(0, 600), "highTime": now}
+        for data, volume in ((avg_5m, 50), (avg_1h, 600)):
+            data[str(item_id)] = {
+                "avgLowPrice": low,
+                "avgHighPrice": high,
+                "lowPriceVolume": rng.randint(0, volume),
+                "highPriceVolume": rng.randint(0, volume),
+            }
+
+    return {
+        "/mapping": mapping,
+        "/latest": {"data": latest},
+        "/5m": {"data": avg_5m, "timestamp": now - now % 300},
+        "/1h": {"data": avg_1h, "timestamp": now - now % 3600},
+    }
+
+
+def load_price_fixture(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_fixture_item_ids(price_fixture: Dict[str, Any]) -> List[int]:
+    return sorted(int(item_id) for item_id in price_fixture["/latest"]["data"])
+
+
+def create_gds_payloads(session_id: str, player_name: str, item_ids: List[int]) -> Dict[str, Any]:
+    start_time: float = time.time()
+    session: Dict[str, Any] = {"id": session_id, "startTime": start_time, "playerName": player_name, "isF2p": False}
+    exchange: Dict[str, Any] = {
+        "slots": [
+            {
+                "position": position,
+                "itemId": item_ids[position],
+                "price": 100,
+                "quantityTransacted": 5,
+                "totalQuantity": 10,
+                "state": (ExchangeSlotState.BUYING if position % 2 == 0 else ExchangeSlotState.SELLING).name,
+            }
+            for position in range(NUM_EXCHANGE_SLOTS)
+        ]
+    }
+    inventory: Dict[str, Any] = {
+        "items": [{"id": GP_ITEM_ID, "quantity": 100_000_000, "inventoryPosition": 0}]
+        + [{"id": item_id, "quantity": 10, "inventoryPosition": pos} for pos, item_id in enumerate(item_ids[:27], 1)]
+    }
+    player: Dict[str, Any] = {
+        "loggedIn": True,
+        "camera": {"z": 0, "yaw": 0, "scale": 0},
+        "location": {"x": 0, "y": 0},
+    }
+    chat_box: Dict[str, Any] = {"messages": [], "lastSequence": 0}
+
+    return {
+        "/health": {"status": "healthy"},
+        "/session": session,
+        "/exchange": exchange,
+        "/inventory": inventory,
+        "/player": player,
+        "/chat": chat_box,
+        "/config": {
+            "autotraderOn": True,
+            "topLevelConfig": {"minGp": 0},
+            "stratConfigs": [{"type": "mmConfig", "activated": True, "waitDuration": 60, "maxOfferTime": 600}],
+        },
+        "/snapshot": {
+            "session": session,
+            "exchange": exchange,
+            "inventory": inventory,
+            "player": player,
+            "chatBox": chat_box,
+            "creationTime": int(start_time * 1000),
+        },
+    }
+
+
+def create_buy_limits(item_ids: List[int]) -> Dict[int, BuyLimit]:
+    return {item_id: BuyLimit(item_id=item_id, bought=0, limit=10_000) for item_id in item_ids}
+
+
+def create_trade_session(
+    session_id: str,
+    player_name: str,
+    item_ids: List[int],
+    num_trades: int,
+    num_strats: int,
+    seed: int,
+) -> TradeSession:
+    rng: random.Random = random.Random(seed)
+    start_time: float = time.time() - num_trades
+
+    orders: Dict[str, List[Order]] = {f"strat{s}": [] for s in range(num_strats)}
+    trades: Dict[str, List[Trade]] = {f"strat{s}": [] for s in range(num_strats)}
+    for i in range(num_trades):
+        strat_name: str = f"strat{i % num_strats}"
+        calc_cycle: int = i // 8
+        metadata: OfferMetadata = OfferMetadata(
+            type=OfferType.BUY if i % 2 == 0 else OfferType.SELL,
+            item_id=rng.choice(item_ids),
+            price=rng.randint(1, 1_000_000),
+            quantity=rng.randint(1, 1000),
+            ge_slot=i % NUM_EXCHANGE_SLOTS,
+        )
+        order: Order = Order(
+            id=f"{session_id}-{i}",
+            calc_cycle=calc_cycle,
+            strat_name=strat_name,
+            metadata=metadata,
+            time=start_time + i,
+        )
+        orders[strat_name].append(order)
+        trades[strat_name].append(
+            Trade(
+                id=order.id,
+                calc_cycle=calc_cycle,
+                strat_name=strat_name,
+                transacted=metadata.quantity,
+                metadata=metadata,
+                time=order.time,
+            )
+        )
+
+    return TradeSession(
+        session_id=session_id,
+        player_name=player_name,
+        env=Environment.DEV,
+        start_metadata=StartMetadata(start_time=start_time, start_nw=0, start_items={}),
+        active_orders={},
+        orders=orders,
+        trades=trades,
+    )
+
+
+def create_pnl(trade_session: TradeSession) -> Pnl:
+    return Pnl(
+        session_id=trade_session.session_id,
+        total_pnl=0,
+        strat_pnl={},
+        update_time=trade_session.start_metadata.start_time,
+    )
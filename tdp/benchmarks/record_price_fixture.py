@@ -0,0 +1,40 @@
+import json
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from core.clients.price.price_client import PriceClient
+
+
+ENDPOINTS: tuple = ("/mapping", "/latest", "/5m", "/1h")
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    output: str
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(description="Script that records OSRS wiki price responses for benchmarks")
+    parser.add_argument("--output", type=str, required=True, help="Path of the JSON fixture to write")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+
+    price_client: PriceClient = PriceClient()
+    try:
+        fixture: Dict[str, Any] = {endpoint: price_client.get(endpoint) for endpoint in ENDPOINTS}
+    finally:
+        price_client.close()
+
+    with open(args.output, "w") as f:
+        json.dump(fixture, f)
+    print(f"Recorded {len(fixture['/latest']['data'])} items to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
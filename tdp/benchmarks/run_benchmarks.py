@@ -0,0 +1,293 @@
+import asyncio
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from core.clients.redis.models.trade_session.trade_session import TradeSession
+from core.clients.redis.redis_client import RedisClient
+from core.logger import logger
+from fastapi import FastAPI
+from fixtures import (
+    create_buy_limits,
+    create_gds_payloads,
+    create_pnl,
+    create_price_fixture,
+    create_trade_session,
+    get_fixture_item_ids,
+    load_price_fixture,
+)
+from httpx import ASGITransport, AsyncClient, Response
+from stand_ins import InMemoryRedis, JsonFixtureServer
+
+
+BENCHMARK_DIR: Path = Path(__file__).resolve().parent
+SRC_DIR: Path = BENCHMARK_DIR.parent / "src"
+RESULTS_DIR: Path = BENCHMARK_DIR / "results"
+
+PLAYER_NAME: str = "benchmark"
+REDIS_HOST: str = "in-memory-redis"
+REDIS_PORT: int = 6379
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    sizes: List[int]
+    requests: int
+    concurrency: int
+    strats: int
+    price_fixture: Optional[str]
+    price_items: int
+    seed: int
+    output: Optional[str]
+
+
+@dataclass(frozen=True)
+class EndpointCase:
+    name: str
+    method: str
+    path: str
+    body: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    endpoint: str
+    session_trades: int
+    requests: int
+    concurrency: int
+    failures: int
+    duration: float
+    throughput: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(
+        description="Script that benchmarks the TDP in-process against in-memory redis and fixture GDS/price servers"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda v: [int(x) for x in v.split(",")],
+        required=False,
+        default=[100, 1_000, 10_000, 100_000],
+        help="Comma separated list of trades per seeded session",
+    )
+    parser.add_argument("--requests", type=int, required=False, default=200, help="Timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, required=False, default=8, help="Concurrent in-flight requests")
+    parser.add_argument("--strats", type=int, required=False, default=3, help="Strategies in each seeded session")
+    parser.add_argument(
+        "--price-fixture",
+        type=str,
+        required=False,
+        default=None,
+        help="Recorded price fixture from record_price_fixture.py. A seeded synthetic fixture is used if omitted",
+    )
+    parser.add_argument("--price-items", type=int, required=False, default=4000, help="Items in a synthetic fixture")
+    parser.add_argument("--seed", type=int, required=False, default=0, help="Seed for synthetic data")
+    parser.add_argument("--output", type=str, required=False, default=None, help="Path of the JSON results file")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_app(gds_server: JsonFixtureServer, price_server: JsonFixtureServer) -> FastAPI:
+    os.environ.update(
+        {
+            "ENV": "dev",
+            "REDIS_HOST": REDIS_HOST,
+            "REDIS_PORT": str(REDIS_PORT),
+            "GDS_HOST": gds_server.HOST,
+            "GDS_PORT": str(gds_server.port),
+            "PRICE_API_URL": price_server.url,
+            "SERVICE_HOST": "127.0.0.1",
+            "SERVICE_PORT": "0",
+            "NUM_WORKERS": "1",
+        }
+    )
+    # the tdp reads its config when its modules are first imported, so they can only be loaded once env is set
+    sys.path.insert(0, str(SRC_DIR))
+    return importlib.import_module("app").create_app()
+
+
+def get_endpoint_cases(session_id: str) -> List[EndpointCase]:
+    return [
+        EndpointCase(name="/session/orders", method="GET", path="/session/orders", body={"session_id": session_id}),
+        EndpointCase(name="/session/trades", method="GET", path="/session/trades", body={"session_id": session_id}),
+        EndpointCase(
+            name="/limits",
+            method="GET",
+            path="/limits",
+            body={"player_name": PLAYER_NAME, "container": "EXCHANGE"},
+        ),
+        EndpointCase(name="/metrics/pnl", method="GET", path="/metrics/pnl", body={"session_id": session_id}),
+    ]
+
+
+async def call(client: AsyncClient, case: EndpointCase, num_requests: int, latencies: List[float]) -> int:
+    failures: int = 0
+    for _ in range(num_requests):
+        start_time: float = time.perf_counter()
+        resp: Response = await client.request(case.method, case.path, json=case.body)
+        latencies.append(time.perf_counter() - start_time)
+        if resp.status_code != 200:
+            failures += 1
+    return failures
+
+
+async def run_case(
+    client: AsyncClient,
+    case: EndpointCase,
+    session_trades: int,
+    num_requests: int,
+    concurrency: int,
+) -> BenchmarkResult:
+    await call(client=client, case=case, num_requests=1, latencies=[])
+
+    latencies: List[float] = []
+    requests_per_caller: int = max(num_requests // concurrency, 1)
+    start_time: float = time.perf_counter()
+    failures: List[int] = await asyncio.gather(
+        *(call(client, case, requests_per_caller, latencies) for _ in range(concurrency))
+    )
+    duration: float = time.perf_counter() - start_time
+
+    latencies_ms: np.ndarray = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+    return BenchmarkResult(
+        endpoint=case.name,
+        session_trades=session_trades,
+        requests=len(latencies),
+        concurrency=concurrency,
+        failures=sum(failures),
+        duration=duration,
+        throughput=len(latencies) / duration,
+        p50_ms=float(p50),
+        p90_ms=float(p90),
+        p99_ms=float(p99),
+        max_ms=float(latencies_ms.max()),
+    )
+
+
+def seed_session(redis_client: RedisClient, args: ProgramArgs, item_ids: List[int], num_trades: int) -> str:
+    session_id: str = f"benchmark-{num_trades}"
+    start_time: float = time.perf_counter()
+    trade_session: TradeSession = create_trade_session(
+        session_id=session_id,
+        player_name=PLAYER_NAME,
+        item_ids=item_ids,
+        num_trades=num_trades,
+        num_strats=args.strats,
+        seed=args.seed,
+    )
+    redis_client.init_trade_session(trade_session=trade_session, pnl=create_pnl(trade_session))
+    print(f"Seeded session {session_id} in {time.perf_counter() - start_time:.2f} seconds")
+    return session_id
+
+
+async def run_suite(
+    app: FastAPI, redis: InMemoryRedis, args: ProgramArgs, item_ids: List[int]
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    async with app.router.lifespan_context(app):
+        registry: Any = app.state.client_registry
+        registry.session_listener.client = redis.create_async_client(db="session")
+        redis_client: RedisClient = registry.redis_client
+        redis_client.set_all_buy_limits(player_name=PLAYER_NAME, buy_limits=create_buy_limits(item_ids))
+
+        transport: ASGITransport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://tdp") as client:
+            print(f"{'endpoint':<18} {'trades':>8} {'req/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'fail':>5}")
+            for num_trades in args.sizes:
+                session_id: str = await asyncio.to_thread(seed_session, redis_client, args, item_ids, num_trades)
+                for case in get_endpoint_cases(session_id):
+                    result: BenchmarkResult = await run_case(
+                        client=client,
+                        case=case,
+                        session_trades=num_trades,
+                        num_requests=args.requests,
+                        concurrency=args.concurrency,
+                    )
+                    results.append(result)
+                    print(
+                        f"{result.endpoint:<18} {result.session_trades:>8} {result.throughput:>9.1f} "
+                        f"{result.p50_ms:>9.2f} {result.p90_ms:>9.2f} {result.p99_ms:>9.2f} {result.failures:>5}"
+                    )
+    return results
+
+
+def write_results(args: ProgramArgs, results: List[BenchmarkResult]) -> Path:
+    commit: Optional[str] = get_git_commit()
+    created: datetime = datetime.now()
+    output: Path = (
+        Path(args.output)
+        if args.output is not None
+        else RESULTS_DIR / f"{created:%Y%m%d-%H%M%S}-{(commit or 'unknown')[:10]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    report: Dict[str, Any] = {
+        "commit": commit,
+        "created": created.isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": asdict(args),
+        "results": [asdict(result) for result in results],
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    return output
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+    # per request log lines would dominate the timings of the cheaper endpoints. seeded sessions are not reconciled
+    # with the fixture inventory either, so the pnl quantity check would warn on every call
+    logger.set_level("ERROR")
+
+    price_fixture: Dict[str, Any] = (
+        load_price_fixture(args.price_fixture)
+        if args.price_fixture is not None
+        else create_price_fixture(num_items=args.price_items, seed=args.seed)
+    )
+    item_ids: List[int] = get_fixture_item_ids(price_fixture)
+
+    redis: InMemoryRedis = InMemoryRedis(host=REDIS_HOST, port=REDIS_PORT)
+    redis.install()
+    gds_server: JsonFixtureServer = JsonFixtureServer(
+        create_gds_payloads(session_id="benchmark", player_name=PLAYER_NAME, item_ids=item_ids)
+    )
+    price_server: JsonFixtureServer = JsonFixtureServer(price_fixture)
+    gds_server.start()
+    price_server.start()
+    try:
+        app: FastAPI = create_app(gds_server=gds_server, price_server=price_server)
+        results: List[BenchmarkResult] = asyncio.run(run_suite(app=app, redis=redis, args=args, item_ids=item_ids))
+    finally:
+        gds_server.stop()
+        price_server.stop()
+
+    print(f"Results written to {write_results(args=args, results=results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any, Dict, Optional, Type
+
+from core.clients.redis.connection_pools import RedisConnectionPools
+from core.clients.redis.redis_client import RedisClient
+from fakeredis import FakeAsyncRedis, FakeConnection, FakeServer
+from redis import BlockingConnectionPool
+
+
+class JsonFixtureServer:
+
+    HOST: str = "127.0.0.1"
+
+    def __init__(self, payloads: Dict[str, Any]) -> None:
+        self.payloads: Dict[str, bytes] = {path: json.dumps(body).encode() for path, body in payloads.items()}
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((self.HOST, 0), self._create_handler())
+        self.thread: Thread = Thread(target=self.server.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.HOST}:{self.port}"
+
+    def _create_handler(self) -> Type[BaseHTTPRequestHandler]:
+        payloads: Dict[str, bytes] = self.payloads
+
+        class Handler(BaseHTTPRequestHandler):
+
+            # keep-alive, so the clients' pooled sessions behave as they do against the real servers
+            protocol_version: str = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                body: Optional[bytes] = payloads.get(self.path.split("?")[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class InMemoryRedis:
+
+    MAX_CONNECTIONS: int = 64
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.server: FakeServer = FakeServer()
+
+    def install(self) -> None:
+        for db in RedisClient.REDIS_DB_MAP.values():
+            RedisConnectionPools.install(
+                host=self.host,
+                port=self.port,
+                db=db,
+                pool=BlockingConnectionPool(
+                    connection_class=FakeConnection,
+                    server=self.server,
+                    db=db,
+                    max_connections=self.MAX_CONNECTIONS,
+                ),
+            )
+
+    def create_async_client(self, db: str) -> FakeAsyncRedis:
+        return FakeAsyncRedis(server=self.server, db=RedisClient.REDIS_DB_MAP[db])
@@ -0,0 +1,97 @@
+import time
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import requests
+from requests import Session
+
+
+TDP_HOST: str = "localhost"
+TDP_PORT: int = 8000
+HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
+
+
+@dataclass(frozen=True)
+class ProgramArgs:
+    endpoint: str
+    session_id: str
+    concurrency: List[int]
+    requests_per_caller: int
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    concurrency: int
+    total_requests: int
+    failures: int
+    duration: float
+
+    @property
+    def throughput(self) -> float:
+        return self.total_requests / self.duration
+
+
+def get_program_args() -> ProgramArgs:
+    parser: ArgumentParser = ArgumentParser(description="Script that measures TDP throughput under concurrent callers")
+    parser.add_argument("--endpoint", type=str, required=False, default="/metrics/nw", help="GET endpoint to load")
+    parser.add_argument("--session-id", type=str, required=True, help="Session ID sent in the request body")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(x) for x in v.split(",")],
+        required=False,
+        default=[1, 2, 4, 8, 16, 32],
+        help="Comma separated list of concurrent caller counts",
+    )
+    parser.add_argument("--requests-per-caller", type=int, required=False, default=20, help="Requests per caller")
+
+    args: Namespace = parser.parse_args()
+    return ProgramArgs(**vars(args))
+
+
+def call(url: str, data: Dict[str, Any], num_requests: int) -> int:
+    failures: int = 0
+    with Session() as session:
+        for _ in range(num_requests):
+            resp: requests.Response = session.get(url=url, json=data, headers=HEADERS)
+            if resp.status_code != 200:
+                failures += 1
+    return failures
+
+
+def run_load(url: str, data: Dict[str, Any], concurrency: int, requests_per_caller: int) -> LoadResult:
+    start_time: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        failures: List[int] = list(executor.map(lambda _: call(url, data, requests_per_caller), range(concurrency)))
+
+    return LoadResult(
+        concurrency=concurrency,
+        total_requests=concurrency * requests_per_caller,
+        failures=sum(failures),
+        duration=time.perf_counter() - start_time,
+    )
+
+
+def main() -> None:
+    args: ProgramArgs = get_program_args()
+
+    url: str = f"http://{TDP_HOST}:{TDP_PORT}{args.endpoint}"
+    data: Dict[str, Any] = {"session_id": args.session_id}
+
+    print(f"{'callers':>8} {'requests':>9} {'failures':>9} {'seconds':>8} {'req/s':>8}")
+    for concurrency in args.concurrency:
+        result: LoadResult = run_load(
+            url=url,
+            data=data,
+            concurrency=concurrency,
+            requests_per_caller=args.requests_per_caller,
+        )
+        print(
+            f"{result.concurrency:>8} {result.total_requests:>9} {result.failures:>9} "
+            f"{result.duration:>8.2f} {result.throughput:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
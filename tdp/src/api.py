@@ -1,8 +1,9 @@
 from typing import Dict
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from instrumentation.tdp_metrics import TdpMetrics
 from routes.limits import router as limits_router
 from routes.metrics import router as metrics_router
 from routes.session import router as session_router
@@ -17,3 +18,8 @@ api_router.include_router(router=session_router, prefix="/session", tags=["sessi
 @api_router.get("/health", response_class=JSONResponse)
 async def health() -> Dict[str, str]:
     return {"status": "healthy"}
+
+
+@api_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(content=TdpMetrics.registry.render(), media_type=TdpMetrics.registry.CONTENT_TYPE)
@@ -1,5 +1,11 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
+from anyio.to_thread import current_default_thread_limiter
 from core.config.environment import Environment
+from core.tracing.span_exporter import JsonlSpanExporter
+from core.tracing.tracer import Tracer
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from starlette.middleware.cors import CORSMiddleware
@@ -9,11 +15,31 @@ from api import api_router
 from config.tdp_config import TdpConfig
 from dependencies import get_config
 from handlers import log_stacktrace
-from middleware import LogPerformanceMiddleware
+from instrumentation.tdp_metrics import TdpMetrics
+from middleware import InstrumentationMiddleware
+from registry.client_registry import ClientRegistry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    config: TdpConfig = get_config()
+    # sync routes and blocking client calls share this bounded pool so slow io never blocks the event loop
+    current_default_thread_limiter().total_tokens = config.io_threads
+    if config.trace_export_path is not None:
+        Tracer.configure(JsonlSpanExporter(path=config.trace_export_path, service_name="tdp"))
+
+    client_registry: ClientRegistry = ClientRegistry(config=config)
+    client_registry.start()
+    app.state.client_registry = client_registry
+    TdpMetrics.enable_client_instrumentation()
+    yield
+    TdpMetrics.disable_client_instrumentation()
+    await client_registry.shutdown()
+    Tracer.shutdown()
 
 
 def create_app() -> ASGIApplication:
-    app: FastAPI = FastAPI(title="Trade Data Platform")
+    app: FastAPI = FastAPI(title="Trade Data Platform", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -21,7 +47,7 @@ def create_app() -> ASGIApplication:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    app.add_middleware(LogPerformanceMiddleware)
+    app.add_middleware(InstrumentationMiddleware)
     app.add_exception_handler(RequestValidationError, log_stacktrace)
     app.add_exception_handler(HTTPException, log_stacktrace)
     app.include_router(api_router)
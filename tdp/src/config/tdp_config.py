@@ -1,3 +1,4 @@
+import os
 from typing import Any, Dict
 
 import yaml
@@ -6,11 +7,18 @@ from core.config.app_config import AppConfig
 
 class TdpConfig(AppConfig):
 
+    DEFAULT_CLIENT_HEALTH_CHECK_INTERVAL: float = 30.0
+    DEFAULT_IO_THREADS: int = 40
+
     def __init__(self) -> None:
         super().__init__()
         self.service_host: str = self.extract_env_var("SERVICE_HOST")
         self.service_port: int = int(self.extract_env_var("SERVICE_PORT"))
         self.num_workers: int = int(self.extract_env_var("NUM_WORKERS"))
+        self.client_health_check_interval: float = float(
+            os.getenv("CLIENT_HEALTH_CHECK_INTERVAL", self.DEFAULT_CLIENT_HEALTH_CHECK_INTERVAL)
+        )
+        self.io_threads: int = int(os.getenv("IO_THREADS", self.DEFAULT_IO_THREADS))
 
     def get_log_config(self) -> Dict[str, Any]:
         with open("config/logging.yaml", "r") as f:
@@ -3,10 +3,12 @@ from typing import Annotated
 from core.clients.gds.gds_client import GdsClient
 from core.clients.price.price_client import PriceClient
 from core.clients.redis.redis_client import RedisClient
-from fastapi import Depends
+from core.clients.redis.session_listener import SessionListener
+from fastapi import Depends, Request
 
 from config.tdp_config import TdpConfig
 from metrics.metrics_calculator import MetricsCalculator
+from registry.client_registry import ClientRegistry
 from tracking.book_keeper import BookKeeper
 
 
@@ -20,27 +22,41 @@ def get_config() -> TdpConfig:
 TdpConfigDep = Annotated[TdpConfig, Depends(get_config)]
 
 
-def get_price_client() -> PriceClient:
-    return PriceClient()
+def get_client_registry(request: Request) -> ClientRegistry:
+    return request.app.state.client_registry
+
+
+ClientRegistryDep = Annotated[ClientRegistry, Depends(get_client_registry)]
+
+
+def get_price_client(registry: ClientRegistryDep) -> PriceClient:
+    return registry.price_client
 
 
 PriceClientDep = Annotated[PriceClient, Depends(get_price_client)]
 
 
-def get_redis_client(config: TdpConfigDep) -> RedisClient:
-    return RedisClient(host=config.redis_host, port=config.redis_port)
+def get_redis_client(registry: ClientRegistryDep) -> RedisClient:
+    return registry.redis_client
 
 
 RedisClientDep = Annotated[RedisClient, Depends(get_redis_client)]
 
 
-def get_gds_client(config: TdpConfigDep) -> GdsClient:
-    return GdsClient(host=config.gds_host, port=config.gds_port)
+def get_gds_client(registry: ClientRegistryDep) -> GdsClient:
+    return registry.gds_client
 
 
 GdsClientDep = Annotated[GdsClient, Depends(get_gds_client)]
 
 
+def get_session_listener(registry: ClientRegistryDep) -> SessionListener:
+    return registry.session_listener
+
+
+SessionListenerDep = Annotated[SessionListener, Depends(get_session_listener)]
+
+
 def get_book_keeper(redis_client: RedisClientDep, gds_client: GdsClientDep) -> BookKeeper:
     return BookKeeper(redis_client=redis_client, gds_client=gds_client)
 
@@ -52,8 +68,14 @@ def get_metrics_calculator(
     redis_client: RedisClientDep,
     gds_client: GdsClientDep,
     price_client: PriceClientDep,
+    session_listener: SessionListenerDep,
 ) -> MetricsCalculator:
-    return MetricsCalculator(redis_client=redis_client, gds_client=gds_client, price_client=price_client)
+    return MetricsCalculator(
+        redis_client=redis_client,
+        gds_client=gds_client,
+        price_client=price_client,
+        session_listener=session_listener,
+    )
 
 
 MetricsCalculatorDep = Annotated[MetricsCalculator, Depends(get_metrics_calculator)]
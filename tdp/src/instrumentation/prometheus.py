@@ -0,0 +1,134 @@
+import bisect
+import math
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: Tuple[float, ...] = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs: str = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric(ABC):
+
+    TYPE: str = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.description: str = description
+        self.label_names: Tuple[str, ...] = label_names
+        self.lock: Lock = Lock()
+
+    @abstractmethod
+    def _render_samples(self) -> List[str]:
+        pass
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self._render_samples(),
+        ]
+
+
+class Gauge(Metric):
+
+    TYPE: str = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> None:
+        super().__init__(name=name, description=description, label_names=label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def _render_samples(self) -> List[str]:
+        with self.lock:
+            values: List[Tuple[Tuple[str, ...], float]] = sorted(self.values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in values
+        ]
+
+
+class Histogram(Metric):
+
+    TYPE: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name=name, description=description, label_names=label_names)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # per label set: non-cumulative bucket counts (last is +Inf), sum and count
+        self.counts: Dict[Tuple[str, ...], List[int]] = {}
+        self.sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index: int = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts: Optional[List[int]] = self.counts.get(labels)
+            if counts is None:
+                counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+                self.sums[labels] = 0.0
+            counts[index] += 1
+            self.sums[labels] += value
+
+    def _render_samples(self) -> List[str]:
+        with self.lock:
+            series: List[Tuple[Tuple[str, ...], List[int], float]] = [
+                (labels, list(counts), self.sums[labels]) for labels, counts in sorted(self.counts.items())
+            ]
+
+        lines: List[str] = []
+        label_names: Tuple[str, ...] = (*self.label_names, "le")
+        for labels, counts, total in series:
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                bucket_labels: str = _format_labels(label_names, (*labels, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series_labels: str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{series_labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{series_labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+
+    CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = [line for metric in self.metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
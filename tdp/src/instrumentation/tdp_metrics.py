@@ -0,0 +1,58 @@
+from core.instrumentation import Instrumentation
+
+from instrumentation.prometheus import SIZE_BUCKETS, Gauge, Histogram, MetricsRegistry
+
+
+class TdpMetrics:
+
+    registry: MetricsRegistry = MetricsRegistry()
+
+    request_duration: Histogram = registry.register(
+        Histogram(
+            name="tdp_http_request_duration_seconds",
+            description="Time spent serving HTTP requests",
+            label_names=("method", "route", "status"),
+        )
+    )
+    requests_in_flight: Gauge = registry.register(
+        Gauge(
+            name="tdp_http_requests_in_flight",
+            description="HTTP requests currently being served",
+            label_names=("method",),
+        )
+    )
+    request_size: Histogram = registry.register(
+        Histogram(
+            name="tdp_http_request_size_bytes",
+            description="Size of HTTP request bodies",
+            label_names=("method", "route"),
+            buckets=SIZE_BUCKETS,
+        )
+    )
+    response_size: Histogram = registry.register(
+        Histogram(
+            name="tdp_http_response_size_bytes",
+            description="Size of HTTP response bodies",
+            label_names=("method", "route"),
+            buckets=SIZE_BUCKETS,
+        )
+    )
+    client_call_duration: Histogram = registry.register(
+        Histogram(
+            name="tdp_client_call_duration_seconds",
+            description="Time spent in downstream redis, gds and price client calls",
+            label_names=("client", "operation", "outcome"),
+        )
+    )
+
+    @classmethod
+    def observe_client_call(cls, client: str, operation: str, duration: float, failed: bool) -> None:
+        cls.client_call_duration.observe(duration, client, operation, "error" if failed else "ok")
+
+    @classmethod
+    def enable_client_instrumentation(cls) -> None:
+        Instrumentation.add_observer(cls.observe_client_call)
+
+    @classmethod
+    def disable_client_instrumentation(cls) -> None:
+        Instrumentation.remove_observer(cls.observe_client_call)
@@ -1,18 +1,71 @@
 import time
-from typing import Any, Callable
+from typing import Optional
 
 from core.logger import logger
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from core.tracing.span_context import SpanContext
+from core.tracing.tracer import Tracer
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from instrumentation.tdp_metrics import TdpMetrics
+
+
+class InstrumentationMiddleware:
+
+    # requests that match no route share one label so unknown paths can't grow the series count
+    UNMATCHED_ROUTE: str = "unmatched"
 
-class LogPerformanceMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app: ASGIApp = app
+
+    @staticmethod
+    def _extract_parent(scope: Scope) -> Optional[SpanContext]:
+        for key, value in scope["headers"]:
+            if key == Tracer.TRACEPARENT_HEADER.encode():
+                return Tracer.extract(value.decode("latin-1"))
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope["method"]
+        status: int = 500
+        request_size: int = 0
+        response_size: int = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message: Message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Any:
-        start_time: float = time.time()
-        response: Any = await call_next(request)
-        logger.info(f"Request processed in {time.time() - start_time:.4f} seconds")
-        return response
+        start_time: float = time.perf_counter()
+        TdpMetrics.requests_in_flight.inc(method)
+        with Tracer.span(name=f"{method} {scope['path']}", parent=self._extract_parent(scope)) as span:
+            try:
+                await self.app(scope, receive_wrapper, send_wrapper)
+            finally:
+                TdpMetrics.requests_in_flight.dec(method)
+                duration: float = time.perf_counter() - start_time
+                # the router records the matched route on the shared scope once it dispatches
+                route: Optional[BaseRoute] = scope.get("route")
+                route_path: str = getattr(route, "path", None) or self.UNMATCHED_ROUTE
+                TdpMetrics.request_duration.observe(duration, method, route_path, str(status))
+                TdpMetrics.request_size.observe(request_size, method, route_path)
+                TdpMetrics.response_size.observe(response_size, method, route_path)
+                logger.info(f"{method} {route_path} returned {status} in {duration:.4f} seconds")
+                if span is not None:
+                    span.name = f"{method} {route_path}"
+                    span.set_attribute("http.status_code", status)
+                    span.failed = status >= 500
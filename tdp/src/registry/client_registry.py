@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+from core.clients.base_client import BaseClient
+from core.clients.gds.gds_client import GdsClient
+from core.clients.price.exceptions import PriceApiError
+from core.clients.price.price_cache import PriceCache
+from core.clients.price.price_client import PriceClient
+from core.clients.redis.connection_pools import RedisConnectionPools
+from core.clients.redis.redis_client import RedisClient
+from core.clients.redis.session_listener import SessionListener
+from core.logger import logger
+from redis.exceptions import RedisError
+from requests import RequestException
+
+from config.tdp_config import TdpConfig
+
+
+@dataclass
+class ManagedClient:
+    factory: Callable[[], BaseClient]
+    health_checked: bool
+    client: Optional[BaseClient] = None
+    last_health_check: float = 0.0
+    # one lock per client, so a slow factory only blocks callers waiting on that same client
+    lock: Lock = field(default_factory=Lock)
+
+
+class ClientRegistry:
+
+    def __init__(self, config: TdpConfig) -> None:
+        self.config: TdpConfig = config
+        # price client holds no server side state and its http session reconnects on its own, so it is never
+        # health checked. health checking it would re-download the full /latest payload from the wiki.
+        self._clients: Dict[str, ManagedClient] = {
+            "redis": ManagedClient(
+                factory=lambda: RedisClient(
+                    host=config.redis_host,
+                    port=config.redis_port,
+                    pool_config=config.redis_pool_config,
+                ),
+                health_checked=True,
+            ),
+            "gds": ManagedClient(
+                factory=lambda: GdsClient(host=config.gds_host, port=config.gds_port),
+                health_checked=True,
+            ),
+            "price": ManagedClient(
+                factory=lambda: PriceClient(
+                    cache=PriceCache(
+                        host=config.redis_host,
+                        port=config.redis_port,
+                        pool_config=config.redis_pool_config,
+                    ),
+                    url=config.price_api_url,
+                ),
+                health_checked=False,
+            ),
+        }
+        self.session_listener: SessionListener = SessionListener(host=config.redis_host, port=config.redis_port)
+
+    @property
+    def redis_client(self) -> RedisClient:
+        return self._get("redis")
+
+    @property
+    def gds_client(self) -> GdsClient:
+        return self._get("gds")
+
+    @property
+    def price_client(self) -> PriceClient:
+        return self._get("price")
+
+    def _is_check_due(self, managed: ManagedClient, now: float) -> bool:
+        return managed.health_checked and now - managed.last_health_check >= self.config.client_health_check_interval
+
+    def _get(self, name: str) -> BaseClient:
+        managed: ManagedClient = self._clients[name]
+        with managed.lock:
+            now: float = time.monotonic()
+
+            if managed.client is not None and self._is_check_due(managed=managed, now=now):
+                managed.last_health_check = now
+                if not managed.client.is_healthy():
+                    logger.warn(f"Client {name} failed health check. Reconnecting")
+                    managed.client.close()
+                    managed.client = None
+
+            if managed.client is None:
+                logger.info(f"Creating shared {name} client")
+                managed.client = managed.factory()
+                managed.last_health_check = now
+
+            return managed.client
+
+    def start(self) -> None:
+        for name in self._clients:
+            try:
+                self._get(name)
+            except (ConnectionError, RedisError, RequestException, PriceApiError) as e:
+                logger.warn(f"Unable to warm up {name} client. It will be created on first use. {str(e)}")
+
+    async def shutdown(self) -> None:
+        await self.session_listener.close()
+        for name, managed in self._clients.items():
+            with managed.lock:
+                if managed.client is None:
+                    continue
+                logger.info(f"Closing shared {name} client")
+                managed.client.close()
+                managed.client = None
+        RedisConnectionPools.disconnect_all()
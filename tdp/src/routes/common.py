@@ -1,18 +1,35 @@
 import functools
+import inspect
 from typing import Callable
 
 from fastapi import HTTPException
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 
 
+def _to_http_exception(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    return HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 def handle_exceptions(f: Callable) -> Callable:
+    # sync routes must stay sync so fastapi runs them in its bounded threadpool instead of the event loop
+    if not inspect.iscoroutinefunction(f):
+
+        @functools.wraps(f)
+        def sync_wrapper(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except Exception as e:
+                raise _to_http_exception(e)
+
+        return sync_wrapper
+
     @functools.wraps(f)
     async def wrapper(*args, **kwargs):
         try:
             return await f(*args, **kwargs)
-        except HTTPException as e:
-            raise e
         except Exception as e:
-            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+            raise _to_http_exception(e)
 
     return wrapper
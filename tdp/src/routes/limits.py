@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 
 from core.clients.gds.models.exchange.exchange import Exchange
 from core.clients.gds.models.exchange.exchange_slot_state import ExchangeSlotState
@@ -21,25 +21,28 @@ router: APIRouter = APIRouter()
 
 @router.get("", response_model=GetBuyLimitsResponse)
 @handle_exceptions
-async def get_buy_limits(
+def get_buy_limits(
     redis_client: RedisClientDep,
     gds_client: GdsClientDep,
     request: GetBuyLimitsRequest = Body(...),
 ) -> GetBuyLimitsResponse:
     logger.info(f"Attempting to fetch buy limits in container: {request.container.name}")
-    buy_limits: Dict[int, BuyLimit] = {}
     if request.container == ItemContainer.EXCHANGE:
         exchange: Exchange = gds_client.get_exchange()
-        for slot in exchange.slots:
-            if slot.state == ExchangeSlotState.EMPTY or slot.item_id in buy_limits:
-                continue
-            buy_limits[slot.item_id] = redis_client.get_buy_limit(player_name=request.player_name, item_id=slot.item_id)
+        item_ids: List[int] = list(
+            dict.fromkeys(slot.item_id for slot in exchange.slots if slot.state != ExchangeSlotState.EMPTY)
+        )
+        buy_limits: Dict[int, BuyLimit] = redis_client.get_buy_limits(
+            player_name=request.player_name,
+            item_ids=item_ids,
+        )
     elif request.container == ItemContainer.INVENTORY:
         inv: Inventory = gds_client.get_inventory()
-        for item in inv.items:
-            if item.id == GP_ITEM_ID or item.id in buy_limits:
-                continue
-            buy_limits[item.id] = redis_client.get_buy_limit(player_name=request.player_name, item_id=item.id)
+        item_ids: List[int] = list(dict.fromkeys(item.id for item in inv.items if item.id != GP_ITEM_ID))
+        buy_limits: Dict[int, BuyLimit] = redis_client.get_buy_limits(
+            player_name=request.player_name,
+            item_ids=item_ids,
+        )
     elif request.container == ItemContainer.ALL:
         buy_limits: Dict[int, BuyLimit] = redis_client.get_all_buy_limits(player_name=request.player_name)
     else:
@@ -51,12 +54,12 @@ async def get_buy_limits(
     if request.item_ids is not None:
         buy_limits: Dict[int, BuyLimit] = {id: bl for id, bl in buy_limits.items() if id in request.item_ids}
 
-    return GetBuyLimitsResponse(buy_limits=buy_limits)
+    return GetBuyLimitsResponse(player_name=request.player_name, buy_limits=buy_limits)
 
 
 @router.post("")
 @handle_exceptions
-async def update_buy_limits(book_keeper: BookKeeperDep, request: UpdateBuyLimitsRequest) -> None:
+def update_buy_limits(book_keeper: BookKeeperDep, request: UpdateBuyLimitsRequest) -> None:
     update_time: float = request.time or datetime.now().timestamp()
     logger.info(f"Updating buy limits at time {update_time}")
     book_keeper.update_limits(player_name=request.player_name, cur_time=update_time)
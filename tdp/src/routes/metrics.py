@@ -1,8 +1,19 @@
+from typing import List
+
 from core.clients.redis.models.pnl.pnl import Pnl
-from core.clients.tdp.stubs.metrics import GetNetWorthRequest, GetNetWorthResponse, GetPnlRequest, GetPnlResponse
+from core.clients.redis.models.pnl.pnl_point import PnlPoint
+from core.clients.tdp.stubs.metrics import (
+    GetNetWorthRequest,
+    GetNetWorthResponse,
+    GetPnlHistoryRequest,
+    GetPnlHistoryResponse,
+    GetPnlRequest,
+    GetPnlResponse,
+)
 from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
 
-from dependencies import MetricsCalculatorDep
+from dependencies import MetricsCalculatorDep, RedisClientDep
 from routes.common import handle_exceptions
 
 
@@ -15,12 +26,26 @@ async def get_pnl(
     metrics_calculator: MetricsCalculatorDep,
     request: GetPnlRequest,
 ) -> GetPnlResponse:
-    pnl: Pnl = metrics_calculator.get_pnl(session_id=request.session_id)
+    await metrics_calculator.wait_for_unlock(session_id=request.session_id)
+    pnl: Pnl = await run_in_threadpool(metrics_calculator.get_pnl, session_id=request.session_id)
     return GetPnlResponse(pnl=pnl)
 
 
+@router.get("/pnl/history", response_model=GetPnlHistoryResponse)
+@handle_exceptions
+def get_pnl_history(redis_client: RedisClientDep, request: GetPnlHistoryRequest) -> GetPnlHistoryResponse:
+    points: List[PnlPoint] = redis_client.get_pnl_history(
+        session_id=request.session_id,
+        start_time=request.start_time,
+        end_time=request.end_time,
+        resolution=request.resolution,
+    )
+    return GetPnlHistoryResponse(points=points)
+
+
 @router.get("/nw", response_model=GetNetWorthResponse)
 @handle_exceptions
 async def get_nw(metrics_calculator: MetricsCalculatorDep, request: GetNetWorthRequest) -> GetNetWorthResponse:
-    nw: int = metrics_calculator.get_nw(session_id=request.session_id)
+    await metrics_calculator.wait_for_unlock(session_id=request.session_id)
+    nw: int = await run_in_threadpool(metrics_calculator.get_nw, session_id=request.session_id)
     return GetNetWorthResponse(nw=nw)
@@ -66,7 +66,7 @@ def create_new_trade_session(
 
 @router.get("", response_model=GetTradeSessionResponse)
 @handle_exceptions
-async def get_trade_session(
+def get_trade_session(
     redis_client: RedisClientDep,
     request: GetTradeSessionRequest = Body(...),
 ) -> GetTradeSessionResponse:
@@ -82,55 +82,49 @@ async def get_trade_session(
 
 @router.post("", response_model=CreateTradeSessionResponse)
 @handle_exceptions
-async def create_trade_session(
+def create_trade_session(
     redis_client: RedisClientDep,
     gds_client: GdsClientDep,
     metrics_calculator: MetricsCalculatorDep,
     request: CreateTradeSessionRequest,
 ) -> CreateTradeSessionResponse:
-    try:
-        redis_client.get_trade_session(session_id=request.session_id)
-    except RedisKeyError:
-        redis_client.set_session_validity(session_id=request.session_id, valid=True)
-
-        pnl: Pnl = Pnl(
-            session_id=request.session_id,
-            total_pnl=0,
-            pnl_snapshots=[],
-            update_time=request.start_time,
-        )
-        redis_client.set_pnl_snapshot(session_id=request.session_id, pnl=pnl)
-
-        trade_session: TradeSession = create_new_trade_session(
-            session_id=request.session_id,
-            player_name=request.player_name,
-            env=request.env,
-            start_time=request.start_time,
-            start_nw=metrics_calculator.get_nw(session_id=request.session_id),
-            inv=gds_client.get_inventory(),
-        )
-        redis_client.set_trade_session(trade_session=trade_session)
-
-        return CreateTradeSessionResponse(trade_session=trade_session)
-    else:
+    if redis_client.trade_session_exists(session_id=request.session_id):
         raise HTTPException(
             status_code=HTTP_409_CONFLICT,
             detail=f"Trade session with id {request.session_id} already exists.",
         )
 
+    pnl: Pnl = Pnl(
+        session_id=request.session_id,
+        total_pnl=0,
+        strat_pnl={},
+        update_time=request.start_time,
+    )
+    trade_session: TradeSession = create_new_trade_session(
+        session_id=request.session_id,
+        player_name=request.player_name,
+        env=request.env,
+        start_time=request.start_time,
+        start_nw=metrics_calculator.get_nw(session_id=request.session_id),
+        inv=gds_client.get_inventory(),
+    )
+    redis_client.init_trade_session(trade_session=trade_session, pnl=pnl)
+
+    return CreateTradeSessionResponse(trade_session=trade_session)
+
 
 @router.put("")
 @handle_exceptions
-async def update_trade_session(redis_client: RedisClientDep, request: UpdateTradeSessionRequest) -> None:
+def update_trade_session(redis_client: RedisClientDep, request: UpdateTradeSessionRequest) -> None:
     redis_client.set_trade_session(trade_session=request.trade_session)
 
 
 @router.get("/orders", response_model=GetOrdersResponse)
 @handle_exceptions
-async def get_orders(redis_client: RedisClientDep, request: GetOrdersRequest = Body(...)) -> GetOrdersResponse:
+def get_orders(redis_client: RedisClientDep, request: GetOrdersRequest = Body(...)) -> GetOrdersResponse:
     try:
-        orders: Dict[str, List[Trade]] = redis_client.get_orders(session_id=request.session_id)
-        return GetOrdersResponse(trades=filter_by_strats(vals=orders, strats=request.strats))
+        orders: Dict[str, List[Order]] = redis_client.get_orders(session_id=request.session_id)
+        return GetOrdersResponse(orders=filter_by_strats(vals=orders, strats=request.strats))
     except RedisKeyError as e:
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
@@ -140,7 +134,7 @@ async def get_orders(redis_client: RedisClientDep, request: GetOrdersRequest = B
 
 @router.put("/orders")
 @handle_exceptions
-async def add_orders(book_keeper: BookKeeperDep, request: UpdateOrdersRequest) -> None:
+def add_orders(book_keeper: BookKeeperDep, request: UpdateOrdersRequest) -> None:
     orders: Dict[str, List[Order]] = defaultdict(list)
     for order in request.orders:
         orders[order.strat_name].append(order)
@@ -155,7 +149,7 @@ async def add_orders(book_keeper: BookKeeperDep, request: UpdateOrdersRequest) -
 
 @router.get("/trades", response_model=GetTradesResponse)
 @handle_exceptions
-async def get_trades(redis_client: RedisClientDep, request: GetTradesRequest = Body(...)) -> GetTradesResponse:
+def get_trades(redis_client: RedisClientDep, request: GetTradesRequest = Body(...)) -> GetTradesResponse:
     try:
         trades: Dict[str, List[Trade]] = redis_client.get_trades(session_id=request.session_id)
         return GetTradesResponse(trades=filter_by_strats(vals=trades, strats=request.strats))
@@ -168,7 +162,7 @@ async def get_trades(redis_client: RedisClientDep, request: GetTradesRequest = B
 
 @router.post("/trades", response_model=CreateTradesResponse)
 @handle_exceptions
-async def add_trades(book_keeper: BookKeeperDep, request: CreateTradesRequest) -> CreateTradesResponse:
+def add_trades(book_keeper: BookKeeperDep, request: CreateTradesRequest) -> CreateTradesResponse:
     try:
         trades: Dict[str, List[Trade]] = book_keeper.book_trades(
             session_id=request.session_id,
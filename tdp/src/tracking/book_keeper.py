@@ -90,6 +90,7 @@ class BookKeeper:
 
     def save_orders(self, session_id: str, orders: Dict[str, List[Order]]) -> None:
         active_orders: Dict[int, Order] = self.redis_client.get_active_orders(session_id=session_id)
+        updated_orders: Dict[int, Order] = {}
         flattened_orders: List[Order] = [o for o_list in orders.values() for o in o_list]
         for order in flattened_orders:
             if order.metadata.ge_slot in active_orders and not self._is_corresponding_cancel_order(
@@ -99,9 +100,10 @@ class BookKeeper:
                 raise UnbookedOrder(prev_order=active_orders[order.metadata.ge_slot], new_order=order)
 
             active_orders[order.metadata.ge_slot] = order
+            updated_orders[order.metadata.ge_slot] = order
 
         self.redis_client.append_orders(session_id=session_id, orders=orders)
-        self.redis_client.set_active_orders(session_id=session_id, active_orders=active_orders)
+        self.redis_client.update_active_orders(session_id=session_id, active_orders=updated_orders)
 
     @staticmethod
     def _is_matching_offer(slot: ExchangeSlot, order: Order) -> bool:
@@ -120,12 +122,14 @@ class BookKeeper:
             and slot.total_quantity == order.metadata.quantity
         )
 
-    def book_trades(self, session_id: str, calc_cycle: int, cur_time: Optional[float] = None) -> List[Trade]:
-        cur_time: float = cur_time if cur_time is not None else datetime.now().timestamp()
+    def _match_trades(
+        self,
+        active_orders: Dict[int, Order],
+        exchange: Exchange,
+        calc_cycle: int,
+        cur_time: float,
+    ) -> Dict[str, List[Trade]]:
         trades: Dict[str, List[Trade]] = defaultdict(list)
-
-        active_orders: Dict[int, Order] = self.redis_client.get_active_orders(session_id=session_id)
-        exchange: Exchange = self.gds_client.get_exchange()
         for slot in exchange.slots:
             if slot.state in (ExchangeSlotState.EMPTY, ExchangeSlotState.BUYING, ExchangeSlotState.SELLING):
                 continue
@@ -145,8 +149,22 @@ class BookKeeper:
                 )
             )
 
-            del active_orders[slot.position]
-
-        self.redis_client.append_trades(session_id=session_id, trades=trades)
-        self.redis_client.set_active_orders(session_id=session_id, active_orders=active_orders)
         return trades
+
+    def book_trades(
+        self,
+        session_id: str,
+        calc_cycle: int,
+        cur_time: Optional[float] = None,
+    ) -> Dict[str, List[Trade]]:
+        cur_time: float = cur_time if cur_time is not None else datetime.now().timestamp()
+        exchange: Exchange = self.gds_client.get_exchange()
+        return self.redis_client.book_trades(
+            session_id=session_id,
+            match_trades=lambda active_orders: self._match_trades(
+                active_orders=active_orders,
+                exchange=exchange,
+                calc_cycle=calc_cycle,
+                cur_time=cur_time,
+            ),
+        )